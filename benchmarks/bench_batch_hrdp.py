@@ -0,0 +1,44 @@
+# benchmarks/bench_batch_hrdp.py
+"""
+Batched HRDP fitting versus one ThresholdCalculator per ramp test.
+
+    python -m benchmarks.bench_batch_hrdp [n_series] [n_jobs]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.analysis.batch_hrdp import fit_hrdp_batch
+from src.analysis.threshold_calculator import ThresholdCalculator
+
+
+def main(n_series: int = 2000, n_jobs: int = 1):
+    rng = np.random.default_rng(0)
+    series = []
+    for i in range(n_series):
+        n = 100 + i % 5
+        t = np.arange(n) * 10.0
+        hr = 100 + 0.1 * np.minimum(t, 700) + 0.02 * np.maximum(t - 700, 0) + rng.normal(0, 1, n)
+        series.append((t, hr))
+
+    start = time.perf_counter()
+    for t, hr in series:
+        calculator = ThresholdCalculator()
+        calculator.set_data(list(hr), list(t))
+        calculator.calculate_hrdp()
+    loop = time.perf_counter() - start
+    print(f"ThresholdCalculator loop (sdmax): {loop:.2f} s")
+
+    start = time.perf_counter()
+    fit_hrdp_batch(series, methods=['sdmax'], n_jobs=n_jobs)
+    print(f"fit_hrdp_batch (sdmax):           {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    fit_hrdp_batch(series, n_jobs=n_jobs)
+    print(f"fit_hrdp_batch (all methods):     {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1)
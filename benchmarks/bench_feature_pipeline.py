@@ -0,0 +1,31 @@
+# benchmarks/bench_feature_pipeline.py
+"""
+Per-step timing of FeaturePipeline on the training dataset tiled to N rows.
+
+    python -m benchmarks.bench_feature_pipeline [n_rows]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.feature_pipeline import FeaturePipeline
+
+
+def main(n_rows: int = 2_000_000):
+    base = pd.read_csv('data/treadmill_training_data.csv')
+    repeats = int(np.ceil(n_rows / len(base)))
+    df = pd.concat([base] * repeats, ignore_index=True).iloc[:n_rows]
+
+    pipeline = FeaturePipeline()
+    pipeline.run(df)
+
+    print(f"{len(df)} rows")
+    for step, seconds in pipeline.timings.items():
+        print(f"  {step:<20} {seconds * 1000:8.1f} ms")
+    total = sum(pipeline.timings.values())
+    print(f"  {'total':<20} {total * 1000:8.1f} ms  ({len(df) / total / 1e6:.1f} M rows/s)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
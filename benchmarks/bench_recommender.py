@@ -0,0 +1,35 @@
+# benchmarks/bench_recommender.py
+"""
+Inference latency of SpeedSlopeRecommender, single and batched.
+
+    python -m benchmarks.bench_recommender
+"""
+import time
+
+from src.analysis.feature_pipeline import FeaturePipeline
+from src.analysis.recommender import SpeedSlopeRecommender, FEATURES
+
+
+def main(repeats: int = 100_000):
+    df = FeaturePipeline().run_csv('data/treadmill_training_data.csv')
+    model = SpeedSlopeRecommender().fit(df)
+    print(f"training fit: {model.score(df)}")
+
+    features = tuple(df[list(FEATURES)].iloc[0].astype(float))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict_one(features)
+    single = (time.perf_counter() - start) / repeats
+    print(f"predict_one:   {single * 1e6:8.2f} us/call")
+
+    X = df[list(FEATURES)].to_numpy(dtype=float)
+    start = time.perf_counter()
+    for _ in range(1000):
+        model.predict_batch(X)
+    batch = (time.perf_counter() - start) / 1000
+    print(f"predict_batch: {batch * 1e6:8.2f} us per {len(X)} rows "
+          f"({batch / len(X) * 1e9:.1f} ns/row)")
+
+
+if __name__ == '__main__':
+    main()
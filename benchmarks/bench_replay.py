@@ -0,0 +1,41 @@
+# benchmarks/bench_replay.py
+"""
+Maximum sustainable throughput of the ingestion/analysis path, measured by
+replaying a recording as fast as possible.
+
+    python -m benchmarks.bench_replay [recording.csv|recording.json]
+
+Without an argument a synthetic two-hour 1 Hz session is replayed.
+"""
+import sys
+
+from src.analysis.data_processor import DataProcessor
+from src.analysis.replay import SessionReplayer, processor_sink, threshold_sink
+from src.analysis.threshold_calculator import ThresholdCalculator
+from src.models.workout_session import WorkoutPoint
+
+
+def synthetic_points(n_points: int = 7200):
+    for i in range(n_points):
+        yield WorkoutPoint(timestamp=1.7e9 + i, heart_rate=110 + (i // 60) % 70,
+                           speed=6.0 + (i // 300) * 0.5, slope=1.0)
+
+
+def main(filename: str = None):
+    processor = DataProcessor()
+    calculator = ThresholdCalculator()
+    if filename:
+        replayer = SessionReplayer.from_file(filename, speed=None)
+    else:
+        replayer = SessionReplayer(synthetic_points(), speed=None)
+    replayer.add_sink(processor_sink(processor)).add_sink(threshold_sink(calculator))
+
+    stats = replayer.run()
+    print(f"{stats.samples} samples covering {stats.recorded_seconds:.0f} s")
+    print(f"wall time   {stats.wall_seconds * 1000:8.1f} ms "
+          f"(sinks {stats.sink_seconds * 1000:.1f} ms)")
+    print(f"throughput  {stats.throughput:10.0f} samples/s, {stats.speedup:.0f}x real time")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
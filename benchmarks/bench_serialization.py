@@ -0,0 +1,58 @@
+# benchmarks/bench_serialization.py
+"""
+Compare WorkoutSession.to_json/from_json with the streaming column layout.
+
+    python -m benchmarks.bench_serialization [n_points]
+"""
+import io
+import sys
+import time
+import tracemalloc
+
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+from src.models.serialization import dump_session, load_session
+
+
+def make_session(n_points: int) -> WorkoutSession:
+    session = WorkoutSession(id=1, user_id=1)
+    session.data_points = [
+        WorkoutPoint(timestamp=1.7e9 + i, heart_rate=120 + i % 60, speed=8.0 + (i % 50) / 10,
+                     slope=2.0, power=250.0 + i % 40, cadence=165)
+        for i in range(n_points)
+    ]
+    return session
+
+
+def measure(label: str, func, n_points: int):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    # Second run under tracemalloc, which is too slow to time
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed * 1000:8.1f} ms  {n_points / elapsed / 1e6:6.2f} Mpts/s  "
+          f"peak {peak / 1e6:7.1f} MB")
+    return result
+
+
+def main(n_points: int = 200_000):
+    session = make_session(n_points)
+    print(f"{n_points} data points")
+
+    text = measure("to_json", session.to_json, n_points)
+    measure("from_json", lambda: WorkoutSession.from_json(text), n_points)
+
+    def dump():
+        buffer = io.StringIO()
+        dump_session(session, buffer)
+        return buffer
+
+    streamed = measure("dump_session", dump, n_points).getvalue()
+    measure("load_session", lambda: load_session(io.StringIO(streamed)), n_points)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,76 @@
+# benchmarks/bench_workout_point.py
+"""
+Memory and construction cost of per-sample point storage.
+
+Compares the original dataclass, the slotted WorkoutPoint and the
+column-backed PointArray. Samples are generated inside the measured region,
+as they would arrive from the sensors, so object layouts are charged for
+their float objects as well as for the point itself.
+
+    python -m benchmarks.bench_workout_point [n_points]
+"""
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from src.models.workout_session import PointArray, WorkoutPoint
+
+
+@dataclass
+class DataclassWorkoutPoint:
+    """The original WorkoutPoint layout, kept here for comparison"""
+    timestamp: float
+    heart_rate: int
+    speed: float
+    slope: float
+    power: Optional[float] = None
+    cadence: Optional[int] = None
+    stride_length: Optional[float] = None
+
+
+def samples(n_points: int):
+    for i in range(n_points):
+        yield 1.7e9 + i, 120 + i % 60, 8.0 + (i % 50) / 10, 2.0 + (i % 7) / 10
+
+
+def build_list(cls, n_points: int):
+    return [cls(*row) for row in samples(n_points)]
+
+
+def build_array(n_points: int):
+    points = PointArray()
+    for row in samples(n_points):
+        points.append(WorkoutPoint(*row))
+    return points
+
+
+def measure(label: str, build, n_points: int) -> float:
+    start = time.perf_counter()
+    points = build(n_points)
+    elapsed = time.perf_counter() - start
+    del points
+
+    tracemalloc.start()
+    points = build(n_points)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del points
+
+    per_point = current / n_points
+    print(f"{label:<22} {per_point:7.1f} B/point  {elapsed / n_points * 1e9:7.1f} ns/append")
+    return per_point
+
+
+def main(n_points: int = 500_000):
+    print(f"{n_points} points")
+    baseline = measure("dataclass", lambda n: build_list(DataclassWorkoutPoint, n), n_points)
+    for label, build in [("slotted WorkoutPoint", lambda n: build_list(WorkoutPoint, n)),
+                         ("PointArray", build_array)]:
+        per_point = measure(label, build, n_points)
+        print(f"{'':<22} {baseline / per_point:.2f}x smaller than the dataclass")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
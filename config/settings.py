@@ -1,7 +1,40 @@
 # config/settings.py
-from typing import Dict, Any
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
+import logging
 import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsError(ValueError):
+    """Raised when settings fail validation"""
+
+
+def _positive(value) -> bool:
+    return value > 0
+
+
+def _non_negative(value) -> bool:
+    return value >= 0
+
+
+def _non_empty(value) -> bool:
+    return bool(value)
+
+
+def _window_size(value) -> bool:
+    return len(value) == 2 and all(isinstance(v, int) and v > 0 for v in value)
+
+
+def _training_zones(value) -> bool:
+    return bool(value) and all(
+        len(bounds) == 2 and 0 <= bounds[0] < bounds[1] <= 1.0
+        for bounds in value.values()
+    )
+
 
 class Settings:
     # Default settings
@@ -16,6 +49,10 @@ class Settings:
         'MAX_HEART_RATE_DEFAULT': 220,
         'MIN_DATA_POINTS_FOR_THRESHOLD': 10,
         
+        # Heart rate control
+        'HR_CONTROL_INTERVAL': 5.0,  # seconds between speed adjustments
+        'HR_SMOOTHING_TIME_CONSTANT': 10.0,  # seconds
+        
         # UI settings
         'WINDOW_SIZE': (1024, 768),
         'PLOT_UPDATE_INTERVAL': 1000,  # ms
@@ -32,31 +69,272 @@ class Settings:
         # Data storage
         'DATA_DIR': 'data',
         'LOGS_DIR': 'logs',
+        'THRESHOLD_CACHE_DIR': 'data/thresholds',
+        'REPORTS_DIR': 'data/reports',
+
+        # Logging
+        'LOG_MAX_BYTES': 5 * 1024 * 1024,  # rotate log file at 5 MB
+        'LOG_BACKUP_COUNT': 5,
+        'LOG_RATE_LIMIT_INTERVAL': 1.0,  # seconds between repeated hot-path events
     }
 
+    # Expected type(s) and value check for each setting
+    _schema = {
+        'SERIAL_PORT': (str, _non_empty),
+        'BAUD_RATE': (int, _positive),
+        'HEART_RATE_TIMEOUT': ((int, float), _positive),
+        'SAMPLING_RATE': ((int, float), _positive),
+        'MAX_HEART_RATE_DEFAULT': (int, _positive),
+        'MIN_DATA_POINTS_FOR_THRESHOLD': (int, lambda v: v >= 10),
+        'HR_CONTROL_INTERVAL': ((int, float), _positive),
+        'HR_SMOOTHING_TIME_CONSTANT': ((int, float), _non_negative),
+        'WINDOW_SIZE': ((list, tuple), _window_size),
+        'PLOT_UPDATE_INTERVAL': (int, _positive),
+        'MAX_PLOT_POINTS': (int, _positive),
+        'TRAINING_ZONES': (dict, _training_zones),
+        'DATA_DIR': (str, _non_empty),
+        'LOGS_DIR': (str, _non_empty),
+        'THRESHOLD_CACHE_DIR': (str, _non_empty),
+        'REPORTS_DIR': (str, _non_empty),
+        'LOG_MAX_BYTES': (int, _positive),
+        'LOG_BACKUP_COUNT': (int, _non_negative),
+        'LOG_RATE_LIMIT_INTERVAL': ((int, float), _non_negative),
+    }
+
+    @classmethod
+    def get_default(cls, key: str) -> Any:
+        """Return the built-in default for a single setting"""
+        return cls._defaults[key]
+
+    @classmethod
+    def value(cls, settings: Optional['AppSettings'], key: str) -> Any:
+        """
+        Read a setting from loaded AppSettings, falling back to the built-in
+        default when no settings are given.
+        """
+        if settings is None:
+            return cls._defaults[key]
+        return getattr(settings, key.lower())
+
     @classmethod
-    def load(cls, config_file: str = None) -> Dict[str, Any]:
-        """Load settings from config file, falling back to defaults"""
+    def validate_value(cls, key: str, value: Any) -> Optional[str]:
+        """
+        Check one setting against the schema.
+        Returns: A description of the problem, or None if the value is valid
+        """
+        if key not in cls._schema:
+            return f"unknown setting {key}"
+        expected, check = cls._schema[key]
+        if isinstance(value, bool) or not isinstance(value, expected):
+            return f"{key} has invalid type {type(value).__name__}"
+        try:
+            if not check(value):
+                return f"{key} has invalid value {value!r}"
+        except (TypeError, ValueError, AttributeError):
+            return f"{key} has invalid value {value!r}"
+        return None
+
+    @classmethod
+    def validate(cls, settings: Dict[str, Any]):
+        """Raise SettingsError listing every invalid entry in `settings`"""
+        problems = [cls.validate_value(key, value) for key, value in settings.items()]
+        problems = [problem for problem in problems if problem]
+        if problems:
+            raise SettingsError("; ".join(problems))
+
+    @classmethod
+    def load(cls, config_file: str = None, strict: bool = False,
+             fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Load settings from config file, falling back to defaults.
+        Invalid or unknown entries are logged and ignored; an invalid entry
+        takes its value from `fallback` (e.g. the settings in use) if given,
+        otherwise its default. A file that cannot be read or parsed yields
+        the defaults, unless strict is set, in which case it raises
+        SettingsError.
+        """
         settings = cls._defaults.copy()
         
         if config_file and os.path.exists(config_file):
             try:
                 with open(config_file, 'r') as f:
                     user_settings = json.load(f)
-                settings.update(user_settings)
-            except json.JSONDecodeError:
-                print(f"Warning: Could not parse config file {config_file}")
+                if not isinstance(user_settings, dict):
+                    raise ValueError("config file must contain a JSON object")
+            except json.JSONDecodeError as e:
+                if strict:
+                    raise SettingsError(f"Could not parse config file {config_file}: {e}")
+                logger.warning(f"Could not parse config file {config_file}")
+                return settings
             except Exception as e:
-                print(f"Warning: Error loading config file: {e}")
-        
-        # Create necessary directories
-        os.makedirs(settings['DATA_DIR'], exist_ok=True)
-        os.makedirs(settings['LOGS_DIR'], exist_ok=True)
+                if strict:
+                    raise SettingsError(f"Error loading config file: {e}")
+                logger.warning(f"Error loading config file: {e}")
+                return settings
+
+            for key, value in user_settings.items():
+                problem = cls.validate_value(key, value)
+                if problem:
+                    logger.warning(f"Ignoring setting in {config_file}: {problem}")
+                    if fallback is not None and key in fallback:
+                        settings[key] = fallback[key]
+                else:
+                    settings[key] = value
         
         return settings
 
+    @classmethod
+    def load_typed(cls, config_file: str = None, strict: bool = False,
+                   fallback: Optional['AppSettings'] = None) -> 'AppSettings':
+        """Load settings as a validated, typed AppSettings object"""
+        fallback = fallback.to_dict() if fallback is not None else None
+        return AppSettings.from_dict(cls.load(config_file, strict, fallback))
+
     @classmethod
     def save(cls, settings: Dict[str, Any], config_file: str):
         """Save current settings to config file"""
         with open(config_file, 'w') as f:
-            json.dump(settings, f, indent=4)
\ No newline at end of file
+            json.dump(settings, f, indent=4)
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    """
+    Typed, immutable view of the settings.
+    Fields are the lower-case setting names, so hot paths read plain
+    attributes instead of doing dict lookups. A reload produces a new
+    instance rather than mutating this one.
+    """
+    serial_port: str
+    baud_rate: int
+    heart_rate_timeout: float
+    sampling_rate: float
+    max_heart_rate_default: int
+    min_data_points_for_threshold: int
+    hr_control_interval: float
+    hr_smoothing_time_constant: float
+    window_size: Tuple[int, int]
+    plot_update_interval: int
+    max_plot_points: int
+    training_zones: Dict[str, Tuple[float, float]]
+    data_dir: str
+    logs_dir: str
+    threshold_cache_dir: str
+    reports_dir: str
+    log_max_bytes: int
+    log_backup_count: int
+    log_rate_limit_interval: float
+
+    @classmethod
+    def from_dict(cls, settings: Dict[str, Any]) -> 'AppSettings':
+        """Validate a settings dict (upper-case keys) and convert it"""
+        Settings.validate(settings)
+        values = {key.lower(): value for key, value in settings.items()}
+        missing = [f.name for f in fields(cls) if f.name not in values]
+        if missing:
+            raise SettingsError(f"Missing settings: {', '.join(name.upper() for name in missing)}")
+        values['window_size'] = tuple(values['window_size'])
+        values['training_zones'] = {
+            name: (float(lower), float(upper))
+            for name, (lower, upper) in values['training_zones'].items()
+        }
+        return cls(**{f.name: values[f.name] for f in fields(cls)})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Settings dict with upper-case keys, as returned by Settings.load"""
+        return {f.name.upper(): getattr(self, f.name) for f in fields(self)}
+
+    def changed_keys(self, other: 'AppSettings') -> List[str]:
+        """Names of the settings that differ from `other`"""
+        return [f.name for f in fields(self) if getattr(self, f.name) != getattr(other, f.name)]
+
+
+class SettingsManager:
+    """
+    Holds the current AppSettings and reloads them when the config file changes.
+    The file's modification time is polled, either by calling
+    check_for_changes() (e.g. from a UI timer) or from a background thread
+    started with start(). A change swaps `current` in one assignment and
+    notifies subscribers with the new settings and the changed field names;
+    an unreadable file is logged and the previous settings are kept.
+    """
+    def __init__(self, config_file: Optional[str] = None, poll_interval: float = 2.0):
+        self.config_file = config_file
+        self.poll_interval = poll_interval
+        self.current: AppSettings = Settings.load_typed(config_file)
+        self._mtime = self._file_mtime()
+        self._subscribers: List[Callable[[AppSettings, List[str]], None]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _file_mtime(self) -> Optional[float]:
+        if not self.config_file:
+            return None
+        try:
+            return os.stat(self.config_file).st_mtime
+        except OSError:
+            return None
+
+    def subscribe(self, callback: Callable[[AppSettings, List[str]], None]):
+        """Register a callback for settings changes"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[AppSettings, List[str]], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def check_for_changes(self) -> List[str]:
+        """
+        Reload if the config file changed since the last check.
+        Returns: Names of the settings that changed
+        """
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return []
+        with self._lock:
+            self._mtime = mtime
+            return self.reload()
+
+    def reload(self) -> List[str]:
+        """
+        Re-read the config file and notify subscribers of any changes.
+        Entries are validated as on startup; an entry that became invalid
+        keeps its current value.
+        """
+        try:
+            new_settings = Settings.load_typed(self.config_file, strict=True, fallback=self.current)
+        except SettingsError as e:
+            logger.warning(f"Keeping previous settings, reload failed: {e}")
+            return []
+
+        changed = new_settings.changed_keys(self.current)
+        if not changed:
+            return []
+        self.current = new_settings
+        logger.info(f"Settings reloaded, changed: {', '.join(changed)}")
+        for callback in list(self._subscribers):
+            try:
+                callback(new_settings, changed)
+            except Exception as e:
+                logger.error(f"Settings subscriber failed: {e}")
+        return changed
+
+    def start(self):
+        """Poll the config file in a daemon thread"""
+        if self._thread is not None or not self.config_file:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll, name="settings-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _poll(self):
+        while not self._stop_event.wait(self.poll_interval):
+            self.check_for_changes()
@@ -2,27 +2,29 @@
 import sys
 import logging
 import argparse
-from datetime import datetime
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication
 
 from src.ui.main_window import MainWindow
 from src.models.user import User
-from config.settings import Settings
+from config.settings import SettingsManager
+from src.analysis.downsampling import RollupStore
+from src.analysis.report_generator import ReportGenerator
+from src.analysis.threshold_cache import ThresholdCache
 from src.hardware.treadmill_controller import TreadmillController
 from src.hardware.heart_rate_monitor import HeartRateMonitor
+from src.utils.logging_utils import start_logging_pipeline
 
 def setup_logging(settings):
-    """Configure logging for the application"""
-    log_file = Path(settings['LOGS_DIR']) / f"smart_treadmill_{datetime.now():%Y%m%d_%H%M%S}.log"
+    """Configure non-blocking, size-rotated logging for the application"""
+    log_file = Path(settings.logs_dir) / "smart_treadmill.log"
     
-    logging.basicConfig(
+    start_logging_pipeline(
+        str(log_file),
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+        rate_limit_interval=settings.log_rate_limit_interval,
+        stream=sys.stdout
     )
     
     return logging.getLogger('smart_treadmill')
@@ -61,22 +63,39 @@ def parse_arguments():
 
 def create_data_directories(settings):
     """Create necessary data directories if they don't exist"""
-    Path(settings['DATA_DIR']).mkdir(parents=True, exist_ok=True)
-    Path(settings['LOGS_DIR']).mkdir(parents=True, exist_ok=True)
+    Path(settings.data_dir).mkdir(parents=True, exist_ok=True)
+    Path(settings.logs_dir).mkdir(parents=True, exist_ok=True)
+
+def create_services(settings_manager):
+    """
+    Create the shared analysis services from the loaded settings and
+    subscribe them to reloads.
+    """
+    settings = settings_manager.current
+    services = {
+        'rollups': RollupStore(str(Path(settings.data_dir) / 'rollups'), settings=settings),
+        'thresholds': ThresholdCache(settings=settings),
+        'reports': ReportGenerator(settings=settings)
+    }
+    settings_manager.subscribe(services['rollups'].apply_settings)
+    settings_manager.subscribe(services['thresholds'].apply_settings)
+    return services
 
 def main():
     # Parse command line arguments
     args = parse_arguments()
     
-    # Load settings
-    settings = Settings.load(args.config)
+    # Load settings; the main window polls the manager for config file changes
+    settings_manager = SettingsManager(args.config)
+    settings = settings_manager.current
+    
+    # Create necessary directories
+    create_data_directories(settings)
     
     # Set up logging
     logger = setup_logging(settings)
     logger.info("Starting Smart Treadmill application")
-    
-    # Create necessary directories
-    create_data_directories(settings)
+    services = create_services(settings_manager)
     
     # Check hardware connections (skip if in simulation mode)
     if not args.simulate:
@@ -86,26 +105,25 @@ def main():
             sys.exit(1)
     
     try:
-        # Initialize Qt application
-        app = QApplication(sys.argv)
-        
-        # Create and show main window
+        # Create main window
         window = MainWindow(
-            settings=settings,
+            settings_manager=settings_manager,
+            services=services,
             simulation_mode=args.simulate,
             debug_mode=args.debug
         )
-        window.show()
         
         # Set up exception handling
         sys.excepthook = lambda type, value, traceback: handle_exception(type, value, traceback, logger)
         
-        # Start Qt event loop
-        sys.exit(app.exec())
+        # Start Tk event loop
+        window.mainloop()
         
     except Exception as e:
         logger.error(f"Application failed to start: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        services['reports'].shutdown(wait=False)
 
 def handle_exception(exc_type, exc_value, exc_traceback, logger):
     """Handle uncaught exceptions"""
@@ -1,3 +1,10 @@
 # src/analysis/__init__.py
 from .threshold_calculator import ThresholdCalculator
-from .data_processor import DataProcessor
\ No newline at end of file
+from .data_processor import DataProcessor
+from .downsampling import RollupStore
+from .feature_pipeline import FeaturePipeline
+from .recommender import SpeedSlopeRecommender
+from .threshold_cache import ThresholdCache
+from .cohort import CohortIndex, HistoryIndex
+from .fusion import SensorFusion
+from .report_generator import ReportGenerator
\ No newline at end of file
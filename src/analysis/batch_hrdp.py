@@ -0,0 +1,266 @@
+# src/analysis/batch_hrdp.py
+import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.signal import savgol_filter
+
+from ..utils.logging_utils import worker_logging
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('sdmax', 'dmax', 'piecewise', 'conconi')
+MIN_POINTS = 10
+RESULT_COLUMNS = ['series_id', 'method', 'hrdp_time', 'hrdp_hr', 'r2', 'rmse', 'n_points', 'error']
+
+Series = Tuple[Sequence[float], Sequence[float]]  # (timestamps, heart_rates)
+
+
+def _smooth(hr: np.ndarray) -> np.ndarray:
+    """Savitzky-Golay smoothing as in ThresholdCalculator, applied to every row"""
+    window = min(9, hr.shape[1] - 2)
+    if window % 2 == 0:
+        window -= 1
+    return savgol_filter(hr, window_length=window, polyorder=3, axis=1)
+
+
+def _r2(observed: np.ndarray, sse: np.ndarray) -> np.ndarray:
+    total = ((observed - observed.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, 1 - sse / total, np.nan)
+
+
+def _cubic_fit(times: np.ndarray, hr_smooth: np.ndarray, resolution: int):
+    """
+    Batched third-order polynomial fit on normalized time.
+    Returns: (grid times (m, resolution), fitted HR on the grid, fitted HR at samples)
+    """
+    start = times[:, :1]
+    span = times[:, -1:] - start
+    x = (times - start) / span
+    vander = np.stack([x ** 3, x ** 2, x, np.ones_like(x)], axis=2)  # (m, n, 4)
+    gram = np.einsum('mni,mnj->mij', vander, vander)
+    rhs = np.einsum('mni,mn->mi', vander, hr_smooth)
+    coeffs = np.linalg.solve(gram, rhs[..., None])[..., 0]  # (m, 4)
+
+    grid = np.linspace(0.0, 1.0, resolution)
+    grid_powers = np.stack([grid ** 3, grid ** 2, grid, np.ones_like(grid)])  # (4, resolution)
+    return start + grid * span, coeffs @ grid_powers, np.einsum('mni,mi->mn', vander, coeffs)
+
+
+def _sdmax(times, hr, hr_smooth, resolution) -> Dict[str, np.ndarray]:
+    """The ThresholdCalculator variant: maximum |d2HR/dt2| of the cubic fit"""
+    grid_t, grid_hr, fitted = _cubic_fit(times, hr_smooth, resolution)
+    d2 = np.gradient(np.gradient(grid_hr, axis=1), axis=1)
+    idx = np.argmax(np.abs(d2), axis=1)
+    rows = np.arange(len(times))
+    sse = ((hr - fitted) ** 2).sum(axis=1)
+    return {'hrdp_time': grid_t[rows, idx], 'hrdp_hr': grid_hr[rows, idx], 'sse': sse}
+
+
+def _dmax(times, hr, hr_smooth, resolution) -> Dict[str, np.ndarray]:
+    """Point of the cubic fit furthest from the chord joining its end points"""
+    grid_t, grid_hr, fitted = _cubic_fit(times, hr_smooth, resolution)
+    dx = grid_t[:, -1:] - grid_t[:, :1]
+    dy = grid_hr[:, -1:] - grid_hr[:, :1]
+    # Perpendicular distance, up to the constant chord length per row
+    distance = np.abs(dy * (grid_t - grid_t[:, :1]) - dx * (grid_hr - grid_hr[:, :1]))
+    idx = np.argmax(distance, axis=1)
+    rows = np.arange(len(times))
+    sse = ((hr - fitted) ** 2).sum(axis=1)
+    return {'hrdp_time': grid_t[rows, idx], 'hrdp_hr': grid_hr[rows, idx], 'sse': sse}
+
+
+def _prefix_sse(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """SSE of a least-squares line through the first k+1 samples, for every k"""
+    count = np.arange(1, x.shape[1] + 1)
+    sx, sy = np.cumsum(x, axis=1), np.cumsum(y, axis=1)
+    sxx, sxy, syy = np.cumsum(x * x, axis=1), np.cumsum(x * y, axis=1), np.cumsum(y * y, axis=1)
+    cxx = sxx - sx * sx / count
+    cxy = sxy - sx * sy / count
+    cyy = syy - sy * sy / count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(cxx > 0, cyy - cxy * cxy / cxx, 0.0)
+
+
+def _piecewise(times, hr, hr_smooth, resolution) -> Dict[str, np.ndarray]:
+    """Breakpoint of the best two-segment linear fit, searched over every sample"""
+    n = times.shape[1]
+    x = times - times[:, :1]
+    left = _prefix_sse(x, hr_smooth)                      # line through samples 0..k
+    right = _prefix_sse(x[:, ::-1], hr_smooth[:, ::-1])[:, ::-1]  # line through samples k..n-1
+    total = left + right
+    # Each segment needs at least three samples
+    total[:, :2] = np.inf
+    total[:, n - 2:] = np.inf
+    idx = np.argmin(total, axis=1)
+    rows = np.arange(len(times))
+
+    # Residuals of the two fitted lines at the raw samples, the breakpoint
+    # sample belonging to the left segment
+    left_mask = np.arange(n) <= idx[:, None]
+    fitted = np.where(left_mask, _masked_line(x, hr_smooth, left_mask),
+                      _masked_line(x, hr_smooth, ~left_mask | (np.arange(n) == idx[:, None])))
+    sse = ((hr - fitted) ** 2).sum(axis=1)
+    return {'hrdp_time': times[rows, idx], 'hrdp_hr': hr_smooth[rows, idx], 'sse': sse}
+
+
+def _masked_line(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Least-squares line through the masked samples of each row, evaluated at every x"""
+    count = mask.sum(axis=1, keepdims=True)
+    x_mean = np.where(mask, x, 0.0).sum(axis=1, keepdims=True) / count
+    y_mean = np.where(mask, y, 0.0).sum(axis=1, keepdims=True) / count
+    dx = np.where(mask, x - x_mean, 0.0)
+    slope = (dx * (y - y_mean)).sum(axis=1, keepdims=True) / (dx * dx).sum(axis=1, keepdims=True)
+    return y_mean + slope * (x - x_mean)
+
+
+def _conconi(times, hr, hr_smooth, resolution, tolerance: float = 2.0) -> Dict[str, np.ndarray]:
+    """
+    Conconi-style loss of linearity: fit a line to the first half of the
+    test and take the last sample before HR falls `tolerance` bpm below it.
+    """
+    n = times.shape[1]
+    half = n // 2
+    x = times - times[:, :1]
+    xh, yh = x[:, :half], hr_smooth[:, :half]
+    x_mean, y_mean = xh.mean(axis=1, keepdims=True), yh.mean(axis=1, keepdims=True)
+    slope = (((xh - x_mean) * (yh - y_mean)).sum(axis=1, keepdims=True)
+             / ((xh - x_mean) ** 2).sum(axis=1, keepdims=True))
+    line = y_mean + slope * (x - x_mean)
+    residual = hr_smooth - line
+
+    below = residual < -tolerance
+    below[:, :half] = False
+    found = below.any(axis=1)
+    idx = np.maximum(np.argmax(below, axis=1) - 1, 0)
+    rows = np.arange(len(times))
+    sse = ((hr[:, :half] - line[:, :half]) ** 2).sum(axis=1)
+    return {
+        'hrdp_time': np.where(found, times[rows, idx], np.nan),
+        'hrdp_hr': np.where(found, hr_smooth[rows, idx], np.nan),
+        'sse': sse,
+        'error': np.where(found, None, "no deflection from linearity")
+    }
+
+
+_METHOD_FUNCTIONS = {'sdmax': _sdmax, 'dmax': _dmax, 'piecewise': _piecewise, 'conconi': _conconi}
+
+
+def _fit_group(ids: List[Hashable], times: np.ndarray, hr: np.ndarray,
+               methods: Sequence[str], resolution: int) -> List[Dict]:
+    """Fit every method on a stack of equal-length series"""
+    hr_smooth = _smooth(hr)
+    n = times.shape[1]
+    records = []
+    for method in methods:
+        result = _METHOD_FUNCTIONS[method](times, hr, hr_smooth, resolution)
+        observed = hr[:, :n // 2] if method == 'conconi' else hr
+        r2 = _r2(observed, result['sse'])
+        rmse = np.sqrt(result['sse'] / observed.shape[1])
+        errors = result.get('error', [None] * len(ids))
+        for i, series_id in enumerate(ids):
+            hrdp_hr = result['hrdp_hr'][i]
+            records.append({
+                'series_id': series_id,
+                'method': method,
+                'hrdp_time': float(result['hrdp_time'][i]),
+                'hrdp_hr': int(hrdp_hr) if np.isfinite(hrdp_hr) else None,
+                'r2': float(r2[i]),
+                'rmse': float(rmse[i]),
+                'n_points': n,
+                'error': errors[i]
+            })
+    return records
+
+
+def _fit_chunk(items: List[Tuple[Hashable, Series]], methods: Sequence[str],
+               resolution: int) -> List[Dict]:
+    """Group a chunk by series length and fit each group as one array operation"""
+    groups = defaultdict(list)
+    records = []
+    for series_id, (timestamps, heart_rates) in items:
+        times = np.asarray(timestamps, dtype=float)
+        hr = np.asarray(heart_rates, dtype=float)
+        error = None
+        if len(times) != len(hr):
+            error = "timestamps and heart rates differ in length"
+        elif len(times) < MIN_POINTS:
+            error = "insufficient data points"
+        elif not (np.all(np.isfinite(times)) and np.all(np.isfinite(hr))):
+            error = "non-finite values"
+        elif np.any(np.diff(times) <= 0):
+            error = "timestamps not strictly increasing"
+        if error:
+            records.extend({'series_id': series_id, 'method': method, 'hrdp_time': np.nan,
+                            'hrdp_hr': None, 'r2': np.nan, 'rmse': np.nan,
+                            'n_points': len(times), 'error': error} for method in methods)
+        else:
+            groups[len(times)].append((series_id, times, hr))
+
+    for members in groups.values():
+        ids = [member[0] for member in members]
+        times = np.stack([member[1] for member in members])
+        hr = np.stack([member[2] for member in members])
+        try:
+            records.extend(_fit_group(ids, times, hr, methods, resolution))
+        except np.linalg.LinAlgError as e:
+            # Fall back to one series at a time so a single bad fit does not sink the group
+            logger.warning(f"Batched HRDP fit failed ({e}), fitting group individually")
+            for series_id, t, h in members:
+                try:
+                    records.extend(_fit_group([series_id], t[None], h[None], methods, resolution))
+                except np.linalg.LinAlgError as inner:
+                    records.extend({'series_id': series_id, 'method': method,
+                                    'hrdp_time': np.nan, 'hrdp_hr': None, 'r2': np.nan,
+                                    'rmse': np.nan, 'n_points': len(t), 'error': str(inner)}
+                                   for method in methods)
+    return records
+
+
+def fit_hrdp_batch(series: Union[Mapping[Hashable, Series], Iterable[Series]],
+                   methods: Sequence[str] = METHODS,
+                   resolution: int = 1000,
+                   n_jobs: int = 1,
+                   chunk_size: int = 512) -> pd.DataFrame:
+    """
+    Estimate HRDP for many ramp tests with several methods.
+    Series of equal length are stacked and fitted as single NumPy
+    operations; chunks of series are spread over worker processes when
+    n_jobs > 1. Series that cannot be fitted get a row with `error` set.
+    Args:
+        series: {series_id: (timestamps, heart_rates)} or a sequence of pairs
+        methods: Any of 'sdmax', 'dmax', 'piecewise', 'conconi'
+        resolution: Grid points for the polynomial methods
+        n_jobs: Worker processes; 1 fits in the calling process
+        chunk_size: Series per chunk of work
+    Returns: DataFrame with one row per series and method, in input order
+    """
+    unknown = set(methods) - set(METHODS)
+    if unknown:
+        raise ValueError(f"Unknown HRDP methods: {sorted(unknown)}")
+    items = list(series.items() if isinstance(series, Mapping) else enumerate(series))
+    if not items:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if n_jobs > 1 and len(chunks) > 1:
+        initializer, initargs = worker_logging()
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=initializer,
+                                 initargs=initargs) as pool:
+            results = pool.map(_fit_chunk, chunks, [methods] * len(chunks),
+                               [resolution] * len(chunks))
+            records = [record for chunk in results for record in chunk]
+    else:
+        records = [record for chunk in chunks for record in _fit_chunk(chunk, methods, resolution)]
+
+    df = pd.DataFrame.from_records(records, columns=RESULT_COLUMNS)
+    order = {series_id: i for i, (series_id, _) in enumerate(items)}
+    df['_order'] = df['series_id'].map(order)
+    df['_method'] = df['method'].map({method: i for i, method in enumerate(methods)})
+    df = df.sort_values(['_order', '_method']).drop(columns=['_order', '_method'])
+    logger.info(f"Fitted HRDP for {len(items)} series with {len(methods)} methods")
+    return df.reset_index(drop=True)
@@ -0,0 +1,258 @@
+# src/analysis/cohort.py
+import bisect
+import logging
+import math
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..models.user import User
+from ..models.workout_session import WorkoutSession, points_to_columns
+from .feature_pipeline import FeaturePipeline
+
+logger = logging.getLogger(__name__)
+
+AGE_BAND_EDGES = (30, 40, 50, 60)
+AGE_BAND_LABELS = ('<30', '30-39', '40-49', '50-59', '60+')
+SPEED_BIN = 1.0  # km/h
+SLOPE_BIN = 2.0  # %
+GROUP_KEYS = ['age_band', 'gender', 'speed_bin', 'slope_bin']
+UNKNOWN_GENDER = 'unknown'
+
+# Heart rates are below this, so (group code, HR) packs into one sortable float
+_HR_SPAN = 1000.0
+
+
+def age_band(age) -> np.ndarray:
+    """Index into AGE_BAND_LABELS for each age"""
+    return np.searchsorted(AGE_BAND_EDGES, np.asarray(age), side='right')
+
+
+def workload_bins(speed, slope) -> Tuple[np.ndarray, np.ndarray]:
+    """Speed and slope bin indices"""
+    return (np.floor(np.asarray(speed, dtype=float) / SPEED_BIN).astype(np.int64),
+            np.floor(np.asarray(slope, dtype=float) / SLOPE_BIN).astype(np.int64))
+
+
+def _gender_code(gender) -> np.ndarray:
+    """Normalized gender labels; missing values form their own 'unknown' group"""
+    labels = pd.Series(np.asarray(gender, dtype=object)).fillna('').astype(str).str.strip().str.lower()
+    return labels.mask(labels.isin(['', 'nan', 'none']), UNKNOWN_GENDER).to_numpy(dtype=object)
+
+
+def _gender_key(gender) -> str:
+    """Scalar version of _gender_code"""
+    label = str(gender).strip().lower() if gender is not None else ''
+    return UNKNOWN_GENDER if label in ('', 'nan', 'none') else label
+
+
+def session_profile(session: WorkoutSession) -> pd.DataFrame:
+    """
+    Median heart rate of a session at each speed/slope bin.
+    Returns: Frame indexed by (speed_bin, slope_bin) with heart_rate and seconds
+    """
+    columns = points_to_columns(session.data_points)
+    df = pd.DataFrame({name: columns[name] for name in ('timestamp', 'heart_rate', 'speed', 'slope')})
+    if df.empty:
+        return pd.DataFrame(columns=['heart_rate', 'seconds'])
+    df['speed_bin'], df['slope_bin'] = workload_bins(df['speed'], df['slope'])
+    df['seconds'] = df['timestamp'].diff().shift(-1).fillna(0.0)
+    return df.groupby(['speed_bin', 'slope_bin']).agg(
+        heart_rate=('heart_rate', 'median'), seconds=('seconds', 'sum'))
+
+
+class HistoryIndex:
+    """
+    Workload profiles of past sessions, kept per user.
+    Each session is reduced to its (speed_bin, slope_bin) -> median HR,
+    seconds profile once, when it is added; comparisons then aggregate
+    the stored profiles instead of reloading raw samples.
+    """
+    PROFILE_COLUMNS = ['session_id', 'speed_bin', 'slope_bin', 'heart_rate', 'seconds']
+
+    def __init__(self):
+        self._profiles: Dict[int, Dict[int, pd.DataFrame]] = {}
+        self._tables: Dict[int, pd.DataFrame] = {}
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[WorkoutSession]) -> 'HistoryIndex':
+        index = cls()
+        for session in sessions:
+            index.add_session(session)
+        return index
+
+    def add_session(self, session: WorkoutSession):
+        """Profile a session and store it (replacing an earlier version)"""
+        profile = session_profile(session).reset_index()
+        profile.insert(0, 'session_id', session.id)
+        self._profiles.setdefault(session.user_id, {})[session.id] = profile
+        self._tables.pop(session.user_id, None)
+
+    def remove_session(self, user_id: int, session_id: int):
+        if self._profiles.get(user_id, {}).pop(session_id, None) is not None:
+            self._tables.pop(user_id, None)
+
+    def profiles(self, user_id: int) -> pd.DataFrame:
+        """All stored profiles of a user, one row per session and workload bin"""
+        if user_id not in self._tables:
+            frames = [profile for profile in self._profiles.get(user_id, {}).values()
+                      if not profile.empty]
+            self._tables[user_id] = (pd.concat(frames, ignore_index=True) if frames
+                                     else pd.DataFrame(columns=self.PROFILE_COLUMNS))
+        return self._tables[user_id]
+
+    def compare(self, session: WorkoutSession) -> pd.DataFrame:
+        """Compare a session with the user's other stored sessions; see compare_to_history"""
+        past = self.profiles(session.user_id)
+        return _compare_profiles(session_profile(session), past[past['session_id'] != session.id])
+
+
+def _compare_profiles(current: pd.DataFrame, past: pd.DataFrame) -> pd.DataFrame:
+    """Join a session profile with per-workload statistics of past profiles"""
+    if past.empty:
+        result = current[['heart_rate']].copy()
+        result['history_sessions'] = 0
+        return result
+
+    summary = past.groupby(['speed_bin', 'slope_bin'])['heart_rate'].agg(
+        history_mean='mean', history_min='min', history_max='max', history_sessions='count')
+    result = current[['heart_rate']].join(summary, how='left')
+    result['history_sessions'] = result['history_sessions'].fillna(0).astype(int)
+    result['delta_hr'] = result['heart_rate'] - result['history_mean']
+    return result
+
+
+def compare_to_history(session: WorkoutSession,
+                       history: Union[HistoryIndex, Iterable[WorkoutSession]]) -> pd.DataFrame:
+    """
+    Compare a session with the same user's earlier sessions, workload by workload.
+    Pass a HistoryIndex to compare against its stored profiles of the
+    session's user; a plain sequence of sessions is profiled on the fly.
+    Returns: Frame indexed by (speed_bin, slope_bin) with the session's HR, the
+             history mean/min/max of per-session median HR, the difference and
+             the number of history sessions at that workload
+    """
+    if isinstance(history, HistoryIndex):
+        return history.compare(session)
+    profiles = [session_profile(past).reset_index() for past in history]
+    profiles = [profile for profile in profiles if not profile.empty]
+    past = (pd.concat(profiles, ignore_index=True) if profiles
+            else pd.DataFrame(columns=HistoryIndex.PROFILE_COLUMNS))
+    return _compare_profiles(session_profile(session), past)
+
+
+class CohortIndex:
+    """
+    Precomputed cohort statistics of heart rate at a given workload.
+    Records are grouped by age band, gender, speed bin and slope bin. Group
+    rollups (count, mean, quartiles) are computed once; percentile ranks use
+    a single array sorted by (group, heart rate), so ranking many queries is
+    one vectorized searchsorted instead of a scan over raw samples.
+    """
+    def __init__(self, records: pd.DataFrame):
+        """
+        Args:
+            records: One row per session (or dataset row) with age, gender,
+                     speed, slope and heart_rate columns
+        """
+        df = pd.DataFrame({
+            'age_band': age_band(records['age']),
+            'gender': _gender_code(records['gender']),
+            'heart_rate': records['heart_rate'].to_numpy(dtype=float)
+        })
+        df['speed_bin'], df['slope_bin'] = workload_bins(records['speed'], records['slope'])
+        df = df[np.isfinite(df['heart_rate'])]
+        if (df['heart_rate'] >= _HR_SPAN).any() or (df['heart_rate'] < 0).any():
+            raise ValueError("Heart rates must be between 0 and 1000 bpm")
+
+        grouped = df.groupby(GROUP_KEYS)['heart_rate']
+        quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        self.rollup = grouped.agg(['count', 'mean'])
+        self.rollup['p25'] = quartiles[0.25]
+        self.rollup['median'] = quartiles[0.5]
+        self.rollup['p75'] = quartiles[0.75]
+        self._rollup_lookup: Dict[Tuple, Dict] = {
+            key: row for key, row in zip(self.rollup.index, self.rollup.to_dict('records'))
+        }
+
+        # Dense group codes; each group's HRs sit contiguously in ascending order
+        self._group_codes = {key: code for code, key in enumerate(self.rollup.index)}
+        codes = pd.MultiIndex.from_frame(df[GROUP_KEYS]).map(self._group_codes).to_numpy(dtype=float)
+        self._sorted_keys = np.sort(codes * _HR_SPAN + df['heart_rate'].to_numpy())
+        self._group_start = np.searchsorted(self._sorted_keys, np.arange(len(self.rollup)) * _HR_SPAN)
+        self._group_end = np.searchsorted(self._sorted_keys, (np.arange(len(self.rollup)) + 1) * _HR_SPAN)
+        logger.info(f"Cohort index built from {len(df)} records in {len(self.rollup)} groups")
+
+    @classmethod
+    def from_dataset(cls, data: Union[str, pd.DataFrame]) -> 'CohortIndex':
+        """Build from the treadmill training CSV (path or raw frame)"""
+        pipeline = FeaturePipeline()
+        df = pipeline.run_csv(data) if isinstance(data, str) else pipeline.run(data)
+        return cls(df)
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Tuple[User, WorkoutSession]]) -> 'CohortIndex':
+        """Build from recorded sessions, one record per session and workload bin"""
+        frames = []
+        for user, session in sessions:
+            profile = session_profile(session)
+            if profile.empty:
+                continue
+            profile = profile.reset_index()
+            frames.append(pd.DataFrame({
+                'age': user.age,
+                'gender': user.gender,
+                # Bin centres, so the records fall back into the same bins
+                'speed': (profile['speed_bin'] + 0.5) * SPEED_BIN,
+                'slope': (profile['slope_bin'] + 0.5) * SLOPE_BIN,
+                'heart_rate': profile['heart_rate']
+            }))
+        if not frames:
+            raise ValueError("No session data to build a cohort from")
+        return cls(pd.concat(frames, ignore_index=True))
+
+    @staticmethod
+    def _key(age: int, gender: str, speed: float, slope: float) -> Tuple:
+        """Group key of a single query, without NumPy/pandas call overhead"""
+        return (bisect.bisect_right(AGE_BAND_EDGES, age), _gender_key(gender),
+                math.floor(speed / SPEED_BIN), math.floor(slope / SLOPE_BIN))
+
+    def hr_at(self, age: int, gender: str, speed: float, slope: float) -> Optional[Dict]:
+        """Cohort HR statistics at a workload, or None if the cohort has no data there"""
+        return self._rollup_lookup.get(self._key(age, gender, speed, slope))
+
+    def percentile_ranks(self, queries: pd.DataFrame) -> np.ndarray:
+        """
+        Percentile rank of each query's heart rate within its cohort group.
+        The rank is the percentage of the group with HR at or below the
+        query; at equal workload a lower rank means a lower (fitter) HR.
+        Args:
+            queries: Frame with age, gender, speed, slope and heart_rate columns
+        Returns: Array of ranks in [0, 100], NaN where the group is empty
+        """
+        keys = pd.DataFrame({'age_band': age_band(queries['age']),
+                             'gender': _gender_code(queries['gender'])})
+        keys['speed_bin'], keys['slope_bin'] = workload_bins(queries['speed'], queries['slope'])
+        codes = pd.MultiIndex.from_frame(keys[GROUP_KEYS]).map(self._group_codes)
+        codes = np.asarray(codes, dtype=float)
+
+        known = np.isfinite(codes)
+        ranks = np.full(len(queries), np.nan)
+        if not known.any():
+            return ranks
+        group = codes[known].astype(np.int64)
+        hr = np.clip(queries['heart_rate'].to_numpy(dtype=float)[known], 0, _HR_SPAN - 1)
+        at_or_below = np.searchsorted(self._sorted_keys, group * _HR_SPAN + hr, side='right')
+        start, end = self._group_start[group], self._group_end[group]
+        ranks[known] = (at_or_below - start) / (end - start) * 100
+        return ranks
+
+    def percentile_rank(self, heart_rate: float, age: int, gender: str,
+                        speed: float, slope: float) -> Optional[float]:
+        """Percentile rank of a single heart rate; see percentile_ranks"""
+        rank = self.percentile_ranks(pd.DataFrame({
+            'age': [age], 'gender': [gender], 'speed': [speed], 'slope': [slope],
+            'heart_rate': [heart_rate]
+        }))[0]
+        return None if np.isnan(rank) else float(rank)
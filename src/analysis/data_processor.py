@@ -4,16 +4,17 @@ import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
-from ..models.workout_session import WorkoutPoint
+from ..models.workout_session import WorkoutPoint, points_to_columns
+from ..utils.logging_utils import log_event
 
-logger = logging.getLogger(_name_)
+logger = logging.getLogger(__name__)
 
 class DataProcessor:
     """
     Processes and analyzes workout data, including real-time analysis
     and post-workout statistics.
     """
-    def _init_(self):
+    def __init__(self):
         self.workout_data: List[WorkoutPoint] = []
         self.current_session_id: Optional[int] = None
         self.session_start_time: Optional[datetime] = None
@@ -23,16 +24,17 @@ class DataProcessor:
         self.current_session_id = session_id
         self.session_start_time = datetime.now()
         self.workout_data = []
-        logger.info(f"Started new workout session {session_id}")
+        log_event(logger, logging.INFO, "session_started", session_id=session_id)
 
     def add_workout_point(self, timestamp: float, heart_rate: int, 
-                          speed: float, slope: float):
+                          speed: float, slope: float, segment: Optional[int] = None):
         """Add a new data point from the workout"""
         point = WorkoutPoint(
             timestamp=timestamp,
             heart_rate=heart_rate,
             speed=speed,
-            slope=slope
+            slope=slope,
+            segment=segment
         )
         self.workout_data.append(point)
 
@@ -64,7 +66,7 @@ class DataProcessor:
             return 0.0
 
         try:
-            df = pd.DataFrame([vars(p) for p in self.workout_data])
+            df = pd.DataFrame(points_to_columns(self.workout_data))
             duration_hours = (df['timestamp'].max() - df['timestamp'].min()) / 3600
 
             if method == 'trimp':
@@ -86,13 +88,13 @@ class DataProcessor:
         Uses basic MET calculations based on speed and incline
         """
         try:
-            mets = df.apply(lambda row: 
-                           1.0 if row['speed'] == 0 else
-                           2.0 if row['speed'] < 4 else
-                           7.0 if row['speed'] < 8 else
-                           10.0 if row['speed'] < 12 else
-                           14.0, axis=1)
-            mets = mets * (1 + df['slope'] * 0.1)
+            speed = df['speed'].to_numpy()
+            mets = np.select(
+                [speed == 0, speed < 4, speed < 8, speed < 12],
+                [1.0, 2.0, 7.0, 10.0],
+                default=14.0
+            )
+            mets = pd.Series(mets, index=df.index) * (1 + df['slope'] * 0.1)
             calories_per_minute = mets * 3.5 * 70 / 200
             duration_minutes = (df['timestamp'].max() - df['timestamp'].min()) / 60
             return calories_per_minute.mean() * duration_minutes
@@ -140,7 +142,7 @@ class DataProcessor:
     def export_to_csv(self, filename: str):
         """Export workout data to CSV file"""
         try:
-            df = pd.DataFrame([vars(p) for p in self.workout_data])
+            df = pd.DataFrame(points_to_columns(self.workout_data))
             df.to_csv(filename, index=False)
             logger.info(f"Workout data exported to {filename}")
         except Exception as e:
@@ -0,0 +1,257 @@
+# src/analysis/downsampling.py
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import AppSettings, Settings
+from ..models.workout_session import WorkoutSession, points_to_columns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTIONS = (5, 30, 300)  # seconds
+ROLLUP_FIELDS = ('heart_rate', 'speed', 'slope')
+
+Rollup = Dict[str, np.ndarray]
+
+
+def _zone_names(zones: Dict[str, Tuple[float, float]]) -> List[str]:
+    return [f"zone_{name.lower()}" for name in zones]
+
+
+def _raw_level(timestamps: np.ndarray, values: Dict[str, np.ndarray],
+               max_hr: int, zones: Dict[str, Tuple[float, float]]) -> Rollup:
+    """Express raw samples in rollup form: one bucket per sample"""
+    level = {'time': timestamps, 'count': np.ones(len(timestamps))}
+    for name in ROLLUP_FIELDS:
+        level[f"{name}_mean"] = level[f"{name}_min"] = level[f"{name}_max"] = values[name]
+
+    # Each sample dwells until the next one; gaps count at most twice the
+    # typical sample interval so dropouts don't inflate zone time
+    if len(timestamps) > 1:
+        intervals = np.diff(timestamps)
+        nominal = float(np.median(intervals))
+        dwell = np.minimum(np.append(intervals, nominal), 2 * nominal)
+    else:
+        dwell = np.zeros(len(timestamps))
+
+    hr_fraction = values['heart_rate'] / max_hr
+    for column, (lower, upper) in zip(_zone_names(zones), zones.values()):
+        in_zone = (hr_fraction >= lower) & (hr_fraction < upper)
+        if upper >= 1.0:
+            in_zone |= hr_fraction >= upper
+        level[column] = np.where(in_zone, dwell, 0.0)
+    return level
+
+
+def _reduce_level(level: Rollup, resolution: int) -> Rollup:
+    """Merge buckets of a finer level into epoch-aligned buckets of `resolution` seconds"""
+    bucket = np.floor(level['time'] / resolution).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+    counts = np.add.reduceat(level['count'], starts)
+    reduced = {'time': bucket[starts].astype(float) * resolution, 'count': counts}
+    for name in ROLLUP_FIELDS:
+        weighted = np.add.reduceat(level[f"{name}_mean"] * level['count'], starts)
+        reduced[f"{name}_mean"] = weighted / counts
+        reduced[f"{name}_min"] = np.minimum.reduceat(level[f"{name}_min"], starts)
+        reduced[f"{name}_max"] = np.maximum.reduceat(level[f"{name}_max"], starts)
+    for column in level:
+        if column.startswith('zone_'):
+            reduced[column] = np.add.reduceat(level[column], starts)
+    return reduced
+
+
+def build_rollups(timestamps: Sequence[float], heart_rates: Sequence[float],
+                  speeds: Sequence[float], slopes: Sequence[float],
+                  resolutions: Iterable[int] = DEFAULT_RESOLUTIONS,
+                  max_hr: Optional[int] = None,
+                  zones: Optional[Dict[str, Tuple[float, float]]] = None,
+                  settings: Optional[AppSettings] = None) -> Dict[int, Rollup]:
+    """
+    Downsample a sample stream into multi-resolution rollups.
+    Each level holds per-bucket time, count, mean/min/max of heart rate,
+    speed and slope, and seconds spent in each training zone. Coarser levels
+    are derived from the next finer one, so every level is a single pass.
+    Args:
+        timestamps: Sample times in seconds
+        heart_rates, speeds, slopes: Sample values
+        resolutions: Bucket widths in seconds, each a multiple of the previous
+        max_hr: Maximum heart rate used for zone bounds
+        zones: Zone name -> (lower, upper) fraction of max_hr
+        settings: Loaded settings supplying max_hr and zones when not given
+    Returns: Mapping of resolution -> rollup arrays
+    """
+    max_hr = max_hr or Settings.value(settings, 'MAX_HEART_RATE_DEFAULT')
+    zones = zones or Settings.value(settings, 'TRAINING_ZONES')
+    resolutions = sorted(resolutions)
+    for finer, coarser in zip(resolutions, resolutions[1:]):
+        if coarser % finer:
+            raise ValueError(f"Resolution {coarser}s is not a multiple of {finer}s")
+
+    timestamps = np.asarray(timestamps, dtype=float)
+    if len(timestamps) == 0:
+        return {}
+    order = np.argsort(timestamps, kind='stable')
+    values = {
+        'heart_rate': np.asarray(heart_rates, dtype=float)[order],
+        'speed': np.asarray(speeds, dtype=float)[order],
+        'slope': np.asarray(slopes, dtype=float)[order]
+    }
+
+    level = _raw_level(timestamps[order], values, max_hr, zones)
+    rollups = {}
+    for resolution in resolutions:
+        level = _reduce_level(level, resolution)
+        rollups[resolution] = level
+    return rollups
+
+
+def rollup_session(session: WorkoutSession, resolutions: Iterable[int] = DEFAULT_RESOLUTIONS,
+                   max_hr: Optional[int] = None,
+                   zones: Optional[Dict[str, Tuple[float, float]]] = None,
+                   settings: Optional[AppSettings] = None) -> Dict[int, Rollup]:
+    """Build rollups from the data points of a WorkoutSession"""
+    columns = points_to_columns(session.data_points)
+    return build_rollups(columns['timestamp'], columns['heart_rate'], columns['speed'],
+                         columns['slope'], resolutions, max_hr, zones, settings)
+
+
+def select_resolution(span: float, max_points: int,
+                      resolutions: Iterable[int] = DEFAULT_RESOLUTIONS) -> int:
+    """
+    Pick the finest resolution that still covers `span` seconds in at most
+    `max_points` buckets, i.e. the coarsest level the query actually needs.
+    Falls back to the coarsest level for very long spans.
+    """
+    resolutions = sorted(resolutions)
+    for resolution in resolutions:
+        if span / resolution <= max_points:
+            return resolution
+    return resolutions[-1]
+
+
+class RollupStore:
+    """
+    On-disk store of downsampled session history.
+    Each session is written as one .npz file per resolution plus an entry in
+    a small JSON index, so a query only opens the files of a single level
+    for the sessions that overlap the requested time range. Zones, default
+    max heart rate and the query point budget come from the loaded settings;
+    apply_settings() picks up a reload for sessions added afterwards. The
+    index records the zones each session was stored with, since sessions
+    already on disk keep theirs.
+    """
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory: str, resolutions: Iterable[int] = DEFAULT_RESOLUTIONS,
+                 settings: Optional[AppSettings] = None):
+        self.directory = directory
+        self.resolutions = tuple(sorted(resolutions))
+        self.apply_settings(settings)
+        os.makedirs(directory, exist_ok=True)
+        self.index: Dict[str, Dict] = self._load_index()
+
+    def apply_settings(self, settings: Optional[AppSettings], changed: Optional[List[str]] = None):
+        """Read rollup settings; suitable as a SettingsManager subscriber"""
+        self.zones = Settings.value(settings, 'TRAINING_ZONES')
+        self.max_hr = Settings.value(settings, 'MAX_HEART_RATE_DEFAULT')
+        self.max_points = Settings.value(settings, 'MAX_PLOT_POINTS')
+
+    def _load_index(self) -> Dict[str, Dict]:
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _save_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, path)
+
+    def _level_path(self, session_id, resolution: int) -> str:
+        return os.path.join(self.directory, f"session_{session_id}_{resolution}s.npz")
+
+    def add_session(self, session: WorkoutSession, max_hr: Optional[int] = None,
+                    zones: Optional[Dict[str, Tuple[float, float]]] = None):
+        """Downsample a session and write all of its levels"""
+        max_hr = max_hr or self.max_hr
+        zones = zones or self.zones
+        rollups = rollup_session(session, self.resolutions, max_hr, zones)
+        if not rollups:
+            logger.warning(f"Session {session.id} has no data points, nothing to store")
+            return
+
+        for resolution, level in rollups.items():
+            np.savez(self._level_path(session.id, resolution), **level)
+
+        finest = rollups[self.resolutions[0]]
+        self.index[str(session.id)] = {
+            'user_id': session.user_id,
+            'start': float(finest['time'][0]),
+            'end': float(finest['time'][-1] + self.resolutions[0]),
+            'max_hr': max_hr,
+            'zones': {name: list(bounds) for name, bounds in zones.items()}
+        }
+        self._save_index()
+        logger.info(f"Stored rollups for session {session.id}")
+
+    def remove_session(self, session_id):
+        """Delete all stored levels of a session"""
+        if self.index.pop(str(session_id), None) is None:
+            return
+        for resolution in self.resolutions:
+            path = self._level_path(session_id, resolution)
+            if os.path.exists(path):
+                os.remove(path)
+        self._save_index()
+
+    def load_level(self, session_id, resolution: int) -> Rollup:
+        """Read one level of one session"""
+        with np.load(self._level_path(session_id, resolution)) as data:
+            return {name: data[name] for name in data.files}
+
+    def query(self, start: float, end: float, max_points: Optional[int] = None,
+              user_id: Optional[int] = None) -> Tuple[int, Rollup]:
+        """
+        Return rollup buckets between start and end (seconds since epoch).
+        The level is chosen automatically from the span and max_points.
+        Args:
+            start, end: Time range to return
+            max_points: Bucket budget, defaults to MAX_PLOT_POINTS
+            user_id: Only include sessions of this user
+        Returns: (resolution used, rollup arrays concatenated across sessions);
+                 zone columns cover every zone set used by those sessions,
+                 NaN where a session was stored with other zones
+        """
+        if end <= start:
+            raise ValueError("Query end must be after start")
+        max_points = max_points or self.max_points
+        resolution = select_resolution(end - start, max_points, self.resolutions)
+
+        sessions = sorted(
+            (entry['start'], session_id) for session_id, entry in self.index.items()
+            if entry['start'] < end and entry['end'] > start
+            and (user_id is None or entry['user_id'] == user_id)
+        )
+        parts = []
+        for _, session_id in sessions:
+            level = self.load_level(session_id, resolution)
+            mask = (level['time'] + resolution > start) & (level['time'] < end)
+            parts.append({name: values[mask] for name, values in level.items()})
+
+        if not parts:
+            return resolution, {}
+        # Sessions stored before a zone change have other zone columns; a
+        # column a session lacks is NaN for its buckets
+        columns = list(dict.fromkeys(name for part in parts for name in part))
+        return resolution, {
+            name: np.concatenate([part[name] if name in part
+                                  else np.full(len(part['time']), np.nan) for part in parts])
+            for name in columns
+        }
@@ -0,0 +1,135 @@
+# src/analysis/feature_pipeline.py
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..models.user import HRR_ZONES
+from ..utils.logging_utils import log_event
+
+logger = logging.getLogger(__name__)
+
+# Raw CSV header -> internal column name
+DATASET_COLUMNS = {
+    'Age': 'age',
+    'Gender': 'gender',
+    'Weight (kg)': 'weight',
+    'Resting HR (bpm)': 'resting_hr',
+    'Heart Rate (bpm)': 'heart_rate',
+    'Speed (km/h)': 'speed',
+    'Slope (%)': 'slope',
+    'Duration (minutes)': 'duration_minutes',
+    'Energy Expended (kcal)': 'energy_kcal',
+    'Anaerobic Threshold Reached?': 'threshold_reached',
+    'Target Speed (km/h)': 'target_speed',
+    'Target Slope (%)': 'target_slope'
+}
+
+# Zone labels in HRR order, with one extra label for anything below the first zone
+ZONE_LABELS = ['below_recovery'] + list(HRR_ZONES)
+_ZONE_EDGES = np.array([lower for lower, _ in HRR_ZONES.values()])
+
+# ACSM metabolic equations switch from walking to running at about 8 km/h
+RUNNING_SPEED_KMH = 8.0
+
+
+def _text_flag(values: pd.Series, true_value: str) -> np.ndarray:
+    """Case-insensitive equality against a string, compared once per distinct value"""
+    codes, uniques = pd.factorize(values)
+    lookup = np.array([str(u).lower() == true_value for u in uniques] + [False])
+    return lookup[codes]  # missing values have code -1 and map to False
+
+
+class FeaturePipeline:
+    """
+    Vectorized feature engineering over the treadmill training dataset.
+    Every step works on whole columns, so the pipeline scales to millions
+    of rows. Wall-clock time of each step is recorded in `timings`.
+    """
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.steps: List[Tuple[str, Callable[[pd.DataFrame], pd.DataFrame]]] = [
+            ('normalize', self.normalize_columns),
+            ('heart_rate_reserve', self.add_heart_rate_reserve),
+            ('zones', self.add_zones),
+            ('mets', self.add_mets),
+            ('calories', self.add_predicted_calories)
+        ]
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run all steps on a raw dataset frame.
+        Args:
+            df: Frame with the columns of treadmill_training_data.csv
+        Returns: New frame with normalized and derived feature columns
+        """
+        self.timings = {}
+        for name, step in self.steps:
+            start = time.perf_counter()
+            df = step(df)
+            self.timings[name] = time.perf_counter() - start
+
+        log_event(logger, logging.INFO, "features_computed", rows=len(df),
+                  total_ms=round(sum(self.timings.values()) * 1000, 1))
+        return df
+
+    def run_csv(self, filepath: str) -> pd.DataFrame:
+        """Load a dataset CSV and run the pipeline on it"""
+        start = time.perf_counter()
+        df = pd.read_csv(filepath)
+        load_time = time.perf_counter() - start
+        df = self.run(df)
+        self.timings = {'load': load_time, **self.timings}
+        return df
+
+    @staticmethod
+    def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Rename dataset columns and convert flags to booleans"""
+        df = df.rename(columns=DATASET_COLUMNS)
+        df['gender_male'] = _text_flag(df['gender'], 'male')
+        if not pd.api.types.is_bool_dtype(df['threshold_reached']):
+            df['threshold_reached'] = _text_flag(df['threshold_reached'], 'yes')
+        return df
+
+    @staticmethod
+    def add_heart_rate_reserve(df: pd.DataFrame) -> pd.DataFrame:
+        """Add age-predicted max HR (as in User) and percent heart rate reserve"""
+        max_hr = 220 - df['age'].to_numpy()
+        resting_hr = df['resting_hr'].to_numpy()
+        df['max_hr'] = max_hr
+        df['hrr_pct'] = (df['heart_rate'].to_numpy() - resting_hr) / (max_hr - resting_hr) * 100
+        return df
+
+    @staticmethod
+    def add_zones(df: pd.DataFrame) -> pd.DataFrame:
+        """Classify each row into the User HRR training zones"""
+        codes = np.searchsorted(_ZONE_EDGES, df['hrr_pct'].to_numpy() / 100, side='right')
+        df['zone'] = pd.Categorical.from_codes(codes, categories=ZONE_LABELS)
+        return df
+
+    @staticmethod
+    def add_mets(df: pd.DataFrame) -> pd.DataFrame:
+        """Estimate METs with the ACSM walking/running equations"""
+        speed_m_min = df['speed'].to_numpy() * 1000 / 60
+        grade = df['slope'].to_numpy() / 100
+        running = df['speed'].to_numpy() >= RUNNING_SPEED_KMH
+
+        # VO2 in ml/kg/min: horizontal + vertical + resting component
+        vo2 = np.where(
+            running,
+            0.2 * speed_m_min + 0.9 * speed_m_min * grade,
+            0.1 * speed_m_min + 1.8 * speed_m_min * grade
+        ) + 3.5
+        df['mets'] = vo2 / 3.5
+        return df
+
+    @staticmethod
+    def add_predicted_calories(df: pd.DataFrame) -> pd.DataFrame:
+        """Predict energy expenditure as METs x body mass x hours"""
+        hours = df['duration_minutes'].to_numpy() / 60
+        df['predicted_kcal'] = df['mets'].to_numpy() * df['weight'].to_numpy() * hours
+        if 'energy_kcal' in df:
+            df['kcal_residual'] = df['energy_kcal'].to_numpy() - df['predicted_kcal'].to_numpy()
+        return df
@@ -0,0 +1,194 @@
+# src/analysis/fusion.py
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.workout_session import WorkoutPoint
+
+logger = logging.getLogger(__name__)
+
+
+class StreamBuffer:
+    """
+    Samples of one sensor stream, each stamped with its source time.
+    Appends are O(1) and thread-safe, so acquisition threads can push
+    samples as they arrive; ordering and clean-up happen when arrays are
+    taken for resampling.
+    """
+    def __init__(self, name: str, fields: Sequence[str], max_samples: Optional[int] = None):
+        self.name = name
+        self.fields = tuple(fields)
+        self.max_samples = max_samples
+        self._times: List[float] = []
+        self._values: List[Tuple[float, ...]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def add(self, timestamp: float, *values: float):
+        if len(values) != len(self.fields):
+            raise ValueError(f"{self.name} expects {len(self.fields)} values, got {len(values)}")
+        with self._lock:
+            self._times.append(timestamp)
+            self._values.append(values)
+            if self.max_samples is not None and len(self._times) > self.max_samples:
+                excess = len(self._times) - self.max_samples
+                del self._times[:excess]
+                del self._values[:excess]
+
+    def discard_before(self, timestamp: float):
+        """Drop samples older than `timestamp`"""
+        with self._lock:
+            keep = next((i for i, t in enumerate(self._times) if t >= timestamp), len(self._times))
+            del self._times[:keep]
+            del self._values[:keep]
+
+    def arrays(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Samples as arrays, sorted by time with duplicate timestamps resolved
+        to the latest-received value. Out-of-order arrivals (jitter) are fixed
+        by the sort.
+        """
+        with self._lock:
+            times = np.array(self._times, dtype=float)
+            values = np.array(self._values, dtype=float).reshape(len(times), len(self.fields))
+
+        # Reverse so that, after a stable sort, the last-received duplicate comes first
+        times, values = times[::-1], values[::-1]
+        order = np.argsort(times, kind='stable')
+        times, values = times[order], values[order]
+        unique = np.r_[True, np.diff(times) > 0] if len(times) else np.zeros(0, dtype=bool)
+        times, values = times[unique], values[unique]
+        return times, {name: values[:, i] for i, name in enumerate(self.fields)}
+
+
+def _gap_mask(times: np.ndarray, grid: np.ndarray, max_gap: float) -> np.ndarray:
+    """True where a grid point lies between two samples no further apart than max_gap"""
+    right = np.searchsorted(times, grid, side='left')
+    left = np.searchsorted(times, grid, side='right') - 1
+    inside = (left >= 0) & (right < len(times))
+    mask = np.zeros(len(grid), dtype=bool)
+    if len(times):
+        lo = np.clip(left, 0, len(times) - 1)
+        hi = np.clip(right, 0, len(times) - 1)
+        mask = inside & (times[hi] - times[lo] <= max_gap)
+    return mask
+
+
+def interpolate_linear(times: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                       max_gap: float) -> np.ndarray:
+    """Linear interpolation onto `grid`; NaN across gaps and outside the samples"""
+    if len(times) == 0:
+        return np.full(len(grid), np.nan)
+    result = np.interp(grid, times, values)
+    result[~_gap_mask(times, grid, max_gap)] = np.nan
+    return result
+
+
+def interpolate_hold(times: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                     max_gap: float) -> np.ndarray:
+    """
+    Zero-order hold onto `grid`, for setpoint-like signals such as speed and
+    slope which change in steps; NaN across gaps and outside the samples.
+    """
+    if len(times) == 0:
+        return np.full(len(grid), np.nan)
+    index = np.clip(np.searchsorted(times, grid, side='right') - 1, 0, len(times) - 1)
+    result = values[index]
+    result[~_gap_mask(times, grid, max_gap)] = np.nan
+    return result
+
+
+def distance_km(times: np.ndarray, speeds: np.ndarray) -> float:
+    """Distance covered from aligned time (s) and speed (km/h) arrays, skipping gaps"""
+    valid = np.isfinite(speeds[:-1]) & np.isfinite(speeds[1:])
+    dt = np.diff(times)
+    mean_speed = (speeds[:-1] + speeds[1:]) / 2
+    return float(np.sum(mean_speed[valid] * dt[valid]) / 3600)
+
+
+class SensorFusion:
+    """
+    Aligns asynchronous heart rate and treadmill streams on a uniform grid.
+    Each sample is stamped at its source, either with the sensor's own time
+    or with the fusion clock when it is received. resample() then places
+    both streams on one grid with vectorized interpolation: heart rate
+    linearly, speed and slope as held setpoints. Grid points that fall in a
+    gap longer than max_gap in either stream are NaN and flagged invalid.
+    """
+    def __init__(self, rate_hz: float = 1.0, max_gap: float = 5.0,
+                 max_samples: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            rate_hz: Output grid rate
+            max_gap: Longest gap in seconds bridged by interpolation
+            max_samples: Per-stream buffer limit, unlimited if None
+            clock: Time source for samples without a source timestamp
+        """
+        if rate_hz <= 0:
+            raise ValueError("Resampling rate must be positive")
+        self.rate_hz = rate_hz
+        self.max_gap = max_gap
+        self.clock = clock
+        self.heart_rate = StreamBuffer('heart_rate', ('heart_rate',), max_samples)
+        self.treadmill = StreamBuffer('treadmill', ('speed', 'slope'), max_samples)
+
+    def add_heart_rate(self, heart_rate: float, timestamp: Optional[float] = None):
+        self.heart_rate.add(self.clock() if timestamp is None else timestamp, heart_rate)
+
+    def add_treadmill(self, speed: float, slope: float, timestamp: Optional[float] = None):
+        self.treadmill.add(self.clock() if timestamp is None else timestamp, speed, slope)
+
+    def resample(self, start: Optional[float] = None,
+                 end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Resample both streams onto a common grid.
+        Args:
+            start, end: Grid range; defaults to the span covered by both streams
+        Returns: Arrays 'time', 'heart_rate', 'speed', 'slope' and boolean 'valid'
+        """
+        hr_times, hr_values = self.heart_rate.arrays()
+        tm_times, tm_values = self.treadmill.arrays()
+        empty = {name: np.zeros(0) for name in ('time', 'heart_rate', 'speed', 'slope')}
+        empty['valid'] = np.zeros(0, dtype=bool)
+        if len(hr_times) == 0 or len(tm_times) == 0:
+            return empty
+
+        start = max(hr_times[0], tm_times[0]) if start is None else start
+        end = min(hr_times[-1], tm_times[-1]) if end is None else end
+        if end < start:
+            return empty
+
+        step = 1.0 / self.rate_hz
+        grid = start + np.arange(int(np.floor((end - start) / step)) + 1) * step
+        aligned = {
+            'time': grid,
+            'heart_rate': interpolate_linear(hr_times, hr_values['heart_rate'], grid, self.max_gap),
+            'speed': interpolate_hold(tm_times, tm_values['speed'], grid, self.max_gap),
+            'slope': interpolate_hold(tm_times, tm_values['slope'], grid, self.max_gap)
+        }
+        aligned['valid'] = (np.isfinite(aligned['heart_rate']) & np.isfinite(aligned['speed'])
+                            & np.isfinite(aligned['slope']))
+        return aligned
+
+    def to_points(self, aligned: Optional[Dict[str, np.ndarray]] = None) -> List[WorkoutPoint]:
+        """WorkoutPoints for the valid grid points of a resampled window"""
+        aligned = self.resample() if aligned is None else aligned
+        valid = aligned['valid']
+        return [
+            WorkoutPoint(timestamp=t, heart_rate=int(round(hr)), speed=speed, slope=slope)
+            for t, hr, speed, slope in zip(aligned['time'][valid].tolist(),
+                                           aligned['heart_rate'][valid].tolist(),
+                                           aligned['speed'][valid].tolist(),
+                                           aligned['slope'][valid].tolist())
+        ]
+
+    def discard_before(self, timestamp: float):
+        """Release samples that no longer affect resampling after `timestamp`"""
+        self.heart_rate.discard_before(timestamp)
+        self.treadmill.discard_before(timestamp)
@@ -0,0 +1,142 @@
+# src/analysis/recommender.py
+import logging
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..control.limits import SLOPE_LIMITS, SPEED_LIMITS
+from ..models.user import User
+from .feature_pipeline import FeaturePipeline
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ('age', 'gender_male', 'weight', 'resting_hr', 'heart_rate', 'hrr_pct', 'speed', 'slope')
+TARGETS = ('target_speed', 'target_slope')
+
+
+class SpeedSlopeRecommender:
+    """
+    Ridge regression from user physiology and live state to the next
+    interval's target speed and slope.
+    Feature standardization is folded into the weights after fitting, so a
+    single recommendation is a 16-term dot product in plain Python and a
+    batch is one matrix multiply.
+    """
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.weights: Optional[np.ndarray] = None  # (n_features, n_targets)
+        self.intercept: Optional[np.ndarray] = None  # (n_targets,)
+        self._speed_terms: Tuple[float, ...] = ()
+        self._slope_terms: Tuple[float, ...] = ()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.weights is not None
+
+    def fit(self, df: pd.DataFrame) -> 'SpeedSlopeRecommender':
+        """
+        Fit on a FeaturePipeline output frame.
+        Args:
+            df: Frame with FEATURES and TARGETS columns
+        Returns: self
+        """
+        X = df[list(FEATURES)].to_numpy(dtype=float)
+        y = df[list(TARGETS)].to_numpy(dtype=float)
+
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        Xs = (X - mean) / scale
+        y_mean = y.mean(axis=0)
+
+        # Closed-form ridge solution on centred data
+        gram = Xs.T @ Xs + self.alpha * np.eye(Xs.shape[1])
+        coef = np.linalg.solve(gram, Xs.T @ (y - y_mean))
+
+        self._set_parameters(coef / scale[:, None], y_mean - (mean / scale) @ coef)
+        logger.info(f"Fitted speed/slope recommender on {len(df)} rows")
+        return self
+
+    def fit_csv(self, filepath: str) -> 'SpeedSlopeRecommender':
+        """Fit directly on a raw training dataset CSV"""
+        return self.fit(FeaturePipeline().run_csv(filepath))
+
+    def _set_parameters(self, weights: np.ndarray, intercept: np.ndarray):
+        self.weights = weights
+        self.intercept = intercept
+        self._speed_terms = (float(intercept[0]),) + tuple(weights[:, 0].tolist())
+        self._slope_terms = (float(intercept[1]),) + tuple(weights[:, 1].tolist())
+
+    def _check_fitted(self):
+        if not self.is_fitted:
+            raise ValueError("Recommender has not been fitted or loaded")
+
+    def predict_batch(self, X: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+        """
+        Recommend for many treadmills at once.
+        Args:
+            X: (n, len(FEATURES)) array, or a frame with FEATURES columns
+        Returns: (n, 2) array of [speed km/h, slope %]
+        """
+        self._check_fitted()
+        if isinstance(X, pd.DataFrame):
+            X = X[list(FEATURES)].to_numpy(dtype=float)
+        predictions = np.asarray(X, dtype=float) @ self.weights + self.intercept
+        np.clip(predictions[:, 0], *SPEED_LIMITS, out=predictions[:, 0])
+        np.clip(predictions[:, 1], *SLOPE_LIMITS, out=predictions[:, 1])
+        return predictions
+
+    def predict_one(self, features: Tuple[float, ...]) -> Tuple[float, float]:
+        """Recommend for one feature vector in FEATURES order, without NumPy overhead"""
+        self._check_fitted()
+        speed_terms, slope_terms = self._speed_terms, self._slope_terms
+        speed, slope = speed_terms[0], slope_terms[0]
+        for i, value in enumerate(features, 1):
+            speed += speed_terms[i] * value
+            slope += slope_terms[i] * value
+        return (min(max(speed, SPEED_LIMITS[0]), SPEED_LIMITS[1]),
+                min(max(slope, SLOPE_LIMITS[0]), SLOPE_LIMITS[1]))
+
+    @staticmethod
+    def user_features(user: User, heart_rate: float, speed: float, slope: float) -> Tuple[float, ...]:
+        """Build a feature vector from a User and the current treadmill state"""
+        max_hr = user.max_heart_rate or user.calculate_max_heart_rate()
+        resting_hr = user.resting_heart_rate or 60
+        hrr_pct = (heart_rate - resting_hr) / (max_hr - resting_hr) * 100
+        return (user.age, 1.0 if user.gender.lower() == 'male' else 0.0, user.weight,
+                resting_hr, heart_rate, hrr_pct, speed, slope)
+
+    def recommend(self, user: User, heart_rate: float, speed: float, slope: float) -> Tuple[float, float]:
+        """
+        Recommend next-interval speed and slope for a user.
+        Args:
+            user: User whose physiology to use
+            heart_rate: Current (smoothed) heart rate
+            speed, slope: Current treadmill settings
+        Returns: (speed km/h, slope %)
+        """
+        return self.predict_one(self.user_features(user, heart_rate, speed, slope))
+
+    def score(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Root-mean-square error of each target on a FeaturePipeline frame"""
+        errors = self.predict_batch(df) - df[list(TARGETS)].to_numpy(dtype=float)
+        return {f"{target}_rmse": float(np.sqrt(np.mean(errors[:, i] ** 2)))
+                for i, target in enumerate(TARGETS)}
+
+    def save(self, filepath: str):
+        """Write the fitted model to an .npz file"""
+        self._check_fitted()
+        np.savez(filepath, weights=self.weights, intercept=self.intercept,
+                 alpha=self.alpha, features=np.array(FEATURES), targets=np.array(TARGETS))
+        logger.info(f"Recommender saved to {filepath}")
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SpeedSlopeRecommender':
+        """Read a model written by save"""
+        with np.load(filepath) as data:
+            if tuple(data['features'].tolist()) != FEATURES:
+                raise ValueError(f"Model in {filepath} was trained on different features")
+            model = cls(alpha=float(data['alpha']))
+            model._set_parameters(data['weights'], data['intercept'])
+        return model
@@ -0,0 +1,181 @@
+# src/analysis/replay.py
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from ..models.workout_session import WorkoutPoint, POINT_FIELDS
+from ..models.serialization import is_streaming_header, iter_session_points, session_from_dict
+from ..utils.logging_utils import log_event
+from .data_processor import DataProcessor
+from .threshold_calculator import ThresholdCalculator
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[WorkoutPoint], None]
+
+_INTEGER_FIELDS = ('heart_rate', 'cadence', 'segment')
+
+
+def _csv_points(filename: str, chunk_size: int) -> Iterator[WorkoutPoint]:
+    """Points from a CSV written by export_csv / export_to_csv, read in chunks"""
+    for chunk in pd.read_csv(filename, chunksize=chunk_size):
+        columns = {}
+        for name in POINT_FIELDS:
+            if name not in chunk:
+                continue
+            values = chunk[name].astype(object).where(chunk[name].notna(), None).tolist()
+            if name in _INTEGER_FIELDS:
+                values = [None if v is None else int(v) for v in values]
+            columns[name] = values
+        names = list(columns)
+        for row in zip(*columns.values()):
+            yield WorkoutPoint(**dict(zip(names, row)))
+
+
+def _json_points(filename: str) -> Iterator[WorkoutPoint]:
+    """Points from a streaming session file, or from to_json output"""
+    with open(filename, 'r') as f:
+        streaming = is_streaming_header(f.readline())
+        f.seek(0)
+        if streaming:
+            _, points = iter_session_points(f)
+            yield from points
+        else:
+            yield from session_from_dict(json.load(f)).data_points
+
+
+def load_recording(filename: str, chunk_size: int = 10000) -> Iterator[WorkoutPoint]:
+    """
+    Lazily read the data points of a recorded session.
+    Args:
+        filename: .csv from WorkoutSession.export_csv or DataProcessor.export_to_csv,
+                  or .json from WorkoutSession.save_json / to_json
+        chunk_size: Rows per CSV read
+    Returns: Iterator of WorkoutPoints in file order
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return _csv_points(filename, chunk_size)
+    if extension == '.json':
+        return _json_points(filename)
+    raise ValueError(f"Unsupported recording format: {extension}")
+
+
+@dataclass
+class ReplayStats:
+    """Outcome of one replay run"""
+    samples: int = 0
+    recorded_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    sink_seconds: float = 0.0
+    max_lag: float = 0.0  # worst delay behind the scheduled time, in seconds
+    stopped: bool = False
+
+    @property
+    def throughput(self) -> float:
+        """Samples processed per wall-clock second"""
+        return self.samples / self.wall_seconds if self.wall_seconds > 0 else math.inf
+
+    @property
+    def speedup(self) -> float:
+        """Recorded time covered per wall-clock second"""
+        return self.recorded_seconds / self.wall_seconds if self.wall_seconds > 0 else math.inf
+
+
+class SessionReplayer:
+    """
+    Feeds a recorded session through the live processing path.
+    Samples are delivered to every registered sink in order, either at the
+    original pace, at `speed` times real time, or as fast as possible
+    (speed=None). Time spent in sinks and lag behind schedule are measured,
+    which makes this usable for end-to-end profiling and for finding the
+    maximum sustainable throughput of the pipeline.
+    """
+    def __init__(self, points: Iterable[WorkoutPoint], speed: Optional[float] = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive, or None for as fast as possible")
+        self.points = points
+        self.speed = speed
+        self.clock = clock
+        self.sleep = sleep
+        self.sinks: List[Sink] = []
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def from_file(cls, filename: str, speed: Optional[float] = 1.0, **kwargs) -> 'SessionReplayer':
+        return cls(load_recording(filename), speed=speed, **kwargs)
+
+    def add_sink(self, sink: Sink) -> 'SessionReplayer':
+        self.sinks.append(sink)
+        return self
+
+    def stop(self):
+        """Ask a running replay to finish after the current sample"""
+        self._stop_event.set()
+
+    def run(self, max_samples: Optional[int] = None) -> ReplayStats:
+        """
+        Replay the recording.
+        Args:
+            max_samples: Stop after this many samples
+        Returns: Timing statistics for the run
+        """
+        stats = ReplayStats()
+        self._stop_event.clear()
+        first_timestamp = None
+        last_timestamp = None
+        start = self.clock()
+
+        for point in self.points:
+            if self._stop_event.is_set() or (max_samples is not None and stats.samples >= max_samples):
+                stats.stopped = True
+                break
+            if first_timestamp is None:
+                first_timestamp = point.timestamp
+
+            if self.speed is not None:
+                due = start + (point.timestamp - first_timestamp) / self.speed
+                delay = due - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+                elif -delay > stats.max_lag:
+                    stats.max_lag = -delay
+
+            sink_start = self.clock()
+            for sink in self.sinks:
+                sink(point)
+            stats.sink_seconds += self.clock() - sink_start
+
+            stats.samples += 1
+            last_timestamp = point.timestamp
+
+        stats.wall_seconds = self.clock() - start
+        if first_timestamp is not None:
+            stats.recorded_seconds = last_timestamp - first_timestamp
+        log_event(logger, logging.INFO, "replay_finished", samples=stats.samples,
+                  wall_s=round(stats.wall_seconds, 3), max_lag_s=round(stats.max_lag, 3))
+        return stats
+
+
+def processor_sink(processor: DataProcessor) -> Sink:
+    """Sink that records samples in a DataProcessor"""
+    def sink(point: WorkoutPoint):
+        processor.add_workout_point(point.timestamp, point.heart_rate, point.speed,
+                                    point.slope, point.segment)
+    return sink
+
+
+def threshold_sink(calculator: ThresholdCalculator) -> Sink:
+    """Sink that feeds heart rate samples to a ThresholdCalculator"""
+    def sink(point: WorkoutPoint):
+        calculator.add_data_point(point.heart_rate, point.timestamp)
+    return sink
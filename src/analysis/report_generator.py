@@ -0,0 +1,201 @@
+# src/analysis/report_generator.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import AppSettings, Settings
+from ..models.serialization import points_from_columns, session_header
+from ..models.workout_session import WorkoutSession, points_to_columns
+from ..utils.logging_utils import worker_logging
+from .data_processor import DataProcessor
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+CHART_FILES = ('heart_rate.png', 'speed_slope.png', 'zones.png')
+
+
+def session_content_hash(session: WorkoutSession) -> str:
+    """Hash of everything a report is rendered from"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps(session_header(session), sort_keys=True, default=str).encode())
+    columns = points_to_columns(session.data_points)
+    for name in ('timestamp', 'heart_rate', 'speed', 'slope'):
+        digest.update(np.asarray(columns[name], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """Convert NumPy scalars in summaries to plain Python numbers"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def render_report(header: Dict, columns: Dict[str, List], output_dir: str,
+                  content_hash: str) -> Dict[str, str]:
+    """
+    Render charts and summary of one session into output_dir.
+    Runs in a worker process: it only takes plain data and uses the Agg
+    backend through Figure objects, so no GUI or pyplot state is touched.
+    Files are written to a temporary directory that is renamed into place,
+    so a half-written report is never visible in the cache. A session that
+    cannot be summarized raises instead of caching an empty report.
+    Returns: Mapping of artifact name to file path
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    tmp_dir = f"{output_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    df = pd.DataFrame({name: columns[name] for name in ('timestamp', 'heart_rate', 'speed', 'slope')})
+    processor = DataProcessor()
+    processor.workout_data = points_from_columns(columns)
+    summary = processor.get_workout_summary(df)
+    if not summary and not df.empty:
+        shutil.rmtree(tmp_dir)
+        raise RuntimeError(f"Could not summarize session {header.get('id')}")
+    summary['session'] = header
+    with open(os.path.join(tmp_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2, default=_json_default)
+
+    minutes = (df['timestamp'] - df['timestamp'].min()) / 60 if not df.empty else df['timestamp']
+
+    def save(figure: Figure, filename: str):
+        FigureCanvasAgg(figure)
+        figure.tight_layout()
+        figure.savefig(os.path.join(tmp_dir, filename), dpi=100)
+
+    figure = Figure(figsize=(8, 4))
+    plot = figure.add_subplot(111)
+    plot.plot(minutes, df['heart_rate'], 'r-')
+    plot.set_title('Heart Rate')
+    plot.set_xlabel('Time (min)')
+    plot.set_ylabel('Heart Rate (BPM)')
+    plot.grid(True)
+    save(figure, 'heart_rate.png')
+
+    figure = Figure(figsize=(8, 4))
+    plot = figure.add_subplot(111)
+    plot.plot(minutes, df['speed'], 'b-', label='Speed (km/h)')
+    plot.plot(minutes, df['slope'], 'g-', label='Slope (%)')
+    plot.set_title('Speed and Slope')
+    plot.set_xlabel('Time (min)')
+    plot.legend()
+    plot.grid(True)
+    save(figure, 'speed_slope.png')
+
+    zones = summary.get('time_in_zones', {})
+    figure = Figure(figsize=(6, 4))
+    plot = figure.add_subplot(111)
+    plot.bar(list(zones), list(zones.values()), color='tab:orange')
+    plot.set_title('Time in Zones')
+    plot.set_ylabel('% of samples')
+    save(figure, 'zones.png')
+
+    artifacts = {'summary': 'summary.json'}
+    artifacts.update({os.path.splitext(name)[0]: name for name in CHART_FILES})
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+        json.dump({'content_hash': content_hash, 'artifacts': artifacts}, f, indent=2)
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(tmp_dir)  # another worker finished the same report first
+    else:
+        os.replace(tmp_dir, output_dir)
+    logger.info(f"Rendered report {os.path.basename(output_dir)}")
+    return {name: os.path.join(output_dir, filename) for name, filename in artifacts.items()}
+
+
+class ReportGenerator:
+    """
+    Renders post-workout reports in background processes and caches them.
+    Reports are stored under a directory keyed by session id and a hash of
+    the session content, so an unchanged session maps to an existing report
+    that is returned at once, while an edited session gets a fresh one.
+    Concurrent requests for the same report share one render. Futures
+    complete on an executor thread; UI code should hand results back to its
+    own thread (e.g. with tkinter's after()). Log records from the workers
+    are forwarded to the logging pipeline of this process.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: int = 2,
+                 executor: Optional[Executor] = None, settings: Optional[AppSettings] = None):
+        self.cache_dir = cache_dir or Settings.value(settings, 'REPORTS_DIR')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._owns_executor = executor is None
+        if executor is None:
+            initializer, initargs = worker_logging()
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                                           initargs=initargs)
+        self._executor = executor
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def report_dir(self, session: WorkoutSession, content_hash: Optional[str] = None) -> str:
+        content_hash = content_hash or session_content_hash(session)
+        return os.path.join(self.cache_dir, f"session_{session.id}_{content_hash[:16]}")
+
+    def get_cached(self, session: WorkoutSession) -> Optional[Dict[str, str]]:
+        """Artifacts of an already rendered report, or None"""
+        return self._read_manifest(self.report_dir(session))
+
+    @staticmethod
+    def _read_manifest(output_dir: str) -> Optional[Dict[str, str]]:
+        path = os.path.join(output_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        return {name: os.path.join(output_dir, filename)
+                for name, filename in manifest['artifacts'].items()}
+
+    def request(self, session: WorkoutSession,
+                callback: Optional[Callable[[Dict[str, str]], None]] = None) -> Future:
+        """
+        Get a session's report, rendering it in the background if needed.
+        Args:
+            session: Finished workout session
+            callback: Called with the artifact paths once available
+        Returns: Future resolving to a mapping of artifact name to path;
+                 already completed when the report is cached
+        """
+        content_hash = session_content_hash(session)
+        output_dir = self.report_dir(session, content_hash)
+
+        with self._lock:
+            cached = self._read_manifest(output_dir)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+            elif output_dir in self._pending:
+                future = self._pending[output_dir]
+            else:
+                future = self._executor.submit(
+                    render_report, session_header(session),
+                    points_to_columns(session.data_points), output_dir, content_hash
+                )
+                self._pending[output_dir] = future
+                future.add_done_callback(lambda done: self._finished(output_dir, done))
+                logger.info(f"Rendering report for session {session.id}")
+
+        if callback is not None:
+            future.add_done_callback(lambda done: done.exception() is None and callback(done.result()))
+        return future
+
+    def _finished(self, output_dir: str, future: Future):
+        with self._lock:
+            self._pending.pop(output_dir, None)
+        if future.exception() is not None:
+            logger.error(f"Report rendering failed for {output_dir}: {future.exception()}")
+
+    def shutdown(self, wait: bool = True):
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
@@ -0,0 +1,165 @@
+# src/analysis/threshold_cache.py
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import AppSettings, Settings
+from ..models.workout_session import WorkoutSession
+from ..utils.logging_utils import log_event
+from .threshold_calculator import ThresholdCalculator
+
+logger = logging.getLogger(__name__)
+
+
+def data_fingerprint(timestamps, heart_rates) -> str:
+    """Stable hash of a ramp test's inputs"""
+    digest = hashlib.sha1()
+    digest.update(np.asarray(timestamps, dtype=np.float64).tobytes())
+    digest.update(np.asarray(heart_rates, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class ThresholdCache:
+    """
+    Per-user cache of HRDP fits, persisted as one JSON file per user.
+    Each entry records the fit, a description of its inputs and a
+    fingerprint of the data, keyed by session id. A session is only refit
+    when its fingerprint changes, and the threshold trend of a user is read
+    straight from the cached entries.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, min_points: Optional[int] = None,
+                 settings: Optional[AppSettings] = None):
+        self.cache_dir = cache_dir or Settings.value(settings, 'THRESHOLD_CACHE_DIR')
+        self.min_points = min_points or Settings.value(settings, 'MIN_DATA_POINTS_FOR_THRESHOLD')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._entries: Dict[int, Dict[str, Dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def apply_settings(self, settings: AppSettings, changed: Optional[List[str]] = None):
+        """Pick up MIN_DATA_POINTS_FOR_THRESHOLD; suitable as a SettingsManager subscriber"""
+        self.min_points = settings.min_data_points_for_threshold
+
+    def _path(self, user_id: int) -> str:
+        return os.path.join(self.cache_dir, f"user_{user_id}_thresholds.json")
+
+    def _user_entries(self, user_id: int) -> Dict[str, Dict]:
+        if user_id not in self._entries:
+            path = self._path(user_id)
+            entries = {}
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r') as f:
+                        entries = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.warning(f"Discarding unreadable threshold cache {path}: {e}")
+            self._entries[user_id] = entries
+        return self._entries[user_id]
+
+    def _save(self, user_id: int):
+        path = self._path(user_id)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries[user_id], f, indent=2)
+        os.replace(tmp_path, path)
+
+    def get(self, user_id: int, session_id: int) -> Optional[Dict]:
+        """Cached entry for a session, without computing anything"""
+        return self._user_entries(user_id).get(str(session_id))
+
+    def get_threshold(self, user_id: int, session: WorkoutSession,
+                      save: bool = True) -> Optional[Dict]:
+        """
+        Return the HRDP fit for a session, fitting only if its data changed.
+        Also fills in session.anaerobic_threshold.
+        Args:
+            user_id: Owner of the session
+            session: Session with heart rate samples from a ramp test
+            save: Write the user's cache file after a refit
+        Returns: Cache entry, or None if the session has too little data
+        """
+        points = [p for p in session.data_points if p.heart_rate is not None]
+        if len(points) < self.min_points:
+            return None
+        timestamps = [p.timestamp for p in points]
+        heart_rates = [p.heart_rate for p in points]
+        fingerprint = data_fingerprint(timestamps, heart_rates)
+
+        entries = self._user_entries(user_id)
+        entry = entries.get(str(session.id))
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = self._fit(session, timestamps, heart_rates, fingerprint)
+            if entry is None:
+                return None
+            entries[str(session.id)] = entry
+            if save:
+                self._save(user_id)
+
+        session.anaerobic_threshold = entry['anaerobic_threshold']
+        return entry
+
+    def _fit(self, session: WorkoutSession, timestamps: List[float],
+             heart_rates: List[int], fingerprint: str) -> Optional[Dict]:
+        calculator = ThresholdCalculator()
+        calculator.set_data(heart_rates, timestamps)
+        try:
+            hrdp_time, hrdp_hr = calculator.calculate_hrdp()
+        except (ValueError, np.linalg.LinAlgError) as e:
+            logger.warning(f"HRDP fit failed for session {session.id}: {e}")
+            return None
+        at_hr = calculator.estimate_anaerobic_threshold()
+
+        log_event(logger, logging.INFO, "threshold_refit", session_id=session.id,
+                  hrdp_hr=hrdp_hr, points=len(heart_rates))
+        return {
+            'session_id': session.id,
+            'start_time': session.start_time.isoformat(),
+            'fingerprint': fingerprint,
+            'inputs': {
+                'n_points': len(heart_rates),
+                'time_range': [float(min(timestamps)), float(max(timestamps))],
+                'hr_range': [int(min(heart_rates)), int(max(heart_rates))]
+            },
+            'fit_coefficients': calculator.fit_coefficients,
+            'hrdp_time': float(hrdp_time),
+            'hrdp_hr': int(hrdp_hr),
+            'anaerobic_threshold': int(at_hr),
+            'computed_at': datetime.now().isoformat()
+        }
+
+    def update_sessions(self, user_id: int, sessions: Iterable[WorkoutSession]) -> List[Dict]:
+        """Bring a user's cache up to date, refitting only changed sessions"""
+        entries = []
+        misses_before = self.misses
+        for session in sessions:
+            entry = self.get_threshold(user_id, session, save=False)
+            if entry is not None:
+                entries.append(entry)
+        if self.misses != misses_before:
+            self._save(user_id)
+        return entries
+
+    def trend(self, user_id: int) -> List[Tuple[datetime, int]]:
+        """Anaerobic threshold over time from cached fits, oldest first"""
+        entries = self._user_entries(user_id).values()
+        return sorted(
+            (datetime.fromisoformat(entry['start_time']), entry['anaerobic_threshold'])
+            for entry in entries
+        )
+
+    def invalidate(self, user_id: int, session_id: Optional[int] = None):
+        """Drop one session's entry, or the whole user cache"""
+        entries = self._user_entries(user_id)
+        if session_id is None:
+            entries.clear()
+        else:
+            entries.pop(str(session_id), None)
+        self._save(user_id)
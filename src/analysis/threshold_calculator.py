@@ -4,6 +4,7 @@ from scipy.interpolate import interp1d
 from scipy.signal import savgol_filter
 from typing import Tuple, List, Optional
 import logging
+from ..utils.logging_utils import log_event
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +18,24 @@ class ThresholdCalculator:
         self.timestamps: List[float] = []
         self.hrdp_time: Optional[float] = None
         self.hrdp_hr: Optional[int] = None
+        self.fit_coefficients: Optional[List[float]] = None
 
     def add_data_point(self, heart_rate: int, timestamp: float):
         """Add a new heart rate data point with its timestamp"""
         self.heart_rates.append(heart_rate)
         self.timestamps.append(timestamp)
+        # New data invalidates the previous fit; it is redone on next use
+        self.hrdp_time = None
+        self.hrdp_hr = None
+        self.fit_coefficients = None
+
+    def set_data(self, heart_rates: List[int], timestamps: List[float]):
+        """Replace all data points at once, e.g. from a recorded session"""
+        if len(heart_rates) != len(timestamps):
+            raise ValueError("Heart rates and timestamps must have the same length")
+        self.clear_data()
+        self.heart_rates = list(heart_rates)
+        self.timestamps = list(timestamps)
 
     def clear_data(self):
         """Clear all stored data points"""
@@ -29,6 +43,7 @@ class ThresholdCalculator:
         self.timestamps = []
         self.hrdp_time = None
         self.hrdp_hr = None
+        self.fit_coefficients = None
 
     def calculate_hrdp(self) -> Tuple[float, int]:
         """
@@ -51,6 +66,7 @@ class ThresholdCalculator:
             # Create third-order polynomial fit
             coeffs = np.polyfit(time_array, hr_smooth, 3)
             poly_fit = np.poly1d(coeffs)
+            self.fit_coefficients = coeffs.tolist()
 
             # Generate points along the curve
             x_new = np.linspace(time_array[0], time_array[-1], 1000)
@@ -68,7 +84,8 @@ class ThresholdCalculator:
             self.hrdp_time = x_new[deflection_idx]
             self.hrdp_hr = int(y_new[deflection_idx])
 
-            logger.info(f"HRDP calculated: Time={self.hrdp_time:.2f}s, HR={self.hrdp_hr}bpm")
+            log_event(logger, logging.INFO, "hrdp_calculated",
+                      time_s=round(float(self.hrdp_time), 2), hr_bpm=self.hrdp_hr)
             return self.hrdp_time, self.hrdp_hr
 
         except Exception as e:
@@ -87,7 +104,7 @@ class ThresholdCalculator:
         # Based on research showing AT is typically slightly above HRDP
         at_hr = int(self.hrdp_hr * 1.02)  # 2% adjustment
         
-        logger.info(f"Anaerobic threshold estimated at {at_hr}bpm")
+        log_event(logger, logging.INFO, "anaerobic_threshold_estimated", hr_bpm=at_hr)
         return at_hr
 
     def get_training_zones(self, max_hr: int) -> dict:
@@ -0,0 +1,7 @@
+# src/control/__init__.py
+from .hr_controller import (HeartRateSmoother, HeartRateZoneController, zone_bounds,
+                            connect_control_panel)
+from .limits import ACTUATOR_LIMITS, SPEED_LIMITS, SLOPE_LIMITS
+from .simulation import SimulatedHeartRateResponse
+from .workout_program import (WorkoutProgram, ProgramSegment, CompiledProgram, ProgramRunner,
+                              warm_up, steady, ramp, intervals, cool_down, summarize_segments)
@@ -0,0 +1,249 @@
+# src/control/hr_controller.py
+import logging
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import AppSettings, Settings, SettingsManager
+from ..utils.logging_utils import log_event
+from .limits import ACTUATOR_LIMITS
+
+logger = logging.getLogger(__name__)
+
+
+def zone_bounds(zone: str, max_hr: int,
+                zones: Optional[Dict[str, Tuple[float, float]]] = None) -> Tuple[float, float]:
+    """
+    Convert a TRAINING_ZONES entry into a heart rate band.
+    Args:
+        zone: Zone name, e.g. 'AEROBIC'
+        max_hr: User's maximum heart rate
+        zones: Zone fractions, defaults to the TRAINING_ZONES setting
+    Returns: (lower bpm, upper bpm)
+    """
+    zones = zones or Settings.get_default('TRAINING_ZONES')
+    lower, upper = zones[zone]
+    return lower * max_hr, upper * max_hr
+
+
+class HeartRateSmoother:
+    """Exponential moving average of heart rate with a time constant in seconds"""
+    def __init__(self, time_constant: float = 10.0):
+        self.time_constant = time_constant
+        self.value: Optional[float] = None
+        self.last_time: Optional[float] = None
+
+    def update(self, heart_rate: float, timestamp: float) -> float:
+        """Add a sample and return the smoothed heart rate"""
+        if self.value is None or self.last_time is None:
+            self.value = float(heart_rate)
+        else:
+            dt = max(timestamp - self.last_time, 0.0)
+            alpha = 1.0 - math.exp(-dt / self.time_constant) if self.time_constant > 0 else 1.0
+            self.value += alpha * (heart_rate - self.value)
+        self.last_time = timestamp
+        return self.value
+
+    def reset(self):
+        self.value = None
+        self.last_time = None
+
+
+class HeartRateZoneController:
+    """
+    PID controller that holds heart rate inside a target band by adjusting
+    treadmill speed (or slope).
+    HR samples can arrive at any rate; the PID update runs at most once per
+    control_interval. Each tick is a fixed handful of arithmetic operations,
+    so the compute cost per tick is constant. The integrator stops
+    accumulating while the output is saturated (conditional integration),
+    which prevents windup at the speed limits. Engaging the controller
+    starts from the current treadmill setting, so there is no step on
+    hand-over.
+    """
+    def __init__(self,
+                 target_zone: Tuple[float, float],
+                 command_callback: Callable[[float], None],
+                 actuator: str = 'speed',
+                 kp: float = 0.05,
+                 ki: float = 0.001,
+                 kd: float = 0.0,
+                 control_interval: Optional[float] = None,
+                 max_step: float = 0.5,
+                 smoothing: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 settings: Optional[AppSettings] = None):
+        """
+        Args:
+            target_zone: (lower bpm, upper bpm); the setpoint is its midpoint
+            command_callback: Called with each new speed or slope command
+            actuator: 'speed' or 'slope'
+            kp, ki, kd: Gains in actuator units per bpm (per bpm*s for ki)
+            control_interval: Seconds between updates, defaults to HR_CONTROL_INTERVAL
+            max_step: Largest change of the command per update
+            smoothing: HR smoothing time constant, defaults to HR_SMOOTHING_TIME_CONSTANT
+            clock: Time source used when tick() is called without a timestamp
+            settings: Loaded settings supplying the defaults above
+        """
+        if actuator not in ACTUATOR_LIMITS:
+            raise ValueError(f"Unknown actuator: {actuator}")
+        if target_zone[0] >= target_zone[1]:
+            raise ValueError("Target zone lower bound must be below its upper bound")
+
+        self.target_zone = target_zone
+        self.command_callback = command_callback
+        self.actuator = actuator
+        self.limits = ACTUATOR_LIMITS[actuator]
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.control_interval = (control_interval if control_interval is not None
+                                 else Settings.value(settings, 'HR_CONTROL_INTERVAL'))
+        self.max_step = max_step
+        self.smoother = HeartRateSmoother(
+            smoothing if smoothing is not None
+            else Settings.value(settings, 'HR_SMOOTHING_TIME_CONSTANT')
+        )
+        self.clock = clock
+
+        self.enabled = False
+        self.output = 0.0
+        self._integral = 0.0
+        self._base = 0.0
+        self._last_update: Optional[float] = None
+        self._last_measurement: Optional[float] = None
+
+    @property
+    def setpoint(self) -> float:
+        return (self.target_zone[0] + self.target_zone[1]) / 2
+
+    def apply_settings(self, settings: AppSettings, changed: Optional[List[str]] = None):
+        """
+        Pick up control settings from an AppSettings instance.
+        Suitable as a SettingsManager subscriber.
+        """
+        self.control_interval = settings.hr_control_interval
+        self.smoother.time_constant = settings.hr_smoothing_time_constant
+
+    def set_target_zone(self, target_zone: Tuple[float, float]):
+        """Change the heart rate band without resetting the controller"""
+        if target_zone[0] >= target_zone[1]:
+            raise ValueError("Target zone lower bound must be below its upper bound")
+        self.target_zone = target_zone
+
+    def engage(self, current_output: float):
+        """Start closed-loop control from the current speed or slope"""
+        self.enabled = True
+        self._base = current_output
+        self.output = current_output
+        self._integral = 0.0
+        self._last_update = None
+        self._last_measurement = None
+        self.smoother.reset()
+        log_event(logger, logging.INFO, "hr_control_engaged", actuator=self.actuator,
+                  zone=self.target_zone, start=current_output)
+
+    def disengage(self):
+        """Stop issuing commands; the treadmill keeps its last setting"""
+        self.enabled = False
+        log_event(logger, logging.INFO, "hr_control_disengaged", actuator=self.actuator)
+
+    def tick(self, heart_rate: float, timestamp: Optional[float] = None) -> Optional[float]:
+        """
+        Feed one heart rate sample.
+        Args:
+            heart_rate: Latest heart rate in bpm
+            timestamp: Sample time in seconds, defaults to the controller clock
+        Returns: The new command if one was issued on this tick, otherwise None
+        """
+        now = self.clock() if timestamp is None else timestamp
+        measurement = self.smoother.update(heart_rate, now)
+        if not self.enabled:
+            return None
+
+        if self._last_update is None:
+            self._last_update = now
+            self._last_measurement = measurement
+            return None
+        dt = now - self._last_update
+        if dt < self.control_interval:
+            return None
+
+        error = self.setpoint - measurement
+        derivative = -(measurement - self._last_measurement) / dt
+
+        # Conditional integration: skip when saturated and the error would push further out
+        candidate = self._integral + self.ki * error * dt
+        unclamped = self._base + self.kp * error + candidate + self.kd * derivative
+        lower, upper = self.limits
+        if (unclamped > upper and error > 0) or (unclamped < lower and error < 0):
+            candidate = self._integral
+        self._integral = candidate
+
+        target = self._base + self.kp * error + self._integral + self.kd * derivative
+        target = min(max(target, self.output - self.max_step), self.output + self.max_step)
+        target = min(max(target, lower), upper)
+
+        self._last_update = now
+        self._last_measurement = measurement
+        if target == self.output:
+            return None
+        self.output = target
+        self.command_callback(target)
+        return target
+
+
+def connect_control_panel(panel, controller: HeartRateZoneController, max_hr: int,
+                          current_output: Callable[[], float],
+                          zones: Optional[Dict[str, Tuple[float, float]]] = None,
+                          settings_manager: Optional[SettingsManager] = None
+                          ) -> Callable[[bool, str], None]:
+    """
+    Let a ControlPanel's "Hold zone" controls drive a HeartRateZoneController.
+    Toggling the checkbox engages the controller from the current treadmill
+    setting or disengages it; picking a zone changes the target band. Speed
+    commands still go to the controller's original command callback and are
+    also shown on the panel. Tick the controller on the UI thread, since the
+    panel is updated from the command callback.
+    With a settings manager, zones are read from the live settings and a
+    reload updates the controller's interval, smoothing and target band.
+    Args:
+        panel: ControlPanel (anything with auto_callback and show_commanded_speed)
+        controller: Controller whose command_callback sends commands to the treadmill
+        max_hr: User's maximum heart rate, for zone bounds
+        current_output: Returns the current speed or slope, used on engage
+        zones: Zone fractions, defaults to the TRAINING_ZONES setting
+        settings_manager: Source of live settings, subscribed for reloads
+    Returns: The handler installed as panel.auto_callback
+    """
+    send_command = controller.command_callback
+    selected = {'zone': None}
+
+    def current_zones() -> Optional[Dict[str, Tuple[float, float]]]:
+        if zones is None and settings_manager is not None:
+            return settings_manager.current.training_zones
+        return zones
+
+    def command(value: float):
+        send_command(value)
+        if controller.actuator == 'speed':
+            panel.show_commanded_speed(value)
+
+    def on_auto_change(enabled: bool, zone: str):
+        if zone:
+            selected['zone'] = zone
+            controller.set_target_zone(zone_bounds(zone, max_hr, current_zones()))
+        if enabled and not controller.enabled:
+            controller.engage(current_output())
+        elif not enabled and controller.enabled:
+            controller.disengage()
+
+    def on_settings_change(settings: AppSettings, changed: List[str]):
+        controller.apply_settings(settings, changed)
+        zone = selected['zone']
+        if 'training_zones' in changed and zone in current_zones():
+            controller.set_target_zone(zone_bounds(zone, max_hr, current_zones()))
+
+    controller.command_callback = command
+    panel.auto_callback = on_auto_change
+    if settings_manager is not None:
+        settings_manager.subscribe(on_settings_change)
+    return on_auto_change
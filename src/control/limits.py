@@ -0,0 +1,10 @@
+# src/control/limits.py
+"""Treadmill actuator ranges, shared by the controls, controller and recommender"""
+
+SPEED_LIMITS = (0.0, 20.0)  # km/h
+SLOPE_LIMITS = (0.0, 15.0)  # %
+
+ACTUATOR_LIMITS = {
+    'speed': SPEED_LIMITS,
+    'slope': SLOPE_LIMITS
+}
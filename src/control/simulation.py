@@ -0,0 +1,61 @@
+# src/control/simulation.py
+import random
+from typing import Optional
+
+
+class SimulatedHeartRateResponse:
+    """
+    First-order model of heart rate responding to treadmill load.
+    Steady-state HR rises linearly with speed and with the vertical
+    component of work (speed x slope); the body approaches it with a time
+    constant, after a fixed response delay. Used for simulation mode and
+    for testing closed-loop control.
+    """
+    def __init__(self,
+                 resting_hr: float = 60.0,
+                 max_hr: float = 190.0,
+                 bpm_per_kmh: float = 8.0,
+                 bpm_per_slope_kmh: float = 0.6,
+                 time_constant: float = 30.0,
+                 delay: float = 5.0,
+                 noise: float = 0.0,
+                 seed: Optional[int] = None):
+        self.resting_hr = resting_hr
+        self.max_hr = max_hr
+        self.bpm_per_kmh = bpm_per_kmh
+        self.bpm_per_slope_kmh = bpm_per_slope_kmh
+        self.time_constant = time_constant
+        self.delay = delay
+        self.noise = noise
+        self._random = random.Random(seed)
+
+        self.heart_rate = resting_hr
+        self.time = 0.0
+        self.speed = 0.0
+        self.slope = 0.0
+        self._pending = []  # (apply_at, speed, slope)
+
+    def set_speed(self, speed: float):
+        self._pending.append((self.time + self.delay, speed, self.slope if not self._pending
+                              else self._pending[-1][2]))
+
+    def set_slope(self, slope: float):
+        self._pending.append((self.time + self.delay, self.speed if not self._pending
+                              else self._pending[-1][1], slope))
+
+    def steady_state(self, speed: float, slope: float) -> float:
+        hr = (self.resting_hr + self.bpm_per_kmh * speed
+              + self.bpm_per_slope_kmh * slope * speed)
+        return min(hr, self.max_hr)
+
+    def step(self, dt: float) -> float:
+        """Advance the model by dt seconds and return the measured heart rate"""
+        self.time += dt
+        while self._pending and self._pending[0][0] <= self.time:
+            _, self.speed, self.slope = self._pending.pop(0)
+
+        target = self.steady_state(self.speed, self.slope)
+        self.heart_rate += (target - self.heart_rate) * min(dt / self.time_constant, 1.0)
+        if self.noise:
+            return self.heart_rate + self._random.gauss(0.0, self.noise)
+        return self.heart_rate
@@ -0,0 +1,254 @@
+# src/control/workout_program.py
+import bisect
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..models.workout_session import WorkoutSession, points_to_columns
+from ..utils.logging_utils import log_event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProgramSegment:
+    """One block of a workout program; a ramp when end values differ from start"""
+    name: str
+    duration: float  # seconds
+    speed: float  # km/h at segment start
+    slope: float = 0.0  # % at segment start
+    end_speed: Optional[float] = None
+    end_slope: Optional[float] = None
+    kind: str = 'steady'
+
+    def __post_init__(self):
+        if self.duration <= 0:
+            raise ValueError(f"Segment '{self.name}' must have a positive duration")
+        if self.end_speed is None:
+            self.end_speed = self.speed
+        if self.end_slope is None:
+            self.end_slope = self.slope
+
+
+def warm_up(duration: float, start_speed: float, end_speed: float,
+            slope: float = 0.0) -> ProgramSegment:
+    """Linear speed ramp at the start of a workout"""
+    return ProgramSegment("Warm-up", duration, start_speed, slope, end_speed, slope, kind='warmup')
+
+
+def steady(name: str, duration: float, speed: float, slope: float = 0.0) -> ProgramSegment:
+    """Constant speed and slope"""
+    return ProgramSegment(name, duration, speed, slope, kind='steady')
+
+
+def ramp(name: str, duration: float, start_speed: float, end_speed: float,
+         start_slope: float = 0.0, end_slope: Optional[float] = None) -> ProgramSegment:
+    """Linear change of speed and/or slope"""
+    return ProgramSegment(name, duration, start_speed, start_slope, end_speed,
+                          start_slope if end_slope is None else end_slope, kind='ramp')
+
+
+def intervals(repeats: int, work_duration: float, work_speed: float,
+              rest_duration: float, rest_speed: float,
+              work_slope: float = 0.0, rest_slope: float = 0.0) -> List[ProgramSegment]:
+    """Alternating work and recovery blocks"""
+    segments = []
+    for i in range(1, repeats + 1):
+        segments.append(ProgramSegment(f"Interval {i}", work_duration, work_speed, work_slope,
+                                       kind='interval'))
+        segments.append(ProgramSegment(f"Recovery {i}", rest_duration, rest_speed, rest_slope,
+                                       kind='recovery'))
+    return segments
+
+
+def cool_down(duration: float, start_speed: float, end_speed: float,
+              slope: float = 0.0) -> ProgramSegment:
+    """Linear speed ramp at the end of a workout"""
+    return ProgramSegment("Cool-down", duration, start_speed, slope, end_speed, slope,
+                          kind='cooldown')
+
+
+@dataclass
+class WorkoutProgram:
+    """Ordered list of segments making up a structured workout"""
+    name: str
+    segments: List[ProgramSegment] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return sum(segment.duration for segment in self.segments)
+
+    def compile(self, resolution: float = 1.0) -> 'CompiledProgram':
+        """Precompute the setpoint timeline at `resolution` seconds per step"""
+        return CompiledProgram(self, resolution)
+
+
+class CompiledProgram:
+    """
+    Setpoint timeline of a WorkoutProgram, computed once up front.
+    speed, slope and segment hold one entry per resolution step, so the
+    setpoint for any elapsed time is a single index computation.
+    """
+    def __init__(self, program: WorkoutProgram, resolution: float = 1.0):
+        if not program.segments:
+            raise ValueError("Cannot compile a program without segments")
+        if resolution <= 0:
+            raise ValueError("Resolution must be positive")
+
+        self.name = program.name
+        self.resolution = resolution
+        self.segments = list(program.segments)
+        self.duration = program.duration
+
+        durations = np.array([s.duration for s in self.segments], dtype=float)
+        ends = np.cumsum(durations)
+        self.segment_starts: List[float] = (ends - durations).tolist()
+
+        steps = max(int(math.ceil(self.duration / resolution)), 1)
+        times = np.arange(steps) * resolution
+        index = np.minimum(np.searchsorted(ends, times, side='right'), len(self.segments) - 1)
+        fraction = (times - (ends - durations)[index]) / durations[index]
+
+        def interpolate(start_attr: str, end_attr: str) -> np.ndarray:
+            start = np.array([getattr(s, start_attr) for s in self.segments], dtype=float)
+            end = np.array([getattr(s, end_attr) for s in self.segments], dtype=float)
+            return start[index] + (end[index] - start[index]) * fraction
+
+        self.times = times
+        self.speed = interpolate('speed', 'end_speed')
+        self.slope = interpolate('slope', 'end_slope')
+        self.segment = index.astype(np.int32)
+
+        # Plain lists make the per-tick lookup cheaper than NumPy scalar indexing
+        self._speed = self.speed.tolist()
+        self._slope = self.slope.tolist()
+        self._segment = self.segment.tolist()
+
+    def __len__(self) -> int:
+        return len(self._speed)
+
+    def setpoint(self, elapsed: float) -> Tuple[float, float, int]:
+        """
+        O(1) lookup of the setpoint at `elapsed` seconds into the program.
+        Times past the end hold the final step.
+        Returns: (speed, slope, segment index)
+        """
+        i = int(elapsed / self.resolution)
+        if i < 0:
+            i = 0
+        elif i >= len(self._speed):
+            i = len(self._speed) - 1
+        return self._speed[i], self._slope[i], self._segment[i]
+
+    def segment_at(self, elapsed: float) -> int:
+        """Exact segment index at `elapsed` seconds, independent of resolution (O(log n))"""
+        return max(bisect.bisect_right(self.segment_starts, elapsed) - 1, 0)
+
+
+class ProgramRunner:
+    """
+    Drives the treadmill command path from a compiled program.
+    Call tick() on every control tick; speed and slope callbacks only fire
+    when the setpoint changes. The current segment index is exposed for
+    tagging WorkoutPoints.
+    """
+    def __init__(self, program: CompiledProgram,
+                 speed_callback: Callable[[float], None],
+                 slope_callback: Callable[[float], None]):
+        self.program = program
+        self.speed_callback = speed_callback
+        self.slope_callback = slope_callback
+        self.start_time: Optional[float] = None
+        self.current_segment: Optional[int] = None
+        self.finished = False
+        self._last_speed: Optional[float] = None
+        self._last_slope: Optional[float] = None
+
+    def start(self, now: float):
+        self.start_time = now
+        self.finished = False
+        self._last_speed = self._last_slope = None
+        log_event(logger, logging.INFO, "program_started", program=self.program.name,
+                  duration_s=self.program.duration)
+        self.tick(now)
+
+    def tick(self, now: float) -> Optional[int]:
+        """
+        Apply the setpoint for time `now`.
+        Returns: Current segment index, or None once the program has finished
+        """
+        if self.start_time is None or self.finished:
+            return None
+        elapsed = now - self.start_time
+        if elapsed >= self.program.duration:
+            self.finished = True
+            self.current_segment = None
+            log_event(logger, logging.INFO, "program_finished", program=self.program.name)
+            return None
+
+        speed, slope, segment = self.program.setpoint(elapsed)
+        if speed != self._last_speed:
+            self._last_speed = speed
+            self.speed_callback(speed)
+        if slope != self._last_slope:
+            self._last_slope = slope
+            self.slope_callback(slope)
+        if segment != self.current_segment:
+            self.current_segment = segment
+            log_event(logger, logging.INFO, "program_segment",
+                      segment=self.program.segments[segment].name)
+        return segment
+
+
+def summarize_segments(session: WorkoutSession,
+                       program: Optional[CompiledProgram] = None) -> List[Dict]:
+    """
+    Per-segment statistics of a session whose points carry segment tags.
+    Args:
+        session: Session recorded while a program was running
+        program: Compiled program, used for segment names and kinds
+    Returns: One summary dict per segment present in the session, in order
+    """
+    columns = points_to_columns(session.data_points)
+    df = pd.DataFrame(columns).dropna(subset=['segment'])
+    if df.empty:
+        return []
+
+    df = df.sort_values('timestamp')
+    # Each sample covers the time until the next one
+    df['dt'] = df['timestamp'].diff().shift(-1).fillna(0.0)
+    df['distance'] = df['speed'] * df['dt'] / 3600
+
+    # Duration and distance both come from the per-sample dwell
+    grouped = df.groupby('segment', sort=True)
+    stats = grouped.agg(
+        duration=('dt', 'sum'),
+        samples=('timestamp', 'count'),
+        average_hr=('heart_rate', 'mean'),
+        max_hr=('heart_rate', 'max'),
+        average_speed=('speed', 'mean'),
+        average_slope=('slope', 'mean'),
+        distance=('distance', 'sum')
+    )
+
+    summaries = []
+    for segment, row in stats.iterrows():
+        summary = {
+            'segment': int(segment),
+            'duration_seconds': float(row['duration']),
+            'samples': int(row['samples']),
+            'average_hr': float(row['average_hr']),
+            'max_hr': float(row['max_hr']),
+            'average_speed': float(row['average_speed']),
+            'average_slope': float(row['average_slope']),
+            'distance': float(row['distance'])  # km
+        }
+        if program is not None:
+            summary['name'] = program.segments[int(segment)].name
+            summary['kind'] = program.segments[int(segment)].kind
+        summaries.append(summary)
+    return summaries
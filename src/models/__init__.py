@@ -1,3 +1,3 @@
 # models/__init__.py
 from .user import User
-from .workout_session import WorkoutSession, WorkoutPoint
\ No newline at end of file
+from .workout_session import WorkoutSession, WorkoutPoint, PointArray
\ No newline at end of file
@@ -0,0 +1,179 @@
+# models/serialization.py
+"""
+Streaming, column-oriented JSON layout for workout sessions.
+
+The file is a single valid JSON document, but laid out one chunk per line
+so it can be written and read incrementally:
+
+    {"format": ..., "version": 1, "session": {...}, "columns": [...], "chunks": [
+    [[t0, t1, ...], [hr0, hr1, ...], ...]
+    ,[[...], [...], ...]
+    ]}
+
+Each chunk holds up to chunk_size data points as one list per column.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, TextIO, Tuple
+
+from .workout_session import WorkoutSession, WorkoutPoint, POINT_FIELDS, points_to_columns
+
+FORMAT_NAME = 'smart_treadmill.session'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 4096
+
+_CHUNKS_OPEN = ', "chunks": ['
+_CHUNKS_CLOSE = ']}'
+
+
+def is_streaming_header(line: str) -> bool:
+    """Whether `line` is the first line of a streaming session file"""
+    return line.rstrip().endswith(_CHUNKS_OPEN)
+
+
+def session_header(session: WorkoutSession) -> Dict:
+    """Session metadata, i.e. everything in to_dict except the data points"""
+    return {
+        'id': session.id,
+        'user_id': session.user_id,
+        'start_time': session.start_time.isoformat(),
+        'end_time': session.end_time.isoformat() if session.end_time else None,
+        'name': session.name,
+        'description': session.description,
+        'anaerobic_threshold': session.anaerobic_threshold,
+        'summary': session.summary
+    }
+
+
+def session_from_header(header: Dict) -> WorkoutSession:
+    """Create an empty WorkoutSession from session metadata"""
+    return WorkoutSession(
+        id=header['id'],
+        user_id=header['user_id'],
+        start_time=datetime.fromisoformat(header['start_time']),
+        end_time=datetime.fromisoformat(header['end_time']) if header.get('end_time') else None,
+        name=header.get('name', "Workout Session"),
+        description=header.get('description'),
+        anaerobic_threshold=header.get('anaerobic_threshold'),
+        summary=header.get('summary') or {}
+    )
+
+
+def points_from_columns(columns: Dict[str, List]) -> List[WorkoutPoint]:
+    """Build WorkoutPoints from a mapping of field name to column values"""
+    names = [name for name in POINT_FIELDS if name in columns]
+    rows = zip(*(columns[name] for name in names))
+    if len(names) == len(POINT_FIELDS):
+        return [WorkoutPoint(*row) for row in rows]
+    return [WorkoutPoint(**dict(zip(names, row))) for row in rows]
+
+
+def dump_session(session: WorkoutSession, fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Write a session to a text stream in the streaming column layout.
+    Only one chunk of columns is materialised at a time.
+    Args:
+        session: Session to write
+        fp: Writable text stream
+        chunk_size: Number of data points per chunk line
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    header = json.dumps({
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'session': session_header(session),
+        'columns': list(POINT_FIELDS)
+    })
+    fp.write(header[:-1] + _CHUNKS_OPEN + '\n')
+
+    points = session.data_points
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        columns = list(points_to_columns(chunk).values())
+        fp.write((',' if start else '') + json.dumps(columns) + '\n')
+
+    fp.write(_CHUNKS_CLOSE + '\n')
+
+
+def iter_session_chunks(fp: TextIO) -> Tuple[Dict, Iterator[Dict[str, List]]]:
+    """
+    Read a streaming session file lazily.
+    Returns: (session header, iterator of {field: column values} chunks)
+    """
+    first = fp.readline().rstrip()
+    if not first.endswith(_CHUNKS_OPEN):
+        raise ValueError("Not a streaming workout session file")
+    document = json.loads(first[:-len(_CHUNKS_OPEN)] + '}')
+    if document.get('format') != FORMAT_NAME:
+        raise ValueError(f"Unknown session format: {document.get('format')}")
+    if document.get('version', 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported session format version: {document['version']}")
+
+    names = document['columns']
+
+    def chunks() -> Iterator[Dict[str, List]]:
+        for line in fp:
+            line = line.strip()
+            if line == _CHUNKS_CLOSE:
+                return
+            if line:
+                yield dict(zip(names, json.loads(line.lstrip(','))))
+        raise ValueError("Truncated workout session file")
+
+    return document['session'], chunks()
+
+
+def iter_session_points(fp: TextIO) -> Tuple[Dict, Iterator[WorkoutPoint]]:
+    """Like iter_session_chunks, but yields individual WorkoutPoints"""
+    header, chunks = iter_session_chunks(fp)
+
+    def points() -> Iterator[WorkoutPoint]:
+        for columns in chunks:
+            yield from points_from_columns(columns)
+
+    return header, points()
+
+
+def load_session(fp: TextIO) -> WorkoutSession:
+    """Read a session written by dump_session"""
+    header, chunks = iter_session_chunks(fp)
+    session = session_from_header(header)
+    for columns in chunks:
+        session.data_points.extend(points_from_columns(columns))
+    return session
+
+
+def session_from_dict(data: Dict) -> WorkoutSession:
+    """
+    Build a session from a decoded document.
+    Accepts the row layout produced by WorkoutSession.to_dict as well as a
+    fully decoded streaming document.
+    """
+    if data.get('format') == FORMAT_NAME:
+        session = session_from_header(data['session'])
+        for chunk in data['chunks']:
+            session.data_points.extend(points_from_columns(dict(zip(data['columns'], chunk))))
+        return session
+
+    session = session_from_header(data)
+    session.data_points = [WorkoutPoint(**p) for p in data.get('data_points', [])]
+    return session
+
+
+def save_session(session: WorkoutSession, filename: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Write a session to a file in the streaming column layout"""
+    with open(filename, 'w') as f:
+        dump_session(session, f, chunk_size)
+
+
+def open_session(filename: str) -> WorkoutSession:
+    """Read a session file written by save_session or WorkoutSession.to_json"""
+    with open(filename, 'r') as f:
+        first = f.readline()
+        f.seek(0)
+        if is_streaming_header(first):
+            return load_session(f)
+        return session_from_dict(json.load(f))
@@ -3,6 +3,15 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Optional
 
+# Training zones as fractions of heart rate reserve (Karvonen)
+HRR_ZONES = {
+    'recovery': (0.50, 0.60),
+    'aerobic': (0.60, 0.70),
+    'anaerobic_threshold': (0.70, 0.80),
+    'vo2_max': (0.80, 0.90),
+    'maximum': (0.90, 1.00)
+}
+
 @dataclass
 class User:
     """User model representing a treadmill user"""
@@ -35,30 +44,16 @@ class User:
         if not self.max_heart_rate:
             self.calculate_max_heart_rate()
             
-        hrr = self.max_heart_rate - (self.resting_heart_rate or 60)
+        resting_hr = self.resting_heart_rate or 60
+        hrr = self.max_heart_rate - resting_hr
         
-        return {
-            'recovery': (
-                int(hrr * 0.50 + (self.resting_heart_rate or 60)),
-                int(hrr * 0.60 + (self.resting_heart_rate or 60))
-            ),
-            'aerobic': (
-                int(hrr * 0.60 + (self.resting_heart_rate or 60)),
-                int(hrr * 0.70 + (self.resting_heart_rate or 60))
-            ),
-            'anaerobic_threshold': (
-                int(hrr * 0.70 + (self.resting_heart_rate or 60)),
-                int(hrr * 0.80 + (self.resting_heart_rate or 60))
-            ),
-            'vo2_max': (
-                int(hrr * 0.80 + (self.resting_heart_rate or 60)),
-                int(hrr * 0.90 + (self.resting_heart_rate or 60))
-            ),
-            'maximum': (
-                int(hrr * 0.90 + (self.resting_heart_rate or 60)),
-                self.max_heart_rate
-            )
+        zones = {
+            name: (int(hrr * lower + resting_hr), int(hrr * upper + resting_hr))
+            for name, (lower, upper) in HRR_ZONES.items()
         }
+        # The top zone always ends at the actual maximum
+        zones['maximum'] = (zones['maximum'][0], self.max_heart_rate)
+        return zones
 
     def calculate_bmi(self) -> float:
         """Calculate Body Mass Index"""
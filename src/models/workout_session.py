@@ -3,18 +3,52 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
+import math
 import numpy as np
 
-@dataclass
+POINT_FIELDS = ('timestamp', 'heart_rate', 'speed', 'slope', 'power', 'cadence', 'stride_length',
+                'segment')
+
 class WorkoutPoint:
-    """Single point of workout data"""
-    timestamp: float
-    heart_rate: int
-    speed: float
-    slope: float
-    power: Optional[float] = None
-    cadence: Optional[int] = None
-    stride_length: Optional[float] = None
+    """
+    Single point of workout data.
+    One instance is created per sample, so this is a slotted class rather
+    than a dataclass: no per-instance __dict__, a fraction of the memory
+    and faster construction, with the same attributes and constructor.
+    """
+    __slots__ = POINT_FIELDS
+
+    def __init__(self, timestamp: float, heart_rate: int, speed: float, slope: float,
+                 power: Optional[float] = None, cadence: Optional[int] = None,
+                 stride_length: Optional[float] = None, segment: Optional[int] = None):
+        self.timestamp = timestamp
+        self.heart_rate = heart_rate
+        self.speed = speed
+        self.slope = slope
+        self.power = power
+        self.cadence = cadence
+        self.stride_length = stride_length
+        self.segment = segment  # index of the workout program segment, if any
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in POINT_FIELDS)
+        return f"WorkoutPoint({values})"
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def astuple(self) -> tuple:
+        """Field values in POINT_FIELDS order"""
+        return (self.timestamp, self.heart_rate, self.speed, self.slope,
+                self.power, self.cadence, self.stride_length, self.segment)
+
+    def to_dict(self) -> Dict:
+        """Field values keyed by field name"""
+        return dict(zip(POINT_FIELDS, self.astuple()))
 
     def calculate_power(self) -> float:
         """Calculate power output based on speed and slope"""
@@ -24,15 +58,215 @@ class WorkoutPoint:
         gravity = 9.81
         
         # Convert slope to angle in radians
-        angle = np.arctan(self.slope / 100)
+        angle = math.atan(self.slope / 100)
         
         # Calculate power components
-        vertical_power = weight * gravity * np.sin(angle) * self.speed
-        horizontal_power = 0.5 * weight * self.speed * self.speed * np.cos(angle)
+        vertical_power = weight * gravity * math.sin(angle) * self.speed
+        horizontal_power = 0.5 * weight * self.speed * self.speed * math.cos(angle)
         
         self.power = vertical_power + horizontal_power
         return self.power
 
+class PointView:
+    """
+    Lightweight view of one row of a PointArray.
+    Exposes the WorkoutPoint attributes; reads and writes go straight to
+    the backing arrays, so the view itself holds nothing but a reference
+    and an index.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array: 'PointArray', index: int):
+        self._array = array
+        self._index = index
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={value!r}" for name, value in zip(POINT_FIELDS, self.astuple()))
+        return f"PointView({values})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (WorkoutPoint, PointView)):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None
+
+    def astuple(self) -> tuple:
+        return self._array.row(self._index)
+
+    def to_dict(self) -> Dict:
+        return dict(zip(POINT_FIELDS, self.astuple()))
+
+    def to_point(self) -> WorkoutPoint:
+        """Copy the row into a standalone WorkoutPoint"""
+        return WorkoutPoint(*self.astuple())
+
+    calculate_power = WorkoutPoint.calculate_power
+
+def _view_property(name: str) -> property:
+    def getter(view: PointView):
+        return view._array.get(name, view._index)
+
+    def setter(view: PointView, value):
+        view._array.set(name, view._index, value)
+
+    return property(getter, setter)
+
+for _name in POINT_FIELDS:
+    setattr(PointView, _name, _view_property(_name))
+del _name
+
+class PointArray:
+    """
+    Column-backed, growable list of workout points.
+    Each field is a NumPy array, so a sample costs a few bytes per field
+    instead of a Python object plus one object per value. Missing values
+    are stored as NaN (floats) or -1 (integers). Heart rate is a float
+    column so fractional and missing readings round-trip; whole values read
+    back as int. Integer columns reject values they cannot hold exactly
+    with ValueError. Indexing returns a
+    PointView with the WorkoutPoint attribute API; slicing returns a new
+    PointArray. Supports the list operations sessions use on data_points.
+    """
+    _DTYPES = {
+        'timestamp': np.float64,
+        'heart_rate': np.float64,
+        'speed': np.float64,
+        'slope': np.float64,
+        'power': np.float64,
+        'cadence': np.int32,
+        'stride_length': np.float64,
+        'segment': np.int32
+    }
+    _REQUIRED = ('timestamp', 'speed', 'slope')
+    _MISSING_INT = -1
+
+    def __init__(self, points=(), capacity: int = 1024):
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self._DTYPES.items()}
+        self.extend(points)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield PointView(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = range(*index.indices(self._size))
+            sliced = PointArray(capacity=max(len(rows), 1))
+            for name, column in self._columns.items():
+                sliced._columns[name][:len(rows)] = column[:self._size][index]
+            sliced._size = len(rows)
+            return sliced
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("PointArray index out of range")
+        return PointView(self, index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (PointArray, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def _encode(self, name: str, value):
+        if self._DTYPES[name] is np.int32:
+            if value is None:
+                return self._MISSING_INT
+            if value != int(value) or value < 0:
+                raise ValueError(f"{name} must be a non-negative integer, got {value!r}")
+            return value
+        if value is None:
+            if name in self._REQUIRED:
+                raise ValueError(f"{name} is required")
+            return np.nan
+        return value
+
+    def _decode(self, name: str, value):
+        if self._DTYPES[name] is np.int32:
+            return None if value == self._MISSING_INT else int(value)
+        value = float(value)
+        if name in self._REQUIRED:
+            return value
+        if math.isnan(value):
+            return None
+        if name == 'heart_rate' and value.is_integer():
+            return int(value)
+        return value
+
+    def get(self, name: str, index: int):
+        return self._decode(name, self._columns[name][index])
+
+    def set(self, name: str, index: int, value):
+        self._columns[name][index] = self._encode(name, value)
+
+    def row(self, index: int) -> tuple:
+        return tuple(self._decode(name, column[index]) for name, column in self._columns.items())
+
+    def _reserve(self, size: int):
+        capacity = len(self._columns['timestamp'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, point):
+        """Store a WorkoutPoint (or PointView); its values are copied"""
+        self._reserve(self._size + 1)
+        for name, value in zip(POINT_FIELDS, point.astuple()):
+            self._columns[name][self._size] = self._encode(name, value)
+        self._size += 1
+
+    def extend(self, points):
+        if isinstance(points, PointArray):
+            self._reserve(self._size + len(points))
+            for name, column in points._columns.items():
+                self._columns[name][self._size:self._size + len(points)] = column[:len(points)]
+            self._size += len(points)
+            return
+        for point in points:
+            self.append(point)
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw values of one field (a view, with NaN/-1 for missing values)"""
+        return self._columns[name][:self._size]
+
+    def to_columns(self) -> Dict[str, list]:
+        """One list per field with missing values as None, like points_to_columns"""
+        columns = {}
+        for name in POINT_FIELDS:
+            values = self.column(name)
+            if name in self._REQUIRED:
+                columns[name] = values.tolist()
+            elif self._DTYPES[name] is np.int32:
+                columns[name] = [None if v == self._MISSING_INT else v for v in values.tolist()]
+            elif name == 'heart_rate':
+                columns[name] = [None if v != v else int(v) if v.is_integer() else v
+                                 for v in values.tolist()]
+            else:
+                columns[name] = [None if v != v else v for v in values.tolist()]
+        return columns
+
+    def nbytes(self) -> int:
+        """Bytes held by the backing arrays, including spare capacity"""
+        return sum(column.nbytes for column in self._columns.values())
+
+def points_to_columns(points: List[WorkoutPoint]) -> Dict[str, list]:
+    """Transpose points into one list per field, e.g. for a DataFrame"""
+    if isinstance(points, PointArray):
+        return points.to_columns()
+    if not points:
+        return {name: [] for name in POINT_FIELDS}
+    return dict(zip(POINT_FIELDS, map(list, zip(*(p.astuple() for p in points)))))
+
 @dataclass
 class WorkoutSession:
     """Complete workout session data"""
@@ -47,17 +281,27 @@ class WorkoutSession:
     summary: Dict = field(default_factory=dict)
     
     def add_data_point(self, heart_rate: int, speed: float, slope: float, 
-                      cadence: Optional[int] = None) -> WorkoutPoint:
-        """Add a new data point to the session"""
+                      cadence: Optional[int] = None,
+                      segment: Optional[int] = None,
+                      timestamp: Optional[float] = None) -> WorkoutPoint:
+        """
+        Add a new data point to the session.
+        Pass the source timestamp when known; otherwise the point is stamped
+        with the time it is added. Returns the stored point: a PointView
+        when data_points is a PointArray, so changes to it are kept.
+        """
         point = WorkoutPoint(
-            timestamp=datetime.now().timestamp(),
+            timestamp=datetime.now().timestamp() if timestamp is None else timestamp,
             heart_rate=heart_rate,
             speed=speed,
             slope=slope,
-            cadence=cadence
+            cadence=cadence,
+            segment=segment
         )
         point.calculate_power()
         self.data_points.append(point)
+        if isinstance(self.data_points, PointArray):
+            return self.data_points[-1]
         return point
 
     def end_session(self):
@@ -117,26 +361,37 @@ class WorkoutSession:
             'description': self.description,
             'anaerobic_threshold': self.anaerobic_threshold,
             'summary': self.summary,
-            'data_points': [
-                {
-                    'timestamp': p.timestamp,
-                    'heart_rate': p.heart_rate,
-                    'speed': p.speed,
-                    'slope': p.slope,
-                    'power': p.power,
-                    'cadence': p.cadence,
-                    'stride_length': p.stride_length
-                }
-                for p in self.data_points
-            ]
+            'data_points': [p.to_dict() for p in self.data_points]
         }
 
     def to_json(self) -> str:
         """Convert session to JSON format"""
         return json.dumps(self.to_dict())
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'WorkoutSession':
+        """Create a session from the output of to_dict"""
+        from .serialization import session_from_dict
+        return session_from_dict(data)
+
+    @classmethod
+    def from_json(cls, data: str) -> 'WorkoutSession':
+        """Create a session from the output of to_json"""
+        return cls.from_dict(json.loads(data))
+
+    def save_json(self, filename: str, chunk_size: int = 4096):
+        """Stream session to a column-oriented JSON file, chunk by chunk"""
+        from .serialization import save_session
+        save_session(self, filename, chunk_size)
+
+    @classmethod
+    def load_json(cls, filename: str) -> 'WorkoutSession':
+        """Load a session saved with save_json or to_json"""
+        from .serialization import open_session
+        return open_session(filename)
+
     def export_csv(self, filename: str):
         """Export session data to CSV file"""
         import pandas as pd
-        df = pd.DataFrame([vars(p) for p in self.data_points])
+        df = pd.DataFrame(points_to_columns(self.data_points))
         df.to_csv(filename, index=False)
\ No newline at end of file
@@ -1,16 +1,38 @@
 # ui/main_window.py
 import tkinter as tk
 from tkinter import ttk
+from typing import Dict, List, Optional
+
+from config.settings import AppSettings, Settings, SettingsManager
+from ..control.hr_controller import HeartRateZoneController, connect_control_panel, zone_bounds
 from .widgets.heart_rate_plot import HeartRatePlot
 from .widgets.control_panel import ControlPanel
 
 class MainWindow(tk.Tk):
-    def _init_(self):
-        super()._init_()
+    """
+    Main application window.
+    Components read the SettingsManager's current settings. The window
+    polls the config file on the Tk event loop, so reload subscribers run
+    on the UI thread.
+    """
+    def __init__(self, settings_manager: Optional[SettingsManager] = None,
+                 services: Optional[Dict] = None,
+                 max_hr: Optional[int] = None,
+                 simulation_mode: bool = False,
+                 debug_mode: bool = False):
+        super().__init__()
 
         self.title("Smart Treadmill Control")
         self.geometry("800x600")
 
+        self.settings_manager = settings_manager
+        self.services = services or {}
+        self.simulation_mode = simulation_mode
+        self.debug_mode = debug_mode
+        settings = settings_manager.current if settings_manager else None
+        zones = Settings.value(settings, 'TRAINING_ZONES')
+        self.max_hr = max_hr or Settings.value(settings, 'MAX_HEART_RATE_DEFAULT')
+
         # Create main containers
         self.top_frame = ttk.Frame(self)
         self.bottom_frame = ttk.Frame(self)
@@ -19,16 +41,52 @@ class MainWindow(tk.Tk):
         self.bottom_frame.pack(side=tk.BOTTOM, fill=tk.X)
 
         # Initialize widgets
-        self.heart_rate_plot = HeartRatePlot(self.top_frame)
-        self.control_panel = ControlPanel(self.bottom_frame)
+        self.heart_rate_plot = HeartRatePlot(self.top_frame, settings_manager=settings_manager)
+        self.control_panel = ControlPanel(self.bottom_frame, zone_names=zones)
 
         self.heart_rate_plot.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         self.control_panel.pack(fill=tk.X, padx=10, pady=5)
 
+        # Automatic heart rate control; speed commands go out through the
+        # panel's speed callback, the same path as manual changes
+        first_zone = next(iter(zones))
+        self.hr_controller = HeartRateZoneController(
+            zone_bounds(first_zone, self.max_hr, zones),
+            lambda speed: self.control_panel.speed_callback(speed),
+            settings=settings
+        )
+        connect_control_panel(
+            self.control_panel,
+            self.hr_controller,
+            self.max_hr,
+            current_output=lambda: float(self.control_panel.speed_scale.get()),
+            settings_manager=settings_manager
+        )
+
+        if settings_manager is not None:
+            settings_manager.subscribe(self.heart_rate_plot.apply_settings)
+            settings_manager.subscribe(self.apply_settings)
+            self._poll_settings()
+
         # Bind close event
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def apply_settings(self, settings: AppSettings, changed: List[str]):
+        """Offer the reloaded zones on the control panel"""
+        if 'training_zones' in changed:
+            self.control_panel.zone_combo['values'] = list(settings.training_zones)
+
+    def _poll_settings(self):
+        self.settings_manager.check_for_changes()
+        self.after(int(self.settings_manager.poll_interval * 1000), self._poll_settings)
+
+    def on_heart_rate(self, heart_rate: int):
+        """Handle a heart rate sample; call on the UI thread"""
+        self.heart_rate_plot.update_plot(heart_rate)
+        self.hr_controller.tick(heart_rate)
+
     def on_closing(self):
         """Handle cleanup when window is closed"""
+        self.hr_controller.disengage()
         self.control_panel.cleanup()
-        self.destroy()
\ No newline at end of file
+        self.destroy()
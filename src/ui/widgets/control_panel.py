@@ -1,11 +1,13 @@
 # ui/widgets/control_panel.py
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable
+from typing import Callable, Iterable, Optional
+
+from ...control.limits import SLOPE_LIMITS, SPEED_LIMITS
 
 class ControlPanel(ttk.Frame):
-    def _init_(self, parent):
-        super()._init_(parent)
+    def __init__(self, parent, zone_names: Iterable[str] = ()):
+        super().__init__(parent)
         
         # Speed control
         self.speed_frame = ttk.LabelFrame(self, text="Speed Control")
@@ -13,8 +15,8 @@ class ControlPanel(ttk.Frame):
         
         self.speed_scale = ttk.Scale(
             self.speed_frame,
-            from_=0,
-            to=20,
+            from_=SPEED_LIMITS[0],
+            to=SPEED_LIMITS[1],
             orient=tk.HORIZONTAL,
             command=self._on_speed_change
         )
@@ -29,8 +31,8 @@ class ControlPanel(ttk.Frame):
         
         self.incline_scale = ttk.Scale(
             self.incline_frame,
-            from_=0,
-            to=15,
+            from_=SLOPE_LIMITS[0],
+            to=SLOPE_LIMITS[1],
             orient=tk.HORIZONTAL,
             command=self._on_incline_change
         )
@@ -39,6 +41,26 @@ class ControlPanel(ttk.Frame):
         self.incline_label = ttk.Label(self.incline_frame, text="0.0°")
         self.incline_label.pack()
 
+        # Automatic heart rate control
+        self.auto_frame = ttk.LabelFrame(self, text="Heart Rate Control")
+        self.auto_frame.pack(side=tk.LEFT, padx=5, pady=5, fill=tk.X)
+
+        self.auto_var = tk.BooleanVar(value=False)
+        self.auto_check = ttk.Checkbutton(
+            self.auto_frame,
+            text="Hold zone",
+            variable=self.auto_var,
+            command=self._on_auto_change
+        )
+        self.auto_check.pack(padx=5, pady=5)
+
+        zone_names = list(zone_names)
+        self.zone_combo = ttk.Combobox(self.auto_frame, values=zone_names, state="readonly")
+        if zone_names:
+            self.zone_combo.current(0)
+        self.zone_combo.bind("<<ComboboxSelected>>", lambda event: self._on_auto_change())
+        self.zone_combo.pack(padx=5, pady=5)
+
         # Emergency stop button
         self.stop_button = ttk.Button(
             self,
@@ -56,23 +78,44 @@ class ControlPanel(ttk.Frame):
         self.speed_callback: Callable[[float], None] = lambda x: None
         self.incline_callback: Callable[[float], None] = lambda x: None
         self.stop_callback: Callable[[], None] = lambda: None
+        self.auto_callback: Callable[[bool, str], None] = lambda enabled, zone: None
+        self._updating_from_controller = False
 
     def set_callbacks(
         self,
         speed_callback: Callable[[float], None],
         incline_callback: Callable[[float], None],
-        stop_callback: Callable[[], None]
+        stop_callback: Callable[[], None],
+        auto_callback: Optional[Callable[[bool, str], None]] = None
     ):
         """Set callbacks for control events"""
         self.speed_callback = speed_callback
         self.incline_callback = incline_callback
         self.stop_callback = stop_callback
+        if auto_callback is not None:
+            self.auto_callback = auto_callback
+
+    def show_commanded_speed(self, speed: float):
+        """Reflect a speed set by the automatic controller without re-issuing it"""
+        self._updating_from_controller = True
+        try:
+            self.speed_scale.set(speed)
+        finally:
+            self._updating_from_controller = False
+        self.speed_label.config(text=f"{speed:.1f} km/h")
 
     def _on_speed_change(self, value):
         """Handle speed change events"""
         speed = float(value)
         self.speed_label.config(text=f"{speed:.1f} km/h")
-        self.speed_callback(speed)
+        if not self._updating_from_controller:
+            self.speed_callback(speed)
+
+    def _on_auto_change(self):
+        """Handle heart rate control toggle and zone selection"""
+        enabled = self.auto_var.get()
+        self.speed_scale.state(["disabled"] if enabled else ["!disabled"])
+        self.auto_callback(enabled, self.zone_combo.get())
 
     def _on_incline_change(self, value):
         """Handle incline change events"""
@@ -82,6 +125,9 @@ class ControlPanel(ttk.Frame):
 
     def _on_emergency_stop(self):
         """Handle emergency stop button press"""
+        if self.auto_var.get():
+            self.auto_var.set(False)
+            self._on_auto_change()
         self.speed_scale.set(0)
         self.stop_callback()
 
@@ -4,13 +4,20 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from collections import deque
+from typing import List, Optional
+
+from config.settings import AppSettings, Settings, SettingsManager
 
 class HeartRatePlot(tk.Frame):
-    def _init_(self, parent, history_size: int = 60):
-        super()._init_(parent)
-        self.history_size = history_size
-        self.heart_rate_history = deque(maxlen=history_size)
-        self.time_history = deque(maxlen=history_size)
+    def __init__(self, parent, history_size: Optional[int] = None,
+                 settings_manager: Optional[SettingsManager] = None):
+        super().__init__(parent)
+        self.settings_manager = settings_manager
+        settings = settings_manager.current if settings_manager else None
+        self.history_size = history_size or Settings.value(settings, 'MAX_PLOT_POINTS')
+        self.heart_rate_history = deque(maxlen=self.history_size)
+        self.time_history = deque(maxlen=self.history_size)
+        self._dirty = False
         
         # Create matplotlib figure
         self.figure = Figure(figsize=(8, 4), dpi=100)
@@ -21,16 +28,42 @@ class HeartRatePlot(tk.Frame):
         # Initialize plot
         self.line, = self.plot.plot([], [], 'b-')
         self.plot.set_ylim(40, 200)
-        self.plot.set_xlim(0, history_size)
+        self.plot.set_xlim(0, self.history_size)
         self.plot.set_title('Heart Rate Over Time')
         self.plot.set_xlabel('Time (s)')
         self.plot.set_ylabel('Heart Rate (BPM)')
         self.plot.grid(True)
 
+        self._schedule_redraw()
+
+    @property
+    def update_interval(self) -> int:
+        """Redraw interval in ms, read from the live settings"""
+        settings = self.settings_manager.current if self.settings_manager else None
+        return Settings.value(settings, 'PLOT_UPDATE_INTERVAL')
+
+    def apply_settings(self, settings: AppSettings, changed: Optional[List[str]] = None):
+        """Resize the history to MAX_PLOT_POINTS; suitable as a SettingsManager subscriber"""
+        if settings.max_plot_points == self.history_size:
+            return
+        self.history_size = settings.max_plot_points
+        self.heart_rate_history = deque(self.heart_rate_history, maxlen=self.history_size)
+        self.time_history = deque(self.time_history, maxlen=self.history_size)
+        self.plot.set_xlim(0, self.history_size)
+        self._dirty = True
+
     def update_plot(self, heart_rate: int):
-        """Update the plot with new heart rate data"""
+        """Add new heart rate data; the plot is redrawn on the next timer tick"""
         self.heart_rate_history.append(heart_rate)
         self.time_history.append(len(self.time_history))
-        
-        self.line.set_data(list(self.time_history), list(self.heart_rate_history))
-        self.canvas.draw()
\ No newline at end of file
+        self._dirty = True
+
+    def _schedule_redraw(self):
+        self.after(self.update_interval, self._redraw)
+
+    def _redraw(self):
+        if self._dirty:
+            self.line.set_data(list(self.time_history), list(self.heart_rate_history))
+            self.canvas.draw_idle()
+            self._dirty = False
+        self._schedule_redraw()
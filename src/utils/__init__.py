@@ -0,0 +1,2 @@
+# src/utils/__init__.py
+from .logging_utils import start_logging_pipeline, stop_logging_pipeline, log_event, RateLimitFilter, StructuredFormatter
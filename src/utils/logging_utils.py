@@ -0,0 +1,182 @@
+# src/utils/logging_utils.py
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, TextIO, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# State of the running pipeline, used to forward logs from worker processes
+_pipeline: Dict = {}
+_pipeline_lock = threading.Lock()
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields):
+    """
+    Log a structured hot-path event.
+    The level check happens before any formatting, so a disabled event costs
+    a single method call. Repeated events are rate limited by RateLimitFilter.
+    Args:
+        logger: Logger to emit on
+        level: Logging level, e.g. logging.INFO
+        event: Short event name, also used as the rate-limit key
+        fields: Key/value pairs rendered after the event name
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={'event': event, 'fields': fields})
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same structured event within a time window.
+    Only records created through log_event are limited; plain messages and
+    anything at WARNING or above always pass. The number of dropped repeats
+    is attached to the next record that gets through.
+    """
+    def __init__(self, interval: float = 1.0):
+        super().__init__()
+        self.interval = interval
+        self._last_emit: Dict[Tuple[str, str], float] = {}
+        self._suppressed: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, 'event', None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, event)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._last_emit[key] = now
+            record.suppressed = self._suppressed.pop(key, 0)
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formatter that appends log_event fields as key=value pairs"""
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            message += f" (+{suppressed} suppressed)"
+        return message
+
+
+def start_logging_pipeline(log_file: str,
+                           level: int = logging.INFO,
+                           max_bytes: int = 5 * 1024 * 1024,
+                           backup_count: int = 5,
+                           rate_limit_interval: float = 1.0,
+                           stream: Optional[TextIO] = None) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue so callers never block on I/O.
+    The root logger gets a single QueueHandler; a background QueueListener
+    writes records to a size-rotated log file and to the console.
+    Args:
+        log_file: Path of the rotating log file
+        level: Root logger level
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated files to keep
+        rate_limit_interval: Minimum seconds between repeats of one event
+        stream: Console stream, defaults to stdout
+    Returns: The started listener; it is also stopped automatically at exit
+    """
+    log_queue = queue.SimpleQueue()
+    formatter = StructuredFormatter(LOG_FORMAT)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count
+    )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit_interval))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(stop_logging_pipeline, listener)
+
+    with _pipeline_lock:
+        _pipeline.clear()
+        _pipeline.update(handlers=(file_handler, stream_handler), level=level,
+                         rate_limit_interval=rate_limit_interval, listener=listener)
+    return listener
+
+
+def stop_logging_pipeline(listener: logging.handlers.QueueListener):
+    """Flush queued records and stop the listener; safe to call twice"""
+    with _pipeline_lock:
+        if _pipeline.get('listener') is listener:
+            worker_listener = _pipeline.pop('worker_listener', None)
+            if worker_listener is not None:
+                worker_listener.stop()
+            _pipeline.clear()
+    if getattr(listener, '_thread', None) is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def init_worker_logging(log_queue, level: int = logging.INFO, rate_limit_interval: float = 1.0):
+    """
+    Process pool initializer that sends a worker's log records to the parent.
+    Replaces the handlers inherited from the parent, whose in-process queue
+    nobody reads in the worker, with a QueueHandler on `log_queue`. Without
+    a queue (no pipeline running) the worker's logging is left unchanged.
+    """
+    if log_queue is None:
+        return
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit_interval))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+
+def worker_logging() -> Tuple[Callable, tuple]:
+    """
+    Initializer and arguments for process pools, e.g.
+    ProcessPoolExecutor(initializer=init, initargs=args) with
+    init, args = worker_logging().
+    While a pipeline is running, worker records go through a
+    multiprocessing queue to a listener in this process that writes them to
+    the pipeline's file and console handlers.
+    """
+    with _pipeline_lock:
+        if not _pipeline:
+            return init_worker_logging, (None,)
+        if 'worker_listener' not in _pipeline:
+            worker_queue = multiprocessing.Queue()
+            worker_listener = logging.handlers.QueueListener(
+                worker_queue, *_pipeline['handlers'], respect_handler_level=True
+            )
+            worker_listener.start()
+            _pipeline.update(worker_queue=worker_queue, worker_listener=worker_listener)
+        return init_worker_logging, (_pipeline['worker_queue'], _pipeline['level'],
+                                     _pipeline['rate_limit_interval'])
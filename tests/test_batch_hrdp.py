@@ -0,0 +1,61 @@
+# tests/test_batch_hrdp.py
+import unittest
+import numpy as np
+from src.analysis.batch_hrdp import fit_hrdp_batch, METHODS
+from src.analysis.threshold_calculator import ThresholdCalculator
+
+def ramp_test(n=120, deflection=700.0, noise=0.5, seed=0):
+    """HR rising 0.1 bpm/s until `deflection` seconds, then 0.02 bpm/s"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 10.0
+    hr = 100 + 0.1 * np.minimum(t, deflection) + 0.02 * np.maximum(t - deflection, 0)
+    return t, hr + rng.normal(0, noise, n)
+
+class TestBatchHRDP(unittest.TestCase):
+    def test_methods_locate_deflection(self):
+        """Breakpoint-based methods find the simulated deflection"""
+        series = {f"s{i}": ramp_test(seed=i) for i in range(4)}
+        df = fit_hrdp_batch(series)
+        self.assertEqual(len(df), 4 * len(METHODS))
+        self.assertEqual(list(df['series_id'][:4]), ['s0'] * 4)
+        self.assertTrue(df['error'].isna().all())
+
+        for method in ('dmax', 'piecewise', 'conconi'):
+            times = df[df['method'] == method]['hrdp_time']
+            self.assertTrue(np.all(np.abs(times - 700) < 60), method)
+
+    def test_diagnostics_are_comparable(self):
+        """Every method's rmse is measured against the raw samples"""
+        df = fit_hrdp_batch([ramp_test(noise=3.0, seed=5)])
+        rmse = df.set_index('method')['rmse']
+        # All residuals include the 3 bpm noise, none are measured on smoothed data
+        self.assertTrue(np.all((rmse > 2.5) & (rmse < 4.0)), rmse.to_dict())
+
+    def test_sdmax_matches_threshold_calculator(self):
+        """The batched S.Dmax variant agrees with ThresholdCalculator"""
+        t, hr = ramp_test()
+        calculator = ThresholdCalculator()
+        calculator.set_data(list(hr), list(t))
+        expected_time, expected_hr = calculator.calculate_hrdp()
+
+        row = fit_hrdp_batch([(t, hr)], methods=['sdmax']).iloc[0]
+        self.assertAlmostEqual(row['hrdp_time'], expected_time, places=3)
+        self.assertAlmostEqual(row['hrdp_hr'], expected_hr, delta=1)
+
+    def test_ragged_and_invalid_series(self):
+        """Different lengths are fitted; invalid series report an error"""
+        series = [ramp_test(100), ramp_test(130), ([0, 1, 2], [100, 101, 102])]
+        df = fit_hrdp_batch(series, methods=['piecewise'], chunk_size=2)
+        self.assertEqual(list(df['n_points']), [100, 130, 3])
+        self.assertEqual(df['error'].iloc[2], "insufficient data points")
+
+    def test_process_pool(self):
+        """Fitting across processes gives the same table"""
+        series = [ramp_test(seed=i) for i in range(6)]
+        serial = fit_hrdp_batch(series, chunk_size=2)
+        parallel = fit_hrdp_batch(series, chunk_size=2, n_jobs=2)
+        np.testing.assert_allclose(serial['hrdp_time'], parallel['hrdp_time'])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            fit_hrdp_batch([ramp_test()], methods=['vslope'])
@@ -0,0 +1,98 @@
+# tests/test_cohort.py
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.cohort import CohortIndex, HistoryIndex, compare_to_history, session_profile
+from src.models.user import User
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+
+def make_session(session_id, hr_offset, speeds=(8.0, 10.0)):
+    session = WorkoutSession(id=session_id, user_id=1)
+    t = 0.0
+    for speed in speeds:
+        for _ in range(60):
+            session.data_points.append(WorkoutPoint(timestamp=t, heart_rate=int(speed * 15 + hr_offset),
+                                                    speed=speed, slope=1.0))
+            t += 1.0
+    return session
+
+class TestCohort(unittest.TestCase):
+    def setUp(self):
+        # Ten males in their thirties at 8 km/h, 1% slope, HR 130..148
+        self.records = pd.DataFrame({
+            'age': [35] * 10,
+            'gender': ['Male'] * 10,
+            'speed': [8.2] * 10,
+            'slope': [1.0] * 10,
+            'heart_rate': np.arange(130, 150, 2)
+        })
+        self.index = CohortIndex(self.records)
+
+    def test_rollup(self):
+        """Group statistics are precomputed per workload"""
+        stats = self.index.hr_at(age=38, gender='male', speed=8.9, slope=0.5)
+        self.assertEqual(stats['count'], 10)
+        self.assertAlmostEqual(stats['mean'], 139.0)
+        self.assertAlmostEqual(stats['median'], 139.0)
+        self.assertIsNone(self.index.hr_at(age=38, gender='Female', speed=8.9, slope=0.5))
+
+    def test_percentile_ranks(self):
+        """Ranks are the share of the cohort at or below the heart rate"""
+        queries = pd.DataFrame({
+            'age': [35, 35, 35, 35],
+            'gender': ['Male', 'Male', 'Male', 'Female'],
+            'speed': [8.0, 8.0, 8.0, 8.0],
+            'slope': [1.0, 1.0, 1.0, 1.0],
+            'heart_rate': [129, 138, 160, 138]
+        })
+        ranks = self.index.percentile_ranks(queries)
+        np.testing.assert_allclose(ranks[:3], [0.0, 50.0, 100.0])
+        self.assertTrue(np.isnan(ranks[3]))
+        self.assertEqual(self.index.percentile_rank(140, 35, 'Male', 8.0, 1.0), 60.0)
+
+    def test_from_sessions(self):
+        """Sessions contribute one record per workload bin"""
+        user = User(id=1, username='a', email='a@b.c', age=35, weight=70.0,
+                    height=175.0, gender='Male')
+        index = CohortIndex.from_sessions([(user, make_session(1, 0)), (user, make_session(2, 10))])
+        self.assertEqual(index.hr_at(35, 'Male', 8.0, 1.0)['count'], 2)
+        self.assertEqual(index.hr_at(35, 'Male', 10.0, 1.0)['mean'], 155.0)
+
+    def test_compare_to_history(self):
+        """Session HR is compared per workload with earlier sessions"""
+        history = [make_session(1, 10), make_session(2, 20, speeds=(8.0,))]
+        result = compare_to_history(make_session(3, 0), history)
+        row = result.loc[(8, 0)]
+        self.assertEqual(row['heart_rate'], 120)
+        self.assertEqual(row['history_sessions'], 2)
+        self.assertEqual(row['delta_hr'], -15)
+        self.assertEqual(result.loc[(10, 0)]['history_sessions'], 1)
+        self.assertEqual(len(session_profile(WorkoutSession(id=4, user_id=1))), 0)
+
+    def test_history_index_matches_ad_hoc_comparison(self):
+        """Stored profiles give the same comparison, excluding the session itself"""
+        history = [make_session(1, 10), make_session(2, 20, speeds=(8.0,))]
+        current = make_session(3, 0)
+        index = HistoryIndex.from_sessions(history + [current])
+        pd.testing.assert_frame_equal(index.compare(current), compare_to_history(current, history))
+        pd.testing.assert_frame_equal(compare_to_history(current, index), index.compare(current))
+        self.assertEqual(len(index.profiles(1)), 5)
+
+        index.remove_session(1, 2)
+        self.assertEqual(index.compare(current).loc[(8, 0)]['history_sessions'], 1)
+
+    def test_gender_categories(self):
+        """Female, other and missing genders are separate cohorts"""
+        records = pd.DataFrame({
+            'age': [35] * 4,
+            'gender': ['Female', 'Other', None, ' male '],
+            'speed': [8.0] * 4,
+            'slope': [1.0] * 4,
+            'heart_rate': [140, 150, 160, 170]
+        })
+        index = CohortIndex(records)
+        self.assertEqual(index.hr_at(35, 'female', 8.0, 1.0)['mean'], 140)
+        self.assertEqual(index.hr_at(35, 'Other', 8.0, 1.0)['mean'], 150)
+        self.assertEqual(index.hr_at(35, None, 8.0, 1.0)['mean'], 160)
+        self.assertEqual(index.hr_at(35, 'Male', 8.0, 1.0)['mean'], 170)
+        self.assertEqual(index.percentile_rank(150, 35, 'other', 8.0, 1.0), 100.0)
@@ -0,0 +1,113 @@
+# tests/test_downsampling.py
+import tempfile
+import unittest
+from dataclasses import replace
+import numpy as np
+from config.settings import Settings
+from src.analysis.downsampling import build_rollups, select_resolution, RollupStore
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        # 10 minutes at 1 Hz, aligned to a 5 minute boundary
+        self.start = 1_700_000_100.0
+        self.timestamps = self.start + np.arange(600)
+        self.heart_rates = np.where(np.arange(600) < 300, 130, 170)
+        self.speeds = np.linspace(6, 12, 600)
+        self.slopes = np.full(600, 2.0)
+
+    def test_rollup_statistics(self):
+        """Buckets hold correct counts, means, extremes and zone dwell"""
+        rollups = build_rollups(self.timestamps, self.heart_rates, self.speeds, self.slopes,
+                                max_hr=200)
+        self.assertEqual(sorted(rollups), [5, 30, 300])
+        self.assertEqual(len(rollups[5]['time']), 120)
+        self.assertEqual(len(rollups[300]['time']), 2)
+
+        coarse = rollups[300]
+        np.testing.assert_array_equal(coarse['count'], [300, 300])
+        np.testing.assert_allclose(coarse['heart_rate_mean'], [130, 170])
+        self.assertAlmostEqual(coarse['speed_min'][0], 6.0)
+        self.assertAlmostEqual(coarse['speed_max'][1], 12.0)
+
+        # 130 bpm is 65% of max (recovery), 170 bpm is 85% (threshold)
+        np.testing.assert_allclose(coarse['zone_recovery'], [300, 0])
+        np.testing.assert_allclose(coarse['zone_anaerobic_threshold'], [0, 300])
+
+        # Derived levels agree with each other
+        self.assertAlmostEqual(rollups[30]['heart_rate_mean'].mean(),
+                               self.heart_rates.mean())
+
+    def test_select_resolution(self):
+        """The coarsest necessary level is chosen for the span"""
+        self.assertEqual(select_resolution(3600, 3600), 5)
+        self.assertEqual(select_resolution(86400, 3600), 30)
+        self.assertEqual(select_resolution(30 * 86400, 3600), 300)
+        self.assertEqual(select_resolution(365 * 86400, 3600), 300)
+
+    def test_invalid_resolutions(self):
+        """Levels must nest"""
+        with self.assertRaises(ValueError):
+            build_rollups(self.timestamps, self.heart_rates, self.speeds, self.slopes,
+                          resolutions=(5, 12))
+
+    def make_session(self, session_id=1, offset=0.0):
+        session = WorkoutSession(id=session_id, user_id=9)
+        session.data_points = [
+            WorkoutPoint(timestamp=t + offset, heart_rate=int(hr), speed=v, slope=s)
+            for t, hr, v, s in zip(self.timestamps, self.heart_rates, self.speeds, self.slopes)
+        ]
+        return session
+
+    def test_store_query(self):
+        """Stored sessions are queried at the level matching the span"""
+        session = self.make_session()
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RollupStore(tmp)
+            store.add_session(session, max_hr=200)
+
+            resolution, data = RollupStore(tmp).query(self.start, self.start + 600, max_points=200)
+            self.assertEqual(resolution, 5)
+            self.assertEqual(len(data['time']), 120)
+
+            resolution, data = store.query(self.start - 86400, self.start + 86400, max_points=1000)
+            self.assertEqual(resolution, 300)
+            self.assertEqual(int(data['count'].sum()), 600)
+
+            _, data = store.query(self.start, self.start + 600, user_id=2)
+            self.assertEqual(data, {})
+
+    def test_store_uses_loaded_settings(self):
+        """Zones, max HR and point budget come from settings, including reloads"""
+        settings = replace(Settings.load_typed(), max_heart_rate_default=200, max_plot_points=200,
+                           training_zones={'EASY': (0.0, 0.75), 'HARD': (0.75, 1.0)})
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RollupStore(tmp, settings=settings)
+            store.add_session(self.make_session())
+            level = store.load_level(1, 300)
+            np.testing.assert_allclose(level['zone_easy'], [300, 0])
+            np.testing.assert_allclose(level['zone_hard'], [0, 300])
+
+            resolution, _ = store.query(self.start, self.start + 3000)
+            self.assertEqual(resolution, 30)
+            store.apply_settings(replace(settings, max_plot_points=1000), ['max_plot_points'])
+            resolution, _ = store.query(self.start, self.start + 3000)
+            self.assertEqual(resolution, 5)
+
+    def test_query_across_zone_reload(self):
+        """Sessions stored before and after a zone change can be queried together"""
+        settings = replace(Settings.load_typed(), max_heart_rate_default=200)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RollupStore(tmp, settings=settings)
+            store.add_session(self.make_session(1))
+            zones = {'EASY': (0.0, 0.75), 'HARD': (0.75, 1.0)}
+            store.apply_settings(replace(settings, training_zones=zones), ['training_zones'])
+            store.add_session(self.make_session(2, offset=600.0))
+            self.assertEqual(RollupStore(tmp).index['2']['zones'],
+                             {'EASY': [0.0, 0.75], 'HARD': [0.75, 1.0]})
+
+            resolution, data = store.query(self.start, self.start + 1200, max_points=10)
+            self.assertEqual(resolution, 300)
+            np.testing.assert_allclose(data['zone_recovery'], [300, 0, np.nan, np.nan])
+            np.testing.assert_allclose(data['zone_easy'], [np.nan, np.nan, 300, 0])
+            np.testing.assert_allclose(data['zone_hard'], [np.nan, np.nan, 0, 300])
@@ -0,0 +1,54 @@
+# tests/test_feature_pipeline.py
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.feature_pipeline import FeaturePipeline
+from src.models.user import User
+
+class TestFeaturePipeline(unittest.TestCase):
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'Age': [30, 45],
+            'Gender': ['Male', 'Female'],
+            'Weight (kg)': [70.0, 60.0],
+            'Resting HR (bpm)': [60, 55],
+            'Heart Rate (bpm)': [155, 90],
+            'Speed (km/h)': [10.0, 5.0],
+            'Slope (%)': [0.0, 5.0],
+            'Duration (minutes)': [60, 30],
+            'Energy Expended (kcal)': [700.0, 150.0],
+            'Anaerobic Threshold Reached?': ['Yes', 'No'],
+            'Target Speed (km/h)': [10.5, 5.5],
+            'Target Slope (%)': [1.0, 5.0]
+        })
+        self.pipeline = FeaturePipeline()
+
+    def test_features(self):
+        """Derived columns match the User model and ACSM equations"""
+        df = self.pipeline.run(self.raw)
+
+        np.testing.assert_array_equal(df['max_hr'], [190, 175])
+        self.assertAlmostEqual(df['hrr_pct'][0], (155 - 60) / (190 - 60) * 100)
+        self.assertEqual(list(df['gender_male']), [True, False])
+        self.assertEqual(list(df['threshold_reached']), [True, False])
+
+        # Running at 10 km/h on the flat: (0.2 * 166.7 + 3.5) / 3.5
+        self.assertAlmostEqual(df['mets'][0], (0.2 * 10000 / 60 + 3.5) / 3.5)
+        self.assertAlmostEqual(df['predicted_kcal'][0], df['mets'][0] * 70.0)
+
+    def test_zones_match_user(self):
+        """Zones agree with User.calculate_target_heart_rate_zones"""
+        df = self.pipeline.run(self.raw)
+        user = User(id=1, username='a', email='a@b.c', age=30, weight=70.0,
+                    height=180.0, gender='Male', resting_heart_rate=60)
+        zones = user.calculate_target_heart_rate_zones()
+        lower, upper = zones[df['zone'][0]]
+        self.assertGreaterEqual(155, lower)
+        self.assertLess(155, upper)
+        self.assertEqual(df['zone'][1], 'below_recovery')
+
+    def test_timings(self):
+        """Every step reports its duration"""
+        self.pipeline.run(self.raw)
+        self.assertEqual(list(self.pipeline.timings),
+                         ['normalize', 'heart_rate_reserve', 'zones', 'mets', 'calories'])
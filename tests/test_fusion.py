@@ -0,0 +1,66 @@
+# tests/test_fusion.py
+import unittest
+import numpy as np
+from src.analysis.fusion import SensorFusion, StreamBuffer, distance_km
+from src.analysis.threshold_calculator import ThresholdCalculator
+
+class TestSensorFusion(unittest.TestCase):
+    def setUp(self):
+        self.fusion = SensorFusion(rate_hz=1.0, max_gap=3.0)
+
+    def test_aligns_streams_at_different_rates(self):
+        """HR is interpolated linearly, treadmill values are held"""
+        for i in range(21):
+            self.fusion.add_heart_rate(100 + i, timestamp=1000.0 + i * 0.5)  # 2 Hz
+        for i in range(6):
+            self.fusion.add_treadmill(8.0 + i, 1.0, timestamp=1000.2 + i * 2)  # 0.5 Hz
+
+        aligned = self.fusion.resample()
+        np.testing.assert_allclose(aligned['time'], 1000.2 + np.arange(10))
+        np.testing.assert_allclose(aligned['heart_rate'], 100.4 + 2 * np.arange(10))
+        np.testing.assert_allclose(aligned['speed'], np.repeat([8.0, 9.0, 10.0, 11.0, 12.0], 2))
+        self.assertTrue(aligned['valid'].all())
+
+    def test_jitter_and_duplicates(self):
+        """Out-of-order samples are sorted; duplicates keep the latest value"""
+        buffer = StreamBuffer('hr', ('heart_rate',))
+        for t, hr in [(2.0, 102), (1.0, 101), (3.0, 103), (2.0, 110)]:
+            buffer.add(t, hr)
+        times, values = buffer.arrays()
+        np.testing.assert_array_equal(times, [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(values['heart_rate'], [101, 110, 103])
+
+    def test_gaps_are_marked_invalid(self):
+        """Grid points inside a dropout longer than max_gap are NaN"""
+        for t in list(range(0, 5)) + list(range(15, 20)):
+            self.fusion.add_heart_rate(120, timestamp=float(t))
+        for t in range(0, 20):
+            self.fusion.add_treadmill(9.0, 2.0, timestamp=float(t))
+
+        aligned = self.fusion.resample()
+        self.assertEqual(len(aligned['time']), 20)
+        self.assertTrue(aligned['valid'][:5].all())
+        self.assertFalse(aligned['valid'][5:15].any())
+        self.assertTrue(np.isnan(aligned['heart_rate'][10]))
+        self.assertEqual(len(self.fusion.to_points(aligned)), 10)
+
+    def test_downstream_analyses(self):
+        """Aligned arrays feed distance integration and threshold fitting"""
+        for t in range(0, 601):
+            self.fusion.add_heart_rate(100 + t * 0.1, timestamp=t + 0.3)
+            self.fusion.add_treadmill(12.0, 0.0, timestamp=float(t))
+        aligned = self.fusion.resample()
+        self.assertAlmostEqual(distance_km(aligned['time'], aligned['speed']), 12.0 * 599 / 3600)
+
+        calculator = ThresholdCalculator()
+        calculator.set_data(aligned['heart_rate'][aligned['valid']].tolist(),
+                            aligned['time'][aligned['valid']].tolist())
+        calculator.calculate_hrdp()
+        self.assertIsNotNone(calculator.hrdp_hr)
+
+    def test_source_timestamps_default_to_clock(self):
+        """Samples without a source time are stamped on arrival"""
+        fusion = SensorFusion(clock=lambda: 42.0)
+        fusion.add_heart_rate(130)
+        times, _ = fusion.heart_rate.arrays()
+        np.testing.assert_array_equal(times, [42.0])
@@ -0,0 +1,138 @@
+# tests/test_hr_controller.py
+import json
+import os
+import tempfile
+import unittest
+from config.settings import SettingsManager
+from src.control.hr_controller import (HeartRateZoneController, HeartRateSmoother, zone_bounds,
+                                       connect_control_panel)
+from src.control.simulation import SimulatedHeartRateResponse
+
+class TestHeartRateZoneController(unittest.TestCase):
+    def run_loop(self, controller, sim, seconds):
+        heart_rates = []
+        for t in range(1, seconds + 1):
+            hr = sim.step(1.0)
+            controller.tick(hr, float(t))
+            heart_rates.append(hr)
+        return heart_rates
+
+    def test_holds_zone_in_simulation(self):
+        """Closed loop settles inside the target band"""
+        sim = SimulatedHeartRateResponse(noise=2.0, seed=3)
+        controller = HeartRateZoneController((140, 155), sim.set_speed, control_interval=5.0)
+        sim.set_speed(6.0)
+        controller.engage(6.0)
+
+        heart_rates = self.run_loop(controller, sim, 1200)
+        settled = heart_rates[300:]
+        self.assertTrue(all(135 <= hr <= 160 for hr in settled))
+        self.assertAlmostEqual(sum(settled) / len(settled), 147.5, delta=2.0)
+
+    def test_anti_windup_at_speed_limit(self):
+        """An unreachable zone saturates without winding up the integrator"""
+        sim = SimulatedHeartRateResponse(max_hr=150)
+        commands = []
+        controller = HeartRateZoneController((170, 180), commands.append, control_interval=5.0)
+        sim.set_speed(10.0)
+        controller.engage(10.0)
+        for t in range(1, 601):
+            controller.tick(sim.step(1.0), float(t))
+        self.assertGreater(controller.output, 19.5)
+
+        # Once the zone becomes reachable the controller backs off immediately
+        controller.set_target_zone((100, 110))
+        for t in range(601, 631):
+            controller.tick(sim.step(1.0), float(t))
+        self.assertLess(controller.output, 18.0)
+
+    def test_control_rate_and_step_limit(self):
+        """Commands are issued at most once per interval and rate limited"""
+        commands = []
+        controller = HeartRateZoneController((140, 150), commands.append,
+                                             control_interval=5.0, max_step=0.5, smoothing=0)
+        controller.engage(8.0)
+        for t in range(0, 21):
+            controller.tick(100.0, float(t))
+        self.assertEqual(commands, [8.5, 9.0, 9.5, 10.0])
+
+    def test_disengaged_does_not_command(self):
+        """No commands are issued while disengaged"""
+        commands = []
+        controller = HeartRateZoneController((140, 150), commands.append, control_interval=1.0)
+        for t in range(10):
+            self.assertIsNone(controller.tick(100.0, float(t)))
+        self.assertEqual(commands, [])
+
+    def test_zone_bounds_and_smoother(self):
+        """Zone fractions become bpm bands and smoothing converges"""
+        self.assertEqual(zone_bounds('AEROBIC', 200), (140.0, 160.0))
+        smoother = HeartRateSmoother(time_constant=5.0)
+        smoother.update(100, 0.0)
+        for t in range(1, 60):
+            value = smoother.update(150, float(t))
+        self.assertAlmostEqual(value, 150, delta=0.1)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            HeartRateZoneController((150, 140), lambda value: None)
+        with self.assertRaises(ValueError):
+            HeartRateZoneController((140, 150), lambda value: None, actuator='belt')
+
+class FakePanel:
+    """Stands in for ControlPanel, which needs a display"""
+    def __init__(self):
+        self.auto_callback = lambda enabled, zone: None
+        self.shown = []
+
+    def show_commanded_speed(self, speed):
+        self.shown.append(speed)
+
+class TestControlPanelConnection(unittest.TestCase):
+    def test_hold_zone_drives_controller(self):
+        """The panel toggle engages the controller and commands reach treadmill and panel"""
+        panel, sent = FakePanel(), []
+        controller = HeartRateZoneController((100, 110), sent.append, control_interval=1.0,
+                                             smoothing=0)
+        connect_control_panel(panel, controller, max_hr=200, current_output=lambda: 8.0)
+
+        panel.auto_callback(True, 'AEROBIC')
+        self.assertTrue(controller.enabled)
+        self.assertEqual(controller.target_zone, (140.0, 160.0))
+        for t in range(5):
+            controller.tick(120.0, float(t))
+        self.assertTrue(sent)
+        self.assertEqual(panel.shown, sent)
+
+        panel.auto_callback(False, 'AEROBIC')
+        self.assertFalse(controller.enabled)
+        controller.tick(120.0, 10.0)
+        self.assertEqual(panel.shown, sent)
+
+    def test_settings_reload_reaches_controller(self):
+        """Live settings supply zones; a reload updates interval, smoothing and band"""
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, 'config.json')
+            with open(config_file, 'w') as f:
+                json.dump({'HR_CONTROL_INTERVAL': 2.0}, f)
+            os.utime(config_file, (1_000_000, 1_000_000))
+            manager = SettingsManager(config_file)
+
+            panel = FakePanel()
+            controller = HeartRateZoneController((100, 110), lambda value: None,
+                                                 settings=manager.current)
+            self.assertEqual(controller.control_interval, 2.0)
+            connect_control_panel(panel, controller, max_hr=200, current_output=lambda: 8.0,
+                                  settings_manager=manager)
+            panel.auto_callback(True, 'AEROBIC')
+            self.assertEqual(controller.target_zone, (140.0, 160.0))
+
+            zones = dict(manager.current.training_zones, AEROBIC=(0.65, 0.75))
+            with open(config_file, 'w') as f:
+                json.dump({'HR_CONTROL_INTERVAL': 3.0, 'HR_SMOOTHING_TIME_CONSTANT': 4.0,
+                           'TRAINING_ZONES': zones}, f)
+            os.utime(config_file, (1_000_010, 1_000_010))
+            manager.check_for_changes()
+            self.assertEqual(controller.control_interval, 3.0)
+            self.assertEqual(controller.smoother.time_constant, 4.0)
+            self.assertEqual(controller.target_zone, (130.0, 150.0))
@@ -0,0 +1,84 @@
+# tests/test_logging_utils.py
+import io
+import logging
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.logging_utils import RateLimitFilter, StructuredFormatter, log_event, start_logging_pipeline, stop_logging_pipeline, worker_logging
+
+def log_in_worker(message):
+    logging.getLogger('worker').warning(message)
+
+class TestLoggingUtils(unittest.TestCase):
+    def _record(self, event=None, level=logging.INFO):
+        record = logging.LogRecord('test', level, __file__, 0, 'msg', None, None)
+        if event is not None:
+            record.event = event
+        return record
+
+    def test_rate_limit_drops_repeated_events(self):
+        """Repeated events inside the interval are suppressed and counted"""
+        rate_filter = RateLimitFilter(interval=60)
+        self.assertTrue(rate_filter.filter(self._record('tick')))
+        self.assertFalse(rate_filter.filter(self._record('tick')))
+        self.assertFalse(rate_filter.filter(self._record('tick')))
+
+        # Other events, plain messages and warnings are not limited
+        self.assertTrue(rate_filter.filter(self._record('other')))
+        self.assertTrue(rate_filter.filter(self._record()))
+        self.assertTrue(rate_filter.filter(self._record('tick', logging.WARNING)))
+
+        rate_filter.interval = 0
+        record = self._record('tick')
+        self.assertTrue(rate_filter.filter(record))
+        self.assertEqual(record.suppressed, 2)
+
+    def test_structured_formatter_appends_fields(self):
+        """Event fields are rendered as key=value pairs"""
+        record = self._record('hrdp_calculated')
+        record.msg = 'hrdp_calculated'
+        record.fields = {'hr_bpm': 165}
+        formatted = StructuredFormatter('%(message)s').format(record)
+        self.assertEqual(formatted, 'hrdp_calculated hr_bpm=165')
+
+    def test_pipeline_writes_through_queue(self):
+        """Records logged on the caller thread reach file and console"""
+        root = logging.getLogger()
+        saved_handlers, saved_level = list(root.handlers), root.level
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, 'app.log')
+            listener = start_logging_pipeline(log_file, stream=stream)
+            try:
+                log_event(logging.getLogger('pipeline'), logging.INFO, 'sample', hr_bpm=120)
+            finally:
+                stop_logging_pipeline(listener)
+                root.handlers[:] = saved_handlers
+                root.setLevel(saved_level)
+
+            with open(log_file) as f:
+                self.assertIn('sample hr_bpm=120', f.read())
+        self.assertIn('sample hr_bpm=120', stream.getvalue())
+
+    def test_pipeline_receives_worker_records(self):
+        """Records logged in pool workers reach the parent's handlers"""
+        root = logging.getLogger()
+        saved_handlers, saved_level = list(root.handlers), root.level
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, 'app.log')
+            listener = start_logging_pipeline(log_file, stream=stream)
+            try:
+                initializer, initargs = worker_logging()
+                with ProcessPoolExecutor(max_workers=1, initializer=initializer,
+                                         initargs=initargs) as pool:
+                    pool.submit(log_in_worker, 'from worker').result()
+            finally:
+                stop_logging_pipeline(listener)
+                root.handlers[:] = saved_handlers
+                root.setLevel(saved_level)
+
+            with open(log_file) as f:
+                self.assertIn('worker - WARNING - from worker', f.read())
+        self.assertIn('from worker', stream.getvalue())
@@ -0,0 +1,46 @@
+# tests/test_main_window.py
+import json
+import os
+import tempfile
+import unittest
+from config.settings import Settings, SettingsManager
+
+HAS_DISPLAY = bool(os.environ.get('DISPLAY'))
+
+@unittest.skipUnless(HAS_DISPLAY, "no display available for tkinter")
+class TestMainWindow(unittest.TestCase):
+    def setUp(self):
+        from src.ui.main_window import MainWindow
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, 'config.json')
+        self.write_config({'PLOT_UPDATE_INTERVAL': 500}, mtime=1_000_000)
+        self.manager = SettingsManager(self.config_file)
+        self.window = MainWindow(self.manager, max_hr=200)
+
+    def tearDown(self):
+        self.window.destroy()
+        self.tmp.cleanup()
+
+    def write_config(self, settings, mtime):
+        with open(self.config_file, 'w') as f:
+            json.dump(settings, f)
+        os.utime(self.config_file, (mtime, mtime))
+
+    def test_hold_zone_reaches_controller(self):
+        """Zones are offered on the panel and the toggle engages the controller"""
+        panel = self.window.control_panel
+        self.assertEqual(list(panel.zone_combo['values']), list(Settings.get_default('TRAINING_ZONES')))
+        panel.zone_combo.set('AEROBIC')
+        panel.auto_var.set(True)
+        panel._on_auto_change()
+        self.assertTrue(self.window.hr_controller.enabled)
+        self.assertEqual(self.window.hr_controller.target_zone, (140.0, 160.0))
+
+    def test_reload_reaches_plot(self):
+        """Plot interval and history size follow a config reload"""
+        plot = self.window.heart_rate_plot
+        self.assertEqual(plot.update_interval, 500)
+        self.write_config({'PLOT_UPDATE_INTERVAL': 250, 'MAX_PLOT_POINTS': 120}, mtime=1_000_010)
+        self.manager.check_for_changes()
+        self.assertEqual(plot.update_interval, 250)
+        self.assertEqual(plot.heart_rate_history.maxlen, 120)
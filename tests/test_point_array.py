@@ -0,0 +1,75 @@
+# tests/test_point_array.py
+import io
+import unittest
+from datetime import datetime
+import numpy as np
+from src.models.workout_session import PointArray, WorkoutPoint, WorkoutSession, points_to_columns
+from src.models.serialization import dump_session, load_session
+
+class TestPointArray(unittest.TestCase):
+    def setUp(self):
+        self.points = [WorkoutPoint(timestamp=1000.0 + i, heart_rate=120 + i, speed=8.5, slope=1.0,
+                                    cadence=160 if i % 2 else None)
+                       for i in range(10)]
+        self.array = PointArray(self.points, capacity=4)
+
+    def test_rows_match_points(self):
+        """Views expose the same attributes and values, including missing ones"""
+        self.assertEqual(len(self.array), 10)
+        self.assertEqual(self.array, self.points)
+        self.assertEqual(self.array[-1].heart_rate, 129)
+        self.assertIsNone(self.array[0].cadence)
+        self.assertIsNone(self.array[0].power)
+        with self.assertRaises(IndexError):
+            self.array[10]
+
+    def test_values_round_trip_exactly(self):
+        """Fractional and missing heart rates survive; lossy integers are rejected"""
+        points = [WorkoutPoint(0.0, 150.7, 8.0, 1.0), WorkoutPoint(1.0, None, 8.0, 1.0),
+                  WorkoutPoint(2.0, 151, 8.0, 1.0, cadence=0)]
+        array = PointArray(points)
+        self.assertEqual(array, points)
+        self.assertIsInstance(array[2].heart_rate, int)
+        self.assertEqual(points_to_columns(array), points_to_columns(points))
+
+        for bad in [WorkoutPoint(3.0, 150, 8.0, 1.0, cadence=160.5),
+                    WorkoutPoint(3.0, 150, 8.0, 1.0, segment=-1),
+                    WorkoutPoint(3.0, 150, None, 1.0)]:
+            with self.assertRaises(ValueError):
+                array.append(bad)
+        self.assertEqual(len(array), 3)
+
+    def test_add_data_point_returns_stored_view(self):
+        """Sessions backed by a PointArray hand back a view of the stored row"""
+        session = WorkoutSession(id=1, user_id=1, data_points=PointArray())
+        point = session.add_data_point(140, 9.0, 1.0, timestamp=5.0)
+        point.cadence = 170
+        self.assertEqual(session.data_points[0].cadence, 170)
+        self.assertIsNotNone(session.data_points[0].power)
+
+    def test_writes_go_to_backing_arrays(self):
+        """Setting an attribute on a view updates the stored row"""
+        view = self.array[3]
+        power = view.calculate_power()
+        self.assertEqual(self.array[3].power, power)
+        self.assertEqual(power, self.points[3].calculate_power())
+
+    def test_slice_and_columns(self):
+        """Slices are PointArrays and columns match points_to_columns"""
+        part = self.array[2:5]
+        self.assertIsInstance(part, PointArray)
+        self.assertEqual(part, self.points[2:5])
+        self.assertEqual(points_to_columns(self.array), points_to_columns(self.points))
+        np.testing.assert_array_equal(self.array.column('heart_rate'), np.arange(120, 130))
+
+    def test_session_round_trip(self):
+        """A session backed by a PointArray serializes like a list-backed one"""
+        session = WorkoutSession(id=1, user_id=1, start_time=datetime(2024, 1, 1),
+                                 data_points=self.array)
+        buffer = io.StringIO()
+        dump_session(session, buffer, chunk_size=3)
+        buffer.seek(0)
+        self.assertEqual(load_session(buffer).data_points, self.points)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_recommender.py
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.recommender import SpeedSlopeRecommender, FEATURES
+from src.models.user import User
+
+class TestSpeedSlopeRecommender(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        self.df = pd.DataFrame({
+            'age': rng.integers(20, 60, n),
+            'gender_male': rng.integers(0, 2, n).astype(bool),
+            'weight': rng.uniform(50, 100, n),
+            'resting_hr': rng.integers(50, 75, n),
+            'heart_rate': rng.integers(90, 180, n),
+            'speed': rng.uniform(4, 12, n),
+            'slope': rng.uniform(0, 8, n)
+        })
+        self.df['hrr_pct'] = ((self.df['heart_rate'] - self.df['resting_hr'])
+                              / (220 - self.df['age'] - self.df['resting_hr']) * 100)
+        # Known linear relation to recover
+        self.df['target_speed'] = 1.0 + 0.9 * self.df['speed'] - 0.01 * self.df['heart_rate']
+        self.df['target_slope'] = 0.5 + 0.8 * self.df['slope']
+        self.model = SpeedSlopeRecommender(alpha=1e-6).fit(self.df)
+
+    def test_fit_recovers_linear_relation(self):
+        """Ridge fit reproduces noiseless targets"""
+        scores = self.model.score(self.df)
+        self.assertLess(scores['target_speed_rmse'], 1e-3)
+        self.assertLess(scores['target_slope_rmse'], 1e-3)
+
+    def test_single_matches_batch(self):
+        """predict_one and predict_batch agree"""
+        X = self.df[list(FEATURES)].to_numpy(dtype=float)
+        batch = self.model.predict_batch(X[:5])
+        for row, expected in zip(X[:5], batch):
+            np.testing.assert_allclose(self.model.predict_one(tuple(row)), expected)
+
+    def test_recommend_for_user(self):
+        """Recommendations for a User stay within treadmill limits"""
+        user = User(id=1, username='a', email='a@b.c', age=35, weight=80.0,
+                    height=180.0, gender='Male', resting_heart_rate=60)
+        speed, slope = self.model.recommend(user, heart_rate=150, speed=9.0, slope=2.0)
+        self.assertAlmostEqual(speed, 1.0 + 0.9 * 9.0 - 0.01 * 150, places=3)
+        self.assertAlmostEqual(slope, 0.5 + 0.8 * 2.0, places=3)
+        speed, _ = self.model.recommend(user, heart_rate=150, speed=40.0, slope=2.0)
+        self.assertEqual(speed, 20.0)
+
+    def test_save_and_load(self):
+        """A saved model predicts identically after loading"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.npz')
+            self.model.save(path)
+            loaded = SpeedSlopeRecommender.load(path)
+        X = self.df[list(FEATURES)].to_numpy(dtype=float)[:10]
+        np.testing.assert_allclose(loaded.predict_batch(X), self.model.predict_batch(X))
+
+    def test_unfitted(self):
+        """Predicting before fitting raises"""
+        with self.assertRaises(ValueError):
+            SpeedSlopeRecommender().predict_one((0.0,) * len(FEATURES))
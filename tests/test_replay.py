@@ -0,0 +1,71 @@
+# tests/test_replay.py
+import os
+import tempfile
+import unittest
+from src.analysis.data_processor import DataProcessor
+from src.analysis.replay import SessionReplayer, load_recording, processor_sink
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+
+class FakeClock:
+    """Deterministic clock; sleeping advances time instantly"""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestSessionReplayer(unittest.TestCase):
+    def setUp(self):
+        self.session = WorkoutSession(id=5, user_id=1)
+        self.session.data_points = [
+            WorkoutPoint(timestamp=1000.0 + i, heart_rate=120 + i, speed=8.0, slope=1.0,
+                         cadence=160 if i % 2 else None)
+            for i in range(10)
+        ]
+
+    def test_preserves_timing_at_speed(self):
+        """At 2x, samples one second apart are replayed half a second apart"""
+        clock = FakeClock()
+        received = []
+        replayer = SessionReplayer(self.session.data_points, speed=2.0,
+                                   clock=clock, sleep=clock.sleep)
+        stats = replayer.add_sink(received.append).run()
+
+        self.assertEqual(len(received), 10)
+        self.assertEqual(clock.sleeps, [0.5] * 9)
+        self.assertAlmostEqual(stats.wall_seconds, 4.5)
+        self.assertAlmostEqual(stats.speedup, 2.0)
+
+    def test_as_fast_as_possible(self):
+        """speed=None never sleeps"""
+        clock = FakeClock()
+        processor = DataProcessor()
+        stats = (SessionReplayer(self.session.data_points, speed=None, clock=clock,
+                                 sleep=clock.sleep)
+                 .add_sink(processor_sink(processor)).run(max_samples=4))
+        self.assertEqual(clock.sleeps, [])
+        self.assertEqual(stats.samples, 4)
+        self.assertTrue(stats.stopped)
+        self.assertEqual([p.heart_rate for p in processor.workout_data], [120, 121, 122, 123])
+
+    def test_recording_formats(self):
+        """CSV, streaming JSON and to_json recordings load identically"""
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_file = os.path.join(tmp, 'session.csv')
+            stream_file = os.path.join(tmp, 'session.json')
+            legacy_file = os.path.join(tmp, 'legacy.json')
+            self.session.export_csv(csv_file)
+            self.session.save_json(stream_file)
+            with open(legacy_file, 'w') as f:
+                f.write(self.session.to_json())
+
+            for filename in (csv_file, stream_file, legacy_file):
+                self.assertEqual(list(load_recording(filename)), self.session.data_points)
+
+            with self.assertRaises(ValueError):
+                load_recording(os.path.join(tmp, 'session.txt'))
@@ -0,0 +1,83 @@
+# tests/test_report_generator.py
+import importlib.util
+import io
+import logging
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+from src.utils.logging_utils import start_logging_pipeline, stop_logging_pipeline
+
+HAS_MATPLOTLIB = importlib.util.find_spec('matplotlib') is not None
+
+def make_session(session_id=1, speed=8.0):
+    session = WorkoutSession(id=session_id, user_id=1, start_time=datetime(2024, 1, 1))
+    for t in range(0, 600, 5):
+        session.data_points.append(WorkoutPoint(timestamp=float(t), heart_rate=110 + t // 10,
+                                                speed=speed, slope=1.0))
+    return session
+
+@unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+class TestReportGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from src.analysis.report_generator import ReportGenerator
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.generator = ReportGenerator(cls.tmp.name, max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.generator.shutdown()
+        cls.tmp.cleanup()
+
+    def test_renders_and_reuses_report(self):
+        """A rendered report is served from the cache without re-rendering"""
+        session = make_session()
+        self.assertIsNone(self.generator.get_cached(session))
+        artifacts = self.generator.request(session).result(timeout=120)
+        for name in ('summary', 'heart_rate', 'speed_slope', 'zones'):
+            self.assertTrue(os.path.getsize(artifacts[name]) > 0)
+
+        results = []
+        cached = self.generator.request(session, callback=results.append)
+        self.assertTrue(cached.done())
+        self.assertEqual(results, [artifacts])
+
+    def test_changed_session_gets_new_report(self):
+        """Editing the session data changes the cache key"""
+        first = self.generator.report_dir(make_session(2))
+        second = self.generator.report_dir(make_session(2, speed=9.0))
+        self.assertNotEqual(first, second)
+
+    def test_concurrent_requests_share_render(self):
+        """Requests for a report still rendering return the same future"""
+        session = make_session(3)
+        first = self.generator.request(session)
+        second = self.generator.request(session)
+        self.assertIs(first, second)
+        first.result(timeout=120)
+
+    def test_worker_logs_reach_pipeline(self):
+        """Records logged while rendering end up in the parent's log file"""
+        from src.analysis.report_generator import ReportGenerator
+        root = logging.getLogger()
+        saved_handlers, saved_level = list(root.handlers), root.level
+        log_file = os.path.join(self.tmp.name, 'app.log')
+        listener = start_logging_pipeline(log_file, stream=io.StringIO())
+        try:
+            generator = ReportGenerator(os.path.join(self.tmp.name, 'logged'), max_workers=1)
+            try:
+                generator.request(make_session(4)).result(timeout=120)
+            finally:
+                generator.shutdown()
+        finally:
+            stop_logging_pipeline(listener)
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
+        with open(log_file) as f:
+            self.assertIn('Rendered report session_4_', f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_serialization.py
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+from src.models.serialization import dump_session, load_session, iter_session_chunks
+
+class TestSessionSerialization(unittest.TestCase):
+    def setUp(self):
+        self.session = WorkoutSession(id=7, user_id=3, start_time=datetime(2024, 5, 1, 8, 30))
+        for i in range(25):
+            self.session.data_points.append(WorkoutPoint(
+                timestamp=1000.0 + i,
+                heart_rate=120 + i,
+                speed=8.0 + i * 0.1,
+                slope=1.5,
+                power=200.0 + i,
+                cadence=160 if i % 2 else None
+            ))
+        self.session.end_time = datetime(2024, 5, 1, 9, 0)
+        self.session.summary = {'average_heart_rate': 132.0}
+
+    def assertSessionsEqual(self, a, b):
+        self.assertEqual(a.id, b.id)
+        self.assertEqual(a.user_id, b.user_id)
+        self.assertEqual(a.start_time, b.start_time)
+        self.assertEqual(a.end_time, b.end_time)
+        self.assertEqual(a.summary, b.summary)
+        self.assertEqual(a.data_points, b.data_points)
+
+    def test_streaming_round_trip(self):
+        """Chunked column layout round-trips to an equal session"""
+        buffer = io.StringIO()
+        dump_session(self.session, buffer, chunk_size=10)
+        buffer.seek(0)
+        self.assertSessionsEqual(load_session(buffer), self.session)
+
+    def test_stream_is_valid_json_with_columns(self):
+        """The streamed file is one JSON document with per-column chunks"""
+        buffer = io.StringIO()
+        dump_session(self.session, buffer, chunk_size=10)
+        document = json.loads(buffer.getvalue())
+        self.assertEqual(len(document['chunks']), 3)
+        self.assertEqual(document['columns'][0], 'timestamp')
+        self.assertEqual(document['chunks'][2][1], [140, 141, 142, 143, 144])
+        self.assertSessionsEqual(WorkoutSession.from_dict(document), self.session)
+
+    def test_chunks_are_read_lazily(self):
+        """Chunks are decoded one line at a time"""
+        buffer = io.StringIO()
+        dump_session(self.session, buffer, chunk_size=10)
+        buffer.seek(0)
+        header, chunks = iter_session_chunks(buffer)
+        self.assertEqual(header['id'], 7)
+        first = next(chunks)
+        self.assertEqual(len(first['heart_rate']), 10)
+        self.assertEqual(len(list(chunks)), 2)
+
+    def test_from_json_accepts_to_json(self):
+        """from_json restores sessions written by to_json"""
+        self.assertSessionsEqual(WorkoutSession.from_json(self.session.to_json()), self.session)
+
+    def test_file_helpers(self):
+        """save_json/load_json read both layouts from disk"""
+        with tempfile.TemporaryDirectory() as tmp:
+            streamed = os.path.join(tmp, 'streamed.json')
+            legacy = os.path.join(tmp, 'legacy.json')
+            self.session.save_json(streamed, chunk_size=4)
+            with open(legacy, 'w') as f:
+                f.write(self.session.to_json())
+            self.assertSessionsEqual(WorkoutSession.load_json(streamed), self.session)
+            self.assertSessionsEqual(WorkoutSession.load_json(legacy), self.session)
+
+    def test_truncated_stream(self):
+        """A stream without its closing line is rejected"""
+        buffer = io.StringIO()
+        dump_session(self.session, buffer, chunk_size=10)
+        truncated = io.StringIO(buffer.getvalue().rsplit(']}', 1)[0])
+        with self.assertRaises(ValueError):
+            load_session(truncated)
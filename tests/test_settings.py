@@ -0,0 +1,96 @@
+# tests/test_settings.py
+import json
+import os
+import tempfile
+import unittest
+from config.settings import Settings, AppSettings, SettingsManager, SettingsError
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, 'config.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_config(self, settings, mtime=None):
+        with open(self.config_file, 'w') as f:
+            json.dump(settings, f)
+        if mtime is not None:
+            os.utime(self.config_file, (mtime, mtime))
+
+    def test_typed_defaults(self):
+        """Defaults convert to typed attributes"""
+        settings = Settings.load_typed()
+        self.assertEqual(settings.plot_update_interval, 1000)
+        self.assertEqual(settings.training_zones['AEROBIC'], (0.70, 0.80))
+        self.assertEqual(AppSettings.from_dict(settings.to_dict()), settings)
+
+    def test_invalid_values_fall_back(self):
+        """Invalid entries are ignored; strict mode only rejects unreadable files"""
+        self.write_config({'PLOT_UPDATE_INTERVAL': -5, 'MAX_PLOT_POINTS': 600,
+                           'TRAINING_ZONES': {'AEROBIC': [0.8, 0.7]}})
+        settings = Settings.load(self.config_file)
+        self.assertEqual(settings['PLOT_UPDATE_INTERVAL'], 1000)
+        self.assertEqual(settings['MAX_PLOT_POINTS'], 600)
+        self.assertEqual(settings['TRAINING_ZONES'], Settings.get_default('TRAINING_ZONES'))
+        self.assertEqual(Settings.load(self.config_file, strict=True), settings)
+
+        fallback = dict(settings, PLOT_UPDATE_INTERVAL=250)
+        self.assertEqual(Settings.load(self.config_file, fallback=fallback)['PLOT_UPDATE_INTERVAL'], 250)
+
+        with open(self.config_file, 'w') as f:
+            f.write('{"MAX_PLOT_POINTS": ')
+        with self.assertRaises(SettingsError):
+            Settings.load(self.config_file, strict=True)
+
+    def test_load_has_no_side_effects(self):
+        """Loading settings does not create directories"""
+        data_dir = os.path.join(self.tmp.name, 'new_data')
+        self.write_config({'DATA_DIR': data_dir})
+        Settings.load(self.config_file)
+        self.assertFalse(os.path.exists(data_dir))
+
+    def test_manager_reloads_and_notifies(self):
+        """Changed files are reloaded and subscribers see what changed"""
+        self.write_config({'PLOT_UPDATE_INTERVAL': 500}, mtime=1_000_000)
+        manager = SettingsManager(self.config_file)
+        self.assertEqual(manager.current.plot_update_interval, 500)
+
+        notifications = []
+        manager.subscribe(lambda settings, changed: notifications.append(changed))
+        self.assertEqual(manager.check_for_changes(), [])
+
+        self.write_config({'PLOT_UPDATE_INTERVAL': 250, 'SERIAL_PORT': 'COM3'}, mtime=1_000_010)
+        self.assertEqual(manager.check_for_changes(), ['serial_port', 'plot_update_interval'])
+        self.assertEqual(manager.current.plot_update_interval, 250)
+        self.assertEqual(notifications, [['serial_port', 'plot_update_interval']])
+
+    def test_manager_keeps_settings_on_bad_file(self):
+        """A broken or invalid file leaves the current settings in place"""
+        self.write_config({'PLOT_UPDATE_INTERVAL': 500}, mtime=1_000_000)
+        manager = SettingsManager(self.config_file)
+        with open(self.config_file, 'w') as f:
+            f.write('{"PLOT_UPDATE_INTERVAL": ')
+        os.utime(self.config_file, (1_000_010, 1_000_010))
+        self.assertEqual(manager.check_for_changes(), [])
+
+        self.write_config({'PLOT_UPDATE_INTERVAL': 'fast'}, mtime=1_000_020)
+        self.assertEqual(manager.check_for_changes(), [])
+        self.assertEqual(manager.current.plot_update_interval, 500)
+
+    def test_manager_reloads_file_with_ignored_entries(self):
+        """Entries ignored at startup do not block later reloads"""
+        self.write_config({'PLOT_UPDATE_INTERVAL': 500, 'THEME': 'dark'}, mtime=1_000_000)
+        manager = SettingsManager(self.config_file)
+        self.assertEqual(manager.current.plot_update_interval, 500)
+
+        self.write_config({'PLOT_UPDATE_INTERVAL': 250, 'THEME': 'dark'}, mtime=1_000_010)
+        self.assertEqual(manager.check_for_changes(), ['plot_update_interval'])
+        self.assertEqual(manager.current.plot_update_interval, 250)
+
+        # An entry that becomes invalid keeps its current value, others still apply
+        self.write_config({'PLOT_UPDATE_INTERVAL': 'fast', 'MAX_PLOT_POINTS': 600},
+                          mtime=1_000_020)
+        self.assertEqual(manager.check_for_changes(), ['max_plot_points'])
+        self.assertEqual(manager.current.plot_update_interval, 250)
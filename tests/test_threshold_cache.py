@@ -0,0 +1,79 @@
+# tests/test_threshold_cache.py
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import datetime
+from config.settings import Settings
+from src.analysis.threshold_cache import ThresholdCache
+from src.analysis.threshold_calculator import ThresholdCalculator
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+
+def ramp_session(session_id, day, deflection=600):
+    """Ramp test whose heart rate rises linearly, then flattens after `deflection` s"""
+    session = WorkoutSession(id=session_id, user_id=1, start_time=datetime(2024, 1, day))
+    for t in range(0, 1200, 10):
+        hr = 100 + 0.1 * min(t, deflection) + 0.02 * max(t - deflection, 0)
+        session.data_points.append(WorkoutPoint(timestamp=float(t), heart_rate=int(hr),
+                                                speed=8.0, slope=0.0))
+    return session
+
+class TestThresholdCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ThresholdCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fit_is_cached_until_data_changes(self):
+        """A session is refit only when its data changes"""
+        session = ramp_session(1, 1)
+        entry = self.cache.get_threshold(1, session)
+        self.assertEqual(session.anaerobic_threshold, entry['anaerobic_threshold'])
+        self.assertEqual(entry['inputs']['n_points'], 120)
+        self.assertEqual(len(entry['fit_coefficients']), 4)
+
+        self.cache.get_threshold(1, session)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        session.data_points.append(WorkoutPoint(timestamp=1200.0, heart_rate=140,
+                                                speed=8.0, slope=0.0))
+        self.cache.get_threshold(1, session)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_cache_persists(self):
+        """Entries survive a new cache instance without refitting"""
+        self.cache.get_threshold(1, ramp_session(1, 1))
+        reopened = ThresholdCache(self.tmp.name)
+        reopened.get_threshold(1, ramp_session(1, 1))
+        self.assertEqual((reopened.hits, reopened.misses), (1, 0))
+
+    def test_trend(self):
+        """Trend is ordered by session date and needs no refit"""
+        sessions = [ramp_session(2, 15, deflection=700), ramp_session(1, 1, deflection=500)]
+        self.cache.update_sessions(1, sessions)
+        trend = ThresholdCache(self.tmp.name).trend(1)
+        self.assertEqual([when.day for when, _ in trend], [1, 15])
+
+    def test_too_little_data(self):
+        """Sessions below the minimum point count are skipped"""
+        session = WorkoutSession(id=3, user_id=1)
+        self.assertIsNone(self.cache.get_threshold(1, session))
+
+    def test_min_points_from_settings(self):
+        """The minimum sample count comes from loaded settings and follows reloads"""
+        settings = replace(Settings.load_typed(), min_data_points_for_threshold=500)
+        cache = ThresholdCache(self.tmp.name, settings=settings)
+        self.assertIsNone(cache.get_threshold(1, ramp_session(1, 1)))
+        cache.apply_settings(replace(settings, min_data_points_for_threshold=20))
+        self.assertIsNotNone(cache.get_threshold(1, ramp_session(1, 1)))
+
+    def test_calculator_invalidates_on_new_data(self):
+        """ThresholdCalculator drops its fit when new points arrive"""
+        calculator = ThresholdCalculator()
+        for t in range(20):
+            calculator.add_data_point(100 + t, float(t))
+        calculator.calculate_hrdp()
+        self.assertIsNotNone(calculator.hrdp_hr)
+        calculator.add_data_point(125, 20.0)
+        self.assertIsNone(calculator.hrdp_hr)
@@ -0,0 +1,78 @@
+# tests/test_workout_program.py
+import unittest
+from src.control.workout_program import (WorkoutProgram, ProgramRunner, warm_up, intervals,
+                                         cool_down, ramp, summarize_segments)
+from src.models.workout_session import WorkoutSession, WorkoutPoint
+
+class TestWorkoutProgram(unittest.TestCase):
+    def setUp(self):
+        self.program = WorkoutProgram("Intervals", [
+            warm_up(300, 5.0, 8.0),
+            *intervals(2, work_duration=60, work_speed=12.0, rest_duration=90, rest_speed=7.0,
+                       work_slope=1.0),
+            ramp("Hill", 120, 8.0, 8.0, start_slope=0.0, end_slope=6.0),
+            cool_down(180, 7.0, 4.0)
+        ])
+        self.compiled = self.program.compile()
+
+    def test_timeline(self):
+        """Compiled arrays cover the program with interpolated ramps"""
+        self.assertEqual(self.program.duration, 900)
+        self.assertEqual(len(self.compiled), 900)
+        self.assertEqual(self.compiled.setpoint(0), (5.0, 0.0, 0))
+        self.assertAlmostEqual(self.compiled.setpoint(150)[0], 6.5)
+        self.assertEqual(self.compiled.setpoint(310), (12.0, 1.0, 1))
+        self.assertEqual(self.compiled.setpoint(400), (7.0, 0.0, 2))
+        self.assertAlmostEqual(self.compiled.setpoint(660)[1], 3.0)
+        self.assertEqual(self.compiled.segment_at(359.5), 1)
+        self.assertEqual(self.compiled.segment_at(360), 2)
+
+        # Out-of-range times clamp to the ends
+        self.assertEqual(self.compiled.setpoint(-5)[2], 0)
+        self.assertEqual(self.compiled.setpoint(10_000)[2], 6)
+
+    def test_runner_issues_commands_on_change(self):
+        """Commands fire only when the setpoint changes"""
+        speeds, slopes = [], []
+        runner = ProgramRunner(self.compiled, speeds.append, slopes.append)
+        runner.start(1000.0)
+        for t in range(301, 360):
+            self.assertEqual(runner.tick(1000.0 + t), 1)
+        self.assertEqual(speeds.count(12.0), 1)
+        self.assertEqual(slopes, [0.0, 1.0])
+
+        self.assertIsNone(runner.tick(1000.0 + 900))
+        self.assertTrue(runner.finished)
+
+    def test_segment_summaries(self):
+        """Tagged points are summarized per segment"""
+        session = WorkoutSession(id=1, user_id=1)
+        for t in range(0, 900, 10):
+            speed, slope, segment = self.compiled.setpoint(t)
+            session.data_points.append(WorkoutPoint(
+                timestamp=float(t), heart_rate=100 + segment * 10,
+                speed=speed, slope=slope, segment=segment
+            ))
+        summaries = summarize_segments(session, self.compiled)
+        self.assertEqual([s['segment'] for s in summaries], list(range(7)))
+        self.assertEqual(summaries[1]['name'], "Interval 1")
+        self.assertEqual(summaries[1]['average_hr'], 110)
+        self.assertAlmostEqual(summaries[1]['distance'], 12.0 * 60 / 3600)
+        self.assertEqual(summaries[1]['duration_seconds'], 60.0)
+        self.assertEqual(summaries[0]['duration_seconds'], 300.0)
+
+    def test_single_sample_segment(self):
+        """A segment with one sample lasts until the next sample"""
+        session = WorkoutSession(id=1, user_id=1)
+        for t, segment in [(0.0, 0), (5.0, 0), (10.0, 1), (15.0, 2)]:
+            session.data_points.append(WorkoutPoint(timestamp=t, heart_rate=120, speed=7.2,
+                                                    slope=0.0, segment=segment))
+        summaries = summarize_segments(session)
+        self.assertEqual(summaries[1]['duration_seconds'], 5.0)
+        self.assertAlmostEqual(summaries[1]['distance'], 7.2 * 5 / 3600)
+
+    def test_invalid_programs(self):
+        with self.assertRaises(ValueError):
+            WorkoutProgram("Empty").compile()
+        with self.assertRaises(ValueError):
+            warm_up(0, 5.0, 8.0)